@@ -1,9 +1,32 @@
-
-
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, g, stream_with_context
+from werkzeug.local import LocalProxy
 import networkx as nx
+from networkx.algorithms import flow as nx_flow
+import numpy as np
+from scipy.spatial import cKDTree
+import bisect
+import contextlib
+import csv
+import functools
+import gc
+import gzip
+import hashlib
+import heapq
+import itertools
+import math
+import multiprocessing
 import json
+import numbers
 import os
+import random
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
 app = Flask(__name__)
@@ -12,620 +35,4638 @@ GRAPHS_FOLDER = 'saved_graphs'
 if not os.path.exists(GRAPHS_FOLDER):
     os.makedirs(GRAPHS_FOLDER)
 
-graph_data = {
-    'graph': nx.Graph(),
-    'positions': {},
-    'selected_node': None,
-    'is_directed': False
-}
+WORKSPACE_COOKIE = 'workspace_id'
+WORKSPACE_TTL = int(os.environ.get('WORKSPACE_TTL', 3600))
+WORKSPACE_MAX_COUNT = int(os.environ.get('WORKSPACE_MAX_COUNT', 1000))
+WORKSPACE_MAX_ELEMENTS = int(os.environ.get('WORKSPACE_MAX_ELEMENTS', 2000000))
+WORKSPACE_DB = os.environ.get('WORKSPACE_DB', 'workspaces.db')
+WORKSPACE_RETENTION = int(os.environ.get('WORKSPACE_RETENTION', 7 * 24 * 3600))
+CHANGELOG_LIMIT = int(os.environ.get('CHANGELOG_LIMIT', 500))
+SNAPSHOT_INTERVAL = int(os.environ.get('SNAPSHOT_INTERVAL', 1000))
+SNAPSHOT_REPLAY_RATIO = float(os.environ.get('SNAPSHOT_REPLAY_RATIO', 0.5))
 
-@app.route('/')
-def index():
+def _new_workspace():
     
-    return render_template('index.html')
+    return {
+        'graph': nx.Graph(),
+        'positions': {},
+        'selected_node': None,
+        'is_directed': False,
+        'version': 0,
+        'epoch': uuid.uuid4().hex
+    }
 
-@app.route('/api/add_node', methods=['POST'])
-def add_node():
-    
-    data = request.json
-    node_id = data.get('node_id')
-    x = data.get('x', 400)
-    y = data.get('y', 300)
+def _workspace_size(workspace):
     
+    engine = _stats_engine(workspace)
+    return len(engine.degrees) + engine.num_edges + 1
 
-    if node_id and node_id not in graph_data['graph']:
-        graph_data['graph'].add_node(node_id)
-        graph_data['positions'][node_id] = {'x': x, 'y': y}
-        return jsonify({'success': True, 'message': 'Node đã được thêm'})
+class WorkspaceStore:
     
-    return jsonify({'success': False, 'message': 'Node đã tồn tại hoặc không hợp lệ'})
-
-@app.route('/api/add_edge', methods=['POST'])
-def add_edge():
+    def __init__(self, ttl, max_count, max_elements):
+        
+        self.ttl = ttl
+        self.max_count = max_count
+        self.max_elements = max_elements
+        self._workspaces = OrderedDict()
+        self._last_access = {}
+        self._sizes = {}
+        self._total_size = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
     
-    data = request.json
-    node1 = data.get('node1')
-    node2 = data.get('node2')
-    weight = data.get('weight', 1)
+    def get(self, workspace_id):
+        
+        now = time.monotonic()
+        with self._lock:
+            workspace = self._workspaces.get(workspace_id)
+            if workspace is not None and now - self._last_access[workspace_id] > self.ttl:
+                self._drop(workspace_id)
+                self.expirations += 1
+                workspace = None
+            
+            if workspace is None:
+                self.misses += 1
+                workspace = _new_workspace()
+                self._workspaces[workspace_id] = workspace
+                self._set_size(workspace_id, _workspace_size(workspace))
+            else:
+                self.hits += 1
+                self._workspaces.move_to_end(workspace_id)
+            
+            self._last_access[workspace_id] = now
+            self._evict(now, keep=workspace_id)
+            return workspace
     
-
-    if not (node1 in graph_data['graph'] and node2 in graph_data['graph']):
-        return jsonify({'success': False, 'message': 'Một hoặc cả hai node không tồn tại'})
+    def touch(self, workspace_id):
+        
+        with self._lock:
+            workspace = self._workspaces.get(workspace_id)
+            if workspace is None:
+                return
+            self._set_size(workspace_id, _workspace_size(workspace))
+            self._evict(time.monotonic(), keep=workspace_id)
     
-
-    if not graph_data['is_directed']:
-        graph_data['graph'].add_edge(node1, node2, weight=weight)
-        return jsonify({'success': True, 'message': f'Cạnh {node1}-{node2} đã được thêm'})
+    def discard(self, workspace_id):
+        
+        with self._lock:
+            if workspace_id in self._workspaces:
+                self._drop(workspace_id)
     
-
-    direction = data.get('direction', 'both')
+    def stats(self):
+        
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'workspaces': len(self._workspaces),
+                'total_elements': self._total_size,
+                'max_workspaces': self.max_count,
+                'max_elements': self.max_elements,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
     
-    if direction == 'one_way_1_to_2':
+    def _set_size(self, workspace_id, size):
+        
+        self._total_size += size - self._sizes.get(workspace_id, 0)
+        self._sizes[workspace_id] = size
+    
+    def _drop(self, workspace_id):
+        
+        del self._workspaces[workspace_id]
+        del self._last_access[workspace_id]
+        self._total_size -= self._sizes.pop(workspace_id, 0)
+    
+    def _evict(self, now, keep=None):
+        
 
-        graph_data['graph'].add_edge(node1, node2, weight=weight)
-        return jsonify({'success': True, 'message': f'Cạnh {node1} → {node2} đã được thêm'})
-    elif direction == 'one_way_2_to_1':
+        for workspace_id in list(self._workspaces):
+            if now - self._last_access[workspace_id] <= self.ttl:
+                break
+            if workspace_id != keep:
+                self._drop(workspace_id)
+                self.expirations += 1
+        
 
-        graph_data['graph'].add_edge(node2, node1, weight=weight)
-        return jsonify({'success': True, 'message': f'Cạnh {node2} → {node1} đã được thêm'})
-    else:
+        while len(self._workspaces) > 1 and (
+                len(self._workspaces) > self.max_count or self._total_size > self.max_elements):
+            workspace_id = next(iter(self._workspaces))
+            if workspace_id == keep:
+                self._workspaces.move_to_end(workspace_id)
+                workspace_id = next(iter(self._workspaces))
+            self._drop(workspace_id)
+            self.evictions += 1
 
-        graph_data['graph'].add_edge(node1, node2, weight=weight)
-        graph_data['graph'].add_edge(node2, node1, weight=weight)
-        return jsonify({'success': True, 'message': f'Cạnh 2 chiều {node1} ↔ {node2} đã được thêm'})
+workspace_store = WorkspaceStore(WORKSPACE_TTL, WORKSPACE_MAX_COUNT, WORKSPACE_MAX_ELEMENTS)
 
-@app.route('/api/remove_node', methods=['POST'])
-def remove_node():
-    
-    data = request.json
-    node_id = data.get('node_id')
+def _is_valid_workspace_id(workspace_id):
     
-    if node_id in graph_data['graph']:
-        graph_data['graph'].remove_node(node_id)
+    if not workspace_id or len(workspace_id) != 32:
+        return False
+    try:
+        int(workspace_id, 16)
+    except ValueError:
+        return False
+    return True
 
-        if node_id in graph_data['positions']:
-            del graph_data['positions'][node_id]
-        return jsonify({'success': True, 'message': f'Đã xóa đỉnh {node_id}'})
+def _current_workspace_id():
     
-    return jsonify({'success': False, 'message': 'Đỉnh không tồn tại'})
+    if 'workspace_id' not in g:
+        workspace_id = request.cookies.get(WORKSPACE_COOKIE)
+        if not _is_valid_workspace_id(workspace_id):
+            workspace_id = uuid.uuid4().hex
+        g.workspace_id = workspace_id
+    return g.workspace_id
 
-@app.route('/api/remove_edge', methods=['POST'])
-def remove_edge():
-    
-    data = request.json
-    node1 = data.get('node1')
-    node2 = data.get('node2')
-    
-    if node1 in graph_data['graph'] and node2 in graph_data['graph']:
-        if graph_data['graph'].has_edge(node1, node2):
-            graph_data['graph'].remove_edge(node1, node2)
-            return jsonify({'success': True, 'message': f'Đã xóa cạnh {node1}-{node2}'})
-        else:
-            return jsonify({'success': False, 'message': 'Cạnh không tồn tại'})
-    
-    return jsonify({'success': False, 'message': 'Một hoặc cả hai đỉnh không tồn tại'})
+_db_local = threading.local()
 
-@app.route('/api/get_graph', methods=['GET'])
-def get_graph():
+def _add_missing_columns(conn, table, columns):
     
-    nodes = []
+    existing = {column[1] for column in conn.execute(f'PRAGMA table_info({table})')}
+    for name, definition in columns:
+        if name not in existing:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
 
-    for node_id in graph_data['graph'].nodes():
-        pos = graph_data['positions'].get(node_id, {'x': 400, 'y': 300})
-        nodes.append({
-            'id': node_id,
-            'x': pos['x'],
-            'y': pos['y']
-        })
+def _migrate_saved_graphs(conn):
     
-    edges = []
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        columns = {column[1] for column in conn.execute('PRAGMA table_info(saved_graphs)')}
+        if columns and 'owner' not in columns:
+            conn.execute('ALTER TABLE saved_graphs RENAME TO saved_graphs_unowned')
+            conn.execute('DROP INDEX IF EXISTS saved_graphs_updated_at')
+            conn.execute(
+                'CREATE TABLE saved_graphs ('
+                'owner TEXT NOT NULL, name TEXT NOT NULL, filename TEXT NOT NULL, '
+                'num_nodes INTEGER NOT NULL, num_edges INTEGER NOT NULL, is_directed INTEGER NOT NULL, '
+                'size INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, '
+                'PRIMARY KEY (owner, name))'
+            )
+            conn.execute(
+                "INSERT INTO saved_graphs SELECT '', name, filename, num_nodes, num_edges, is_directed, "
+                'size, created_at, updated_at FROM saved_graphs_unowned'
+            )
+            conn.execute('DROP TABLE saved_graphs_unowned')
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
 
-    for edge in graph_data['graph'].edges():
-        weight = graph_data['graph'].get_edge_data(edge[0], edge[1]).get('weight', 1)
-        edges.append({
-            'source': edge[0],
-            'target': edge[1],
-            'weight': weight
-        })
+def _db():
     
+    conn = getattr(_db_local, 'conn', None)
+    if conn is None or _db_local.pid != os.getpid():
+        conn = sqlite3.connect(WORKSPACE_DB, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS workspaces ('
+            'id TEXT PRIMARY KEY, version INTEGER NOT NULL, '
+            'snapshot BLOB NOT NULL, updated_at REAL NOT NULL, epoch TEXT NOT NULL DEFAULT \'\', '
+            'snapshot_version INTEGER NOT NULL DEFAULT -1, replay_size INTEGER NOT NULL DEFAULT 0)'
+        )
+        _add_missing_columns(conn, 'workspaces', (
+            ('epoch', "TEXT NOT NULL DEFAULT ''"),
+            ('snapshot_version', 'INTEGER NOT NULL DEFAULT -1'),
+            ('replay_size', 'INTEGER NOT NULL DEFAULT 0')
+        ))
+        conn.execute("UPDATE workspaces SET epoch = lower(hex(randomblob(16))) WHERE epoch = ''")
+        conn.execute('UPDATE workspaces SET snapshot_version = version WHERE snapshot_version < 0')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS workspace_changes ('
+            'workspace_id TEXT NOT NULL, version INTEGER NOT NULL, '
+            'nodes TEXT NOT NULL, edges TEXT NOT NULL, reset INTEGER NOT NULL, state TEXT, '
+            'PRIMARY KEY (workspace_id, version))'
+        )
+        _add_missing_columns(conn, 'workspace_changes', (('state', 'TEXT'),))
+        _migrate_saved_graphs(conn)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS saved_graphs ('
+            'owner TEXT NOT NULL, name TEXT NOT NULL, filename TEXT NOT NULL, '
+            'num_nodes INTEGER NOT NULL, num_edges INTEGER NOT NULL, is_directed INTEGER NOT NULL, '
+            'size INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, '
+            'PRIMARY KEY (owner, name))'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS saved_graphs_owner_updated_at ON saved_graphs (owner, updated_at)')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, workspace_id TEXT NOT NULL, kind TEXT NOT NULL, '
+            'status TEXT NOT NULL, progress REAL NOT NULL, message TEXT, result TEXT, error TEXT, '
+            'version INTEGER NOT NULL, created_at REAL NOT NULL, started_at REAL, finished_at REAL, '
+            'frame BLOB, frame_seq INTEGER NOT NULL DEFAULT 0)'
+        )
+        _add_missing_columns(conn, 'jobs', (('frame', 'BLOB'), ('frame_seq', 'INTEGER NOT NULL DEFAULT 0')))
+        conn.execute('CREATE INDEX IF NOT EXISTS jobs_workspace_status ON jobs (workspace_id, status)')
+        conn.execute('DELETE FROM workspaces WHERE updated_at < ?',
+                     (time.time() - WORKSPACE_RETENTION,))
+        conn.execute('DELETE FROM workspace_changes WHERE workspace_id NOT IN (SELECT id FROM workspaces)')
+        _db_local.conn = conn
+        _db_local.pid = os.getpid()
+    return conn
 
-    num_nodes = graph_data['graph'].number_of_nodes()
-    num_edges = graph_data['graph'].number_of_edges()
+def _serialize_graph(workspace):
     
-
-    is_connected = False
-    if num_nodes > 0:
-        if graph_data['is_directed']:
-            is_connected = nx.is_weakly_connected(graph_data['graph'])
-        else:
-            is_connected = nx.is_connected(graph_data['graph'])
+    graph = workspace['graph']
+    positions = workspace['positions']
+    nodes = []
+    for node_id in graph.nodes():
+        pos = positions.get(node_id, {'x': 400, 'y': 300})
+        nodes.append({'id': node_id, 'x': pos['x'], 'y': pos['y']})
     
-    stats = {
-        'num_nodes': num_nodes,
-        'num_edges': num_edges,
-        'density': nx.density(graph_data['graph']) if num_nodes > 0 else 0,
-        'is_connected': is_connected
-    }
+    edges = []
+    for u, v, weight in graph.edges(data='weight', default=1):
+        edges.append({'source': u, 'target': v, 'weight': weight})
     
-    return jsonify({
+    return {
         'nodes': nodes,
         'edges': edges,
-        'stats': stats,
-        'is_directed': graph_data['is_directed']
-    })
+        'is_directed': workspace['is_directed']
+    }
 
-@app.route('/api/spring_layout', methods=['POST'])
-def spring_layout():
+@contextlib.contextmanager
+def _gc_paused():
     
-    if graph_data['graph'].number_of_nodes() > 0:
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
-        positions = nx.spring_layout(graph_data['graph'], k=1, iterations=50, seed=42)
+def _load_graph(workspace, data):
+    
+    is_directed = bool(data.get('is_directed', False))
+    graph = nx.DiGraph() if is_directed else nx.Graph()
+    positions = {}
+    
+    with _gc_paused():
+        nodes = data.get('nodes', [])
+        graph.add_nodes_from(node['id'] for node in nodes)
+        for node in nodes:
+            positions[node['id']] = {'x': node.get('x', 400), 'y': node.get('y', 300)}
         
+        graph.add_edges_from(
+            (edge['source'], edge['target'], {'weight': edge.get('weight', 1)})
+            for edge in data.get('edges', [])
+        )
+    
+    workspace['graph'] = graph
+    workspace['positions'] = positions
+    workspace['is_directed'] = is_directed
+    workspace['selected_node'] = None
+    _drop_derived(workspace)
 
-        for node_id, (x, y) in positions.items():
-            graph_data['positions'][node_id] = {
-                'x': (x + 1) * 400,
-                'y': (y + 1) * 300
-            }
-        return jsonify({'success': True, 'message': 'Spring layout đã được áp dụng'})
+GRAPH_BINARY_MAGIC = b'CTRG'
+GRAPH_BINARY_VERSION = 2
+GRAPH_BINARY_HEADER = struct.Struct('<4sBBHIII')
+GRAPH_BINARY_DIRECTED = 1
+GRAPH_BINARY_WIDE_INDEX = 2
+GRAPH_BINARY_FLOAT_WEIGHTS = 4
+GRAPH_BINARY_FLOAT32_COORDS = 8
+GRAPH_BINARY_MIXED_WEIGHTS = 16
+GRAPH_BINARY_INT_DTYPES = ('<i1', '<i2', '<i4', '<i8')
+
+def _pad4(data):
     
-    return jsonify({'success': False, 'message': 'Không có node nào'})
+    return data + b'\0' * (-len(data) % 4)
 
-@app.route('/api/circular_layout', methods=['POST'])
-def circular_layout():
+def _serialize_graph_binary(workspace, compact=False):
     
-    if graph_data['graph'].number_of_nodes() > 0:
+    graph = workspace['graph']
+    positions = workspace['positions']
+    nodes = list(graph.nodes())
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    
+    coords = np.fromiter(
+        itertools.chain.from_iterable(_node_xy(positions, node) for node in nodes),
+        dtype='<f4' if compact else '<f8', count=2 * n
+    )
+    
+    adjacency = [nbrs for _, nbrs in graph.adjacency()]
+    degrees = np.fromiter(map(len, adjacency), dtype=np.int64, count=n)
+    total = int(degrees.sum())
+    sources = np.repeat(np.arange(n, dtype=np.int64), degrees)
+    targets = np.fromiter(
+        map(index.__getitem__, itertools.chain.from_iterable(adjacency)),
+        dtype=np.int64, count=total
+    )
+    weights = [attrs.get('weight', 1) for nbrs in adjacency for attrs in nbrs.values()]
+    integral = np.fromiter(
+        (isinstance(weight, numbers.Integral) for weight in weights),
+        dtype=bool, count=total
+    )
+    weights = np.array(weights, dtype=np.int64 if integral.all() else np.float64)
+    if not workspace['is_directed']:
+        keep = sources <= targets
+        sources, targets, weights, integral = sources[keep], targets[keep], weights[keep], integral[keep]
+    m = len(sources)
+    
+    flags = GRAPH_BINARY_DIRECTED if workspace['is_directed'] else 0
+    if compact:
+        flags |= GRAPH_BINARY_FLOAT32_COORDS
+    index_dtype = '<u2'
+    if n > 0xFFFF:
+        flags |= GRAPH_BINARY_WIDE_INDEX
+        index_dtype = '<u4'
+    pairs = np.column_stack((sources, targets)).astype(index_dtype)
+    
+    weight_dtype = None
+    mask_bytes = b''
+    if not integral.all():
+        flags |= GRAPH_BINARY_FLOAT_WEIGHTS
+        weight_dtype = '<f8'
+        if integral.any():
+            flags |= GRAPH_BINARY_MIXED_WEIGHTS
+            mask_bytes = np.packbits(integral, bitorder='little').tobytes()
+    elif np.any(weights != 1):
+        low, high = weights.min(), weights.max()
+        weight_dtype = next(
+            dtype for dtype in GRAPH_BINARY_INT_DTYPES
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max
+        )
+    weight_bytes = weights.astype(weight_dtype).tobytes() if weight_dtype else b''
+    weight_size = np.dtype(weight_dtype).itemsize if weight_dtype else 0
+    
+    table = _pad4(json.dumps(nodes, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    header = GRAPH_BINARY_HEADER.pack(GRAPH_BINARY_MAGIC, GRAPH_BINARY_VERSION, flags, weight_size, n, m, len(table))
+    return b''.join((header, table, coords.tobytes(), _pad4(pairs.tobytes()), weight_bytes, mask_bytes))
 
-        positions = nx.circular_layout(graph_data['graph'])
+def _load_graph_binary(workspace, payload):
+    
+    if len(payload) < GRAPH_BINARY_HEADER.size:
+        raise ValueError('Dữ liệu nhị phân không hợp lệ')
+    magic, version, flags, weight_size, n, m, table_size = GRAPH_BINARY_HEADER.unpack_from(payload)
+    if magic != GRAPH_BINARY_MAGIC or not 1 <= version <= GRAPH_BINARY_VERSION:
+        raise ValueError('Dữ liệu nhị phân không hợp lệ')
+    
+    index_dtype = np.dtype('<u4' if flags & GRAPH_BINARY_WIDE_INDEX else '<u2')
+    coord_dtype = np.dtype('<f4' if version == 1 or flags & GRAPH_BINARY_FLOAT32_COORDS else '<f8')
+    mask_size = (m + 7) // 8 if flags & GRAPH_BINARY_MIXED_WEIGHTS else 0
+    if flags & GRAPH_BINARY_FLOAT_WEIGHTS:
+        weight_dtype = np.dtype('<f8')
+    elif weight_size:
+        weight_dtype = next(
+            (np.dtype(dtype) for dtype in GRAPH_BINARY_INT_DTYPES if np.dtype(dtype).itemsize == weight_size),
+            None
+        )
+        if weight_dtype is None:
+            raise ValueError('Dữ liệu nhị phân không hợp lệ')
+    else:
+        weight_dtype = None
+    
+    offset = GRAPH_BINARY_HEADER.size
+    pairs_size = 2 * m * index_dtype.itemsize
+    pairs_size += -pairs_size % 4
+    weights_size = m * weight_dtype.itemsize if weight_dtype else 0
+    expected = offset + table_size + 2 * n * coord_dtype.itemsize + pairs_size + weights_size + mask_size
+    if len(payload) != expected:
+        raise ValueError('Dữ liệu nhị phân không hợp lệ')
+    
+    nodes = json.loads(bytes(payload[offset:offset + table_size]).rstrip(b'\0').decode('utf-8'))
+    if len(nodes) != n:
+        raise ValueError('Dữ liệu nhị phân không hợp lệ')
+    offset += table_size
+    coords = np.frombuffer(payload, dtype=coord_dtype, count=2 * n, offset=offset)
+    offset += 2 * n * coord_dtype.itemsize
+    pairs = np.frombuffer(payload, dtype=index_dtype, count=2 * m, offset=offset)
+    offset += pairs_size
+    if m and int(pairs.max()) >= n:
+        raise ValueError('Dữ liệu nhị phân không hợp lệ')
+    
+    is_directed = bool(flags & GRAPH_BINARY_DIRECTED)
+    graph = nx.DiGraph() if is_directed else nx.Graph()
+    
+    with _gc_paused():
+        graph.add_nodes_from(nodes)
+        node_array = np.empty(n, dtype=object)
+        node_array[:] = nodes
+        sources = node_array[pairs[0::2]].tolist()
+        targets = node_array[pairs[1::2]].tolist()
+        if weight_dtype is None:
+            graph.add_edges_from(zip(sources, targets), weight=1)
+        else:
+            weights = np.frombuffer(payload, dtype=weight_dtype, count=m, offset=offset).tolist()
+            if mask_size:
+                mask = np.frombuffer(payload, dtype=np.uint8, count=mask_size, offset=offset + weights_size)
+                for i in np.flatnonzero(np.unpackbits(mask, count=m, bitorder='little')).tolist():
+                    weights[i] = int(weights[i])
+            graph.add_edges_from(zip(sources, targets, ({'weight': weight} for weight in weights)))
         
-
-        for node_id, (x, y) in positions.items():
-            graph_data['positions'][node_id] = {
-                'x': (x + 1) * 400,
-                'y': (y + 1) * 300
-            }
-        return jsonify({'success': True, 'message': 'Circular layout đã được áp dụng'})
+        positions = {
+            node: {'x': x, 'y': y}
+            for node, (x, y) in zip(nodes, coords.reshape(n, 2).tolist())
+        }
     
-    return jsonify({'success': False, 'message': 'Không có node nào'})
+    workspace['graph'] = graph
+    workspace['positions'] = positions
+    workspace['is_directed'] = is_directed
+    workspace['selected_node'] = None
+    _drop_derived(workspace)
 
-@app.route('/api/clear_all', methods=['POST'])
-def clear_all():
+def _graph_stats(workspace):
     
-    graph_data['graph'].clear()
-    graph_data['positions'].clear()
-    graph_data['selected_node'] = None
-    return jsonify({'success': True, 'message': 'Đã xóa tất cả'})
+    return _stats_engine(workspace).stats()
 
-@app.route('/api/update_position', methods=['POST'])
-def update_position():
+def _sync_workspace(workspace_id, workspace):
     
-    data = request.json
-    node_id = data.get('node_id')
-    x = data.get('x')
-    y = data.get('y')
+    conn = _db()
+    row = conn.execute(
+        'SELECT version, epoch, snapshot_version FROM workspaces WHERE id = ? AND (version != ? OR epoch != ?)',
+        (workspace_id, workspace['version'], workspace['epoch'])
+    ).fetchone()
+    if row is None:
+        return
+    version, epoch, snapshot_version = row
     
-    if node_id in graph_data['positions']:
-        graph_data['positions'][node_id] = {'x': x, 'y': y}
-        return jsonify({'success': True})
+    if epoch == workspace['epoch'] and workspace['version'] < version:
+        if _replay_changes(workspace_id, workspace, version):
+            return
     
-    return jsonify({'success': False})
+    snapshot = conn.execute('SELECT snapshot FROM workspaces WHERE id = ?', (workspace_id,)).fetchone()[0]
+    if isinstance(snapshot, bytes):
+        _load_graph_binary(workspace, snapshot)
+    else:
+        _load_graph(workspace, json.loads(snapshot))
+    workspace['version'] = snapshot_version
+    workspace['epoch'] = epoch
+    if snapshot_version < version and not _replay_changes(workspace_id, workspace, version):
+        raise RuntimeError('Nhật ký thay đổi của workspace không đầy đủ')
 
-@app.route('/api/toggle_directed', methods=['POST'])
-def toggle_directed():
+def _replay_changes(workspace_id, workspace, version):
     
-    data = request.json
-    is_directed = data.get('is_directed', False)
+    rows = _db().execute(
+        'SELECT state FROM workspace_changes WHERE workspace_id = ? AND version > ? AND version <= ? ORDER BY version',
+        (workspace_id, workspace['version'], version)
+    ).fetchall()
+    if len(rows) != version - workspace['version'] or any(state is None for state, in rows):
+        return False
     
+    graph = workspace['graph']
+    for state, in rows:
+        state = json.loads(state)
+        removed = []
+        for node in state['nodes']:
+            if len(node) == 1:
+                removed.append(node[0])
+            elif node[0] in graph:
+                _set_position(workspace, node[0], node[1], node[2])
+            else:
+                _add_node(workspace, node[0], node[1], node[2])
+        for edge in state['edges']:
+            if len(edge) == 3:
+                _set_edge(workspace, edge[0], edge[1], edge[2])
+            elif graph.has_edge(edge[0], edge[1]):
+                _remove_edge(workspace, edge[0], edge[1])
+        for node_id in removed:
+            if node_id in graph:
+                _remove_node(workspace, node_id)
+    workspace['version'] = version
+    return True
 
-    old_positions = graph_data['positions'].copy()
+def _change_state(workspace, changes):
+    
+    graph = workspace['graph']
+    positions = workspace['positions']
+    nodes = []
+    for node_id in changes.nodes:
+        if node_id in graph:
+            pos = positions.get(node_id, {'x': 400, 'y': 300})
+            nodes.append([node_id, pos['x'], pos['y']])
+        else:
+            nodes.append([node_id])
     
+    edges = []
+    for u, v in changes.edges:
+        if graph.has_edge(u, v):
+            edges.append([u, v, graph[u][v].get('weight', 1)])
+        else:
+            edges.append([u, v])
+    return {'nodes': nodes, 'edges': edges}
 
-    if is_directed:
-        new_graph = nx.DiGraph()
+def _save_workspace(workspace_id, workspace, changes=None):
+    
+    conn = _db()
+    version = workspace['version']
+    if changes is None or changes.reset:
+        nodes, edges, reset, state = [], [], 1, None
+        replay_size = None
     else:
-        new_graph = nx.Graph()
+        nodes, edges, reset = list(changes.nodes), [list(edge) for edge in changes.edges], 0
+        state = json.dumps(_change_state(workspace, changes), ensure_ascii=False, separators=(',', ':'))
+        row = conn.execute(
+            'SELECT snapshot_version, replay_size FROM workspaces WHERE id = ? AND epoch = ? AND version = ?',
+            (workspace_id, workspace['epoch'], version - 1)
+        ).fetchone()
+        replay_size = None
+        if row is not None and version - row[0] <= SNAPSHOT_INTERVAL:
+            replay_size = row[1] + len(nodes) + len(edges)
+            if replay_size > SNAPSHOT_REPLAY_RATIO * _workspace_size(workspace):
+                replay_size = None
     
-
-    new_graph.add_nodes_from(graph_data['graph'].nodes())
+    if replay_size is None:
+        snapshot_version = version
+        conn.execute(
+            'INSERT OR REPLACE INTO workspaces (id, version, snapshot, updated_at, epoch, snapshot_version, replay_size) '
+            'VALUES (?, ?, ?, ?, ?, ?, 0)',
+            (workspace_id, version, _serialize_graph_binary(workspace), time.time(), workspace['epoch'], version)
+        )
+    else:
+        snapshot_version = row[0]
+        conn.execute(
+            'UPDATE workspaces SET version = ?, updated_at = ?, replay_size = ? WHERE id = ?',
+            (version, time.time(), replay_size, workspace_id)
+        )
     
+    conn.execute(
+        'INSERT OR REPLACE INTO workspace_changes (workspace_id, version, nodes, edges, reset, state) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        (workspace_id, version, json.dumps(nodes), json.dumps(edges), reset, state)
+    )
+    conn.execute(
+        'DELETE FROM workspace_changes WHERE workspace_id = ? AND version <= ?',
+        (workspace_id, min(version - CHANGELOG_LIMIT, snapshot_version))
+    )
 
-    for edge in graph_data['graph'].edges(data=True):
-        new_graph.add_edge(edge[0], edge[1], **edge[2])
+def _changes_since(workspace_id, since, version):
+    
+    rows = _db().execute(
+        'SELECT nodes, edges, reset FROM workspace_changes '
+        'WHERE workspace_id = ? AND version > ? AND version <= ? ORDER BY version',
+        (workspace_id, since, version)
+    ).fetchall()
+    if len(rows) != version - since:
+        return None
     
+    changes = GraphChanges()
+    for nodes, edges, reset in rows:
+        if reset:
+            return None
+        changes.nodes.update(json.loads(nodes))
+        changes.edges.update(tuple(edge) for edge in json.loads(edges))
+    return changes
 
-    graph_data['graph'] = new_graph
-    graph_data['positions'] = old_positions
-    graph_data['is_directed'] = is_directed
+def _current_workspace():
     
-    return jsonify({
-        'success': True, 
-        'message': f'Đã chuyển sang đồ thị {"có hướng" if is_directed else "vô hướng"}'
-    })
+    if 'workspace' not in g:
+        workspace_id = _current_workspace_id()
+        workspace = workspace_store.get(workspace_id)
+        _sync_workspace(workspace_id, workspace)
+        g.workspace = workspace
+    return g.workspace
 
-@app.route('/api/export_graph', methods=['GET'])
-def export_graph():
+@contextlib.contextmanager
+def _workspace_transaction():
     
+    conn = _db()
+    conn.execute('BEGIN IMMEDIATE')
     try:
+        yield _current_workspace()
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        workspace_store.discard(_current_workspace_id())
+        raise
 
-        save_data = {
-            'nodes': [],
-            'edges': [],
-            'is_directed': graph_data['is_directed']
-        }
-        
+def _commit_workspace(workspace):
+    
+    workspace['version'] += 1
+    _save_workspace(_current_workspace_id(), workspace, g.get('graph_changes'))
 
-        for node_id in graph_data['graph'].nodes():
-            pos = graph_data['positions'].get(node_id, {'x': 400, 'y': 300})
-            save_data['nodes'].append({
-                'id': node_id,
-                'x': pos['x'],
-                'y': pos['y']
-            })
+def workspace_mutation(view):
+    
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
         
+        with _workspace_transaction() as workspace:
+            response = view(*args, **kwargs)
+            result = response.get_json(silent=True) or {}
+            if result.get('success'):
+                _commit_workspace(workspace)
+        return response
+    
+    return wrapper
 
-        for edge in graph_data['graph'].edges():
-            weight = graph_data['graph'].get_edge_data(edge[0], edge[1]).get('weight', 1)
-            save_data['edges'].append({
-                'source': edge[0],
-                'target': edge[1],
-                'weight': weight
-            })
-        
-        return jsonify({
-            'success': True,
-            'data': save_data
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Lỗi khi xuất: {str(e)}'
-        })
+def _request_changes():
+    
+    if 'graph_changes' not in g:
+        g.graph_changes = GraphChanges()
+    return g.graph_changes
 
-@app.route('/api/import_graph', methods=['POST'])
-def import_graph():
+graph_data = LocalProxy(_current_workspace)
+
+@app.after_request
+def _persist_workspace_cookie(response):
     
-    try:
-        graph_file_data = request.json
-        
-        if not graph_file_data:
-            return jsonify({
-                'success': False,
-                'message': 'Dữ liệu không hợp lệ'
-            })
-        
+    if 'workspace_id' in g:
+        workspace_store.touch(g.workspace_id)
+        response.set_cookie(WORKSPACE_COOKIE, g.workspace_id,
+                            max_age=WORKSPACE_RETENTION, httponly=True, samesite='Lax')
+    return response
 
-        graph_data['graph'].clear()
-        graph_data['positions'].clear()
-        
+BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS', 100000))
+POSITION_RATE_WINDOW = 10
 
-        is_directed = graph_file_data.get('is_directed', False)
-        if is_directed:
-            graph_data['graph'] = nx.DiGraph()
-        else:
-            graph_data['graph'] = nx.Graph()
+class PositionChannelStats:
+    
+    def __init__(self, window):
         
-        graph_data['is_directed'] = is_directed
+        self.window = window
+        self.flushes = 0
+        self.received = 0
+        self.applied = 0
+        self.dropped = 0
+        self.ignored = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+    
+    def record(self, received, applied, dropped, ignored):
         
-
-        for node in graph_file_data.get('nodes', []):
-            node_id = node['id']
-            graph_data['graph'].add_node(node_id)
-            graph_data['positions'][node_id] = {
-                'x': node.get('x', 400),
-                'y': node.get('y', 300)
+        now = time.monotonic()
+        with self._lock:
+            self.flushes += 1
+            self.received += received
+            self.applied += applied
+            self.dropped += dropped
+            self.ignored += ignored
+            self._recent.append(now)
+            self._trim(now)
+    
+    def stats(self):
+        
+        with self._lock:
+            self._trim(time.monotonic())
+            return {
+                'flushes': self.flushes,
+                'flush_rate': round(len(self._recent) / self.window, 2),
+                'updates_received': self.received,
+                'updates_applied': self.applied,
+                'updates_dropped': self.dropped,
+                'updates_ignored': self.ignored
             }
+    
+    def _trim(self, now):
         
+        while self._recent and now - self._recent[0] > self.window:
+            self._recent.popleft()
 
-        for edge in graph_file_data.get('edges', []):
-            graph_data['graph'].add_edge(
-                edge['source'],
-                edge['target'],
-                weight=edge.get('weight', 1)
-            )
-        
-        return jsonify({
-            'success': True,
-            'message': 'Đã tải đồ thị thành công'
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Lỗi khi tải: {str(e)}'
-        })
+position_channel = PositionChannelStats(POSITION_RATE_WINDOW)
 
-@app.route('/api/shortest_path', methods=['POST'])
-def shortest_path():
+class GraphChanges:
     
-    try:
-        data = request.json
-        source = data.get('source')
-        target = data.get('target')
+    def __init__(self):
         
-        if not source or not target:
-            return jsonify({
-                'success': False,
-                'message': 'Vui lòng chọn node bắt đầu và node kết thúc'
-            })
+        self.nodes = set()
+        self.edges = set()
+        self.reset = False
+        self._undo = []
+    
+    def touch_node(self, node_id):
         
-        if source not in graph_data['graph'] or target not in graph_data['graph']:
-            return jsonify({
-                'success': False,
-                'message': 'Node không tồn tại trong đồ thị'
-            })
+        self.nodes.add(node_id)
+    
+    def touch_edge(self, u, v):
         
-        if source == target:
-            return jsonify({
-                'success': True,
-                'path': [source],
-                'distance': 0,
-                'message': f'Node bắt đầu và kết thúc trùng nhau'
-            })
+        self.edges.add((u, v))
+    
+    def mark_reset(self):
         
-        try:
+        self.reset = True
+    
+    def on_undo(self, action):
+        
+        self._undo.append(action)
+    
+    def mark(self):
+        
+        return len(self._undo)
+    
+    def rollback(self, mark=0):
+        
+        while len(self._undo) > mark:
+            self._undo.pop()()
 
-            path = nx.shortest_path(graph_data['graph'], source=source, target=target, weight='weight')
-            distance = nx.shortest_path_length(graph_data['graph'], source=source, target=target, weight='weight')
-            
-            return jsonify({
-                'success': True,
-                'path': path,
-                'distance': round(distance, 2),
-                'message': f'Đường đi ngắn nhất từ {source} đến {target}: {" → ".join(path)} (độ dài: {round(distance, 2)})'
-            })
-        except nx.NetworkXNoPath:
-            return jsonify({
-                'success': False,
-                'message': f'Không tìm thấy đường đi từ {source} đến {target}'
-            })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Lỗi: {str(e)}'
-        })
+DERIVED_KEYS = ('stats_engine', 'adjacency_index', 'mst_engine', 'flow_network', 'spatial_index')
 
-@app.route('/api/bfs', methods=['POST'])
-def bfs_traversal():
+class GraphListener:
     
-    try:
-        data = request.json
+    def __init__(self, graph):
+        
+        self.graph = graph
+    
+    def on_add_node(self, node_id):
+        
+        pass
+    
+    def on_remove_node(self, node_id):
+        
+        pass
+    
+    def on_add_edge(self, u, v):
+        
+        pass
+    
+    def on_remove_edge(self, u, v, weight):
+        
+        pass
+    
+    def on_reweight(self, u, v, old_weight, weight):
+        
+        pass
+    
+    def on_move(self, node_id):
+        
+        pass
+
+def _listeners(workspace):
+    
+    graph = workspace['graph']
+    for key in DERIVED_KEYS:
+        listener = workspace.get(key)
+        if listener is not None and listener.graph is graph:
+            yield listener
+
+def _drop_derived(workspace, keys=DERIVED_KEYS):
+    
+    for key in keys:
+        workspace.pop(key, None)
+
+class GraphStatsEngine(GraphListener):
+    
+    def __init__(self, graph):
+        
+        super().__init__(graph)
+        self.directed = graph.is_directed()
+        self.num_edges = 0
+        self.degrees = {}
+        self.histogram = Counter()
+        self.odd = 0
+        self.balance = {}
+        self.unbalanced = Counter()
+        self.parent = {}
+        self.size = {}
+        self.components = 0
+        self.dirty = False
+        
+        for node_id in graph:
+            self.on_add_node(node_id)
+        for u, v in graph.edges():
+            self.on_add_edge(u, v)
+    
+    def on_add_node(self, node_id):
+        
+        self.degrees[node_id] = 0
+        self.histogram[0] += 1
+        if self.directed:
+            self.balance[node_id] = 0
+        self.parent[node_id] = node_id
+        self.size[node_id] = 1
+        self.components += 1
+    
+    def on_remove_node(self, node_id):
+        
+        self.histogram[self.degrees[node_id]] -= 1
+        if not self.histogram[self.degrees[node_id]]:
+            del self.histogram[self.degrees[node_id]]
+        del self.degrees[node_id]
+        if self.directed:
+            del self.balance[node_id]
+        
+
+        if not self.dirty:
+            del self.parent[node_id]
+            del self.size[node_id]
+            self.components -= 1
+    
+    def on_add_edge(self, u, v):
+        
+        self.num_edges += 1
+        self._shift_degree(u, 1)
+        self._shift_degree(v, 1)
+        if self.directed:
+            self._shift_balance(u, 1)
+            self._shift_balance(v, -1)
+        self._union(u, v)
+    
+    def on_remove_edge(self, u, v, weight):
+        
+        self.num_edges -= 1
+        self._shift_degree(u, -1)
+        self._shift_degree(v, -1)
+        if self.directed:
+            self._shift_balance(u, -1)
+            self._shift_balance(v, 1)
+        
+
+        if u != v and not (self.directed and self.graph.has_edge(v, u)):
+            self.dirty = True
+    
+    def num_components(self):
+        
+        if self.dirty:
+            self._rebuild_components()
+        return self.components
+    
+    def is_connected(self):
+        
+        return len(self.degrees) > 0 and self.num_components() == 1
+    
+    def is_eulerian(self):
+        
+        if self.directed:
+            return not self.unbalanced and self.is_connected()
+        return self.odd == 0 and self.is_connected()
+    
+    def has_eulerian_path(self):
+        
+        if self.is_eulerian():
+            return True
+        if self.directed:
+            return (self.unbalanced['other'] == 0 and self.unbalanced['out'] <= 1
+                    and self.unbalanced['in'] <= 1 and self.is_connected())
+        return self.odd == 2 and self.is_connected()
+    
+    def stats(self):
+        
+        num_nodes = len(self.degrees)
+        density = 0
+        if num_nodes > 1:
+            density = self.num_edges / (num_nodes * (num_nodes - 1))
+            if not self.directed:
+                density *= 2
+        
+        return {
+            'num_nodes': num_nodes,
+            'num_edges': self.num_edges,
+            'density': density,
+            'is_connected': self.is_connected(),
+            'num_components': self.num_components(),
+            'odd_degree_vertices': self.odd,
+            'degree_distribution': {str(degree): count for degree, count in sorted(self.histogram.items())}
+        }
+    
+    def _shift_degree(self, node_id, delta):
+        
+        if not delta:
+            return
+        old = self.degrees[node_id]
+        self.histogram[old] -= 1
+        if not self.histogram[old]:
+            del self.histogram[old]
+        self.histogram[old + delta] += 1
+        self.degrees[node_id] = old + delta
+        self.odd += (old + delta) % 2 - old % 2
+    
+    def _shift_balance(self, node_id, delta):
+        
+        old = self.balance[node_id]
+        new = old + delta
+        self.balance[node_id] = new
+        if old:
+            kind = self._balance_kind(old)
+            self.unbalanced[kind] -= 1
+            if not self.unbalanced[kind]:
+                del self.unbalanced[kind]
+        if new:
+            self.unbalanced[self._balance_kind(new)] += 1
+    
+    @staticmethod
+    def _balance_kind(balance):
+        
+        if balance == 1:
+            return 'out'
+        if balance == -1:
+            return 'in'
+        return 'other'
+    
+    def _find(self, node_id):
+        
+        parent = self.parent
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+    
+    def _union(self, u, v):
+        
+        root_u = self._find(u)
+        root_v = self._find(v)
+        if root_u == root_v:
+            return
+        if self.size[root_u] < self.size[root_v]:
+            root_u, root_v = root_v, root_u
+        self.parent[root_v] = root_u
+        self.size[root_u] += self.size[root_v]
+        self.components -= 1
+    
+    def _rebuild_components(self):
+        
+        self.parent = {node_id: node_id for node_id in self.graph}
+        self.size = dict.fromkeys(self.graph, 1)
+        self.components = len(self.parent)
+        self.dirty = False
+        for u, v in self.graph.edges():
+            self._union(u, v)
+
+def _stats_engine(workspace):
+    
+    engine = workspace.get('stats_engine')
+    if engine is None or engine.graph is not workspace['graph']:
+        engine = GraphStatsEngine(workspace['graph'])
+        workspace['stats_engine'] = engine
+    return engine
+
+def _position_key(positions, node_id):
+    
+    pos = positions.get(node_id, {})
+    return (pos.get('y', 0), pos.get('x', 0))
+
+class AdjacencyIndex(GraphListener):
+    
+    def __init__(self, graph, positions):
+        
+        super().__init__(graph)
+        self.positions = positions
+        self.directed = graph.is_directed()
+        self.node_keys = {}
+        self.keys = {}
+        self.items = {}
+        self.seqs = {}
+        
+        max_degree = 0
+        for node_id in graph:
+            self.node_keys[node_id] = _position_key(positions, node_id)
+        for node_id in graph:
+            entries = []
+            for seq, neighbor in enumerate(graph.neighbors(node_id)):
+                self.seqs[(node_id, neighbor)] = seq
+                entries.append((self.node_keys[neighbor] + (seq,), neighbor))
+                max_degree = max(max_degree, seq + 1)
+            entries.sort(key=lambda entry: entry[0])
+            self.keys[node_id] = [entry[0] for entry in entries]
+            self.items[node_id] = [entry[1] for entry in entries]
+        self._counter = itertools.count(max_degree)
+    
+    def neighbors(self, node_id):
+        
+        return self.items[node_id]
+    
+    def on_add_node(self, node_id):
+        
+        self.node_keys[node_id] = _position_key(self.positions, node_id)
+        self.keys[node_id] = []
+        self.items[node_id] = []
+    
+    def on_remove_node(self, node_id):
+        
+        del self.node_keys[node_id]
+        del self.keys[node_id]
+        del self.items[node_id]
+    
+    def on_add_edge(self, u, v):
+        
+        seq = next(self._counter)
+        self._insert(u, v, seq)
+        if not self.directed and u != v:
+            self._insert(v, u, seq)
+    
+    def on_remove_edge(self, u, v, weight):
+        
+        self._delete(u, v)
+        del self.seqs[(u, v)]
+        if not self.directed and u != v:
+            self._delete(v, u)
+            del self.seqs[(v, u)]
+    
+    def on_move(self, node_id):
+        
+        old_key = self.node_keys[node_id]
+        new_key = _position_key(self.positions, node_id)
+        if new_key == old_key:
+            return
+        
+        owners = self.graph.pred[node_id] if self.directed else self.graph.adj[node_id]
+        for owner in owners:
+            self._delete(owner, node_id)
+        self.node_keys[node_id] = new_key
+        for owner in owners:
+            self._insert(owner, node_id, self.seqs[(owner, node_id)])
+    
+    def _insert(self, owner, neighbor, seq):
+        
+        self.seqs[(owner, neighbor)] = seq
+        key = self.node_keys[neighbor] + (seq,)
+        index = bisect.bisect_left(self.keys[owner], key)
+        self.keys[owner].insert(index, key)
+        self.items[owner].insert(index, neighbor)
+    
+    def _delete(self, owner, neighbor):
+        
+        key = self.node_keys[neighbor] + (self.seqs[(owner, neighbor)],)
+        index = bisect.bisect_left(self.keys[owner], key)
+        del self.keys[owner][index]
+        del self.items[owner][index]
+
+def _adjacency_index(workspace):
+    
+    index = workspace.get('adjacency_index')
+    if index is None or index.graph is not workspace['graph'] or index.positions is not workspace['positions']:
+        index = AdjacencyIndex(workspace['graph'], workspace['positions'])
+        workspace['adjacency_index'] = index
+    return index
+
+SPATIAL_CELL = 32.0
+SPATIAL_LEVELS = 16
+
+class SpatialIndex(GraphListener):
+    
+    def __init__(self, graph, positions):
+        
+        super().__init__(graph)
+        self.positions = positions
+        self.points = {}
+        self.members = {}
+        self.levels = [{} for _ in range(SPATIAL_LEVELS)]
+        if graph.number_of_nodes():
+            with _gc_paused():
+                self._build()
+    
+    def on_add_node(self, node_id):
+        
+        self._insert(node_id)
+    
+    def on_remove_node(self, node_id):
+        
+        self._delete(node_id)
+    
+    def on_move(self, node_id):
+        
+        self._delete(node_id)
+        self._insert(node_id)
+    
+    def count(self, x0, y0, x1, y1):
+        
+
+        level = 0
+        while level < SPATIAL_LEVELS - 1 and max(x1 - x0, y1 - y0) / self.cell_size(level) > 8:
+            level += 1
+        return sum(entry[0] for _, entry in self._cells(self.levels[level], level, x0, y0, x1, y1))
+    
+    def nodes_in(self, x0, y0, x1, y1):
+        
+        for _, members in self._cells(self.members, 0, x0, y0, x1, y1):
+            for node_id in members:
+                x, y = self.points[node_id]
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    yield node_id
+    
+    def clusters(self, level, x0, y0, x1, y1):
+        
+        for _, (count, sum_x, sum_y) in self._cells(self.levels[level], level, x0, y0, x1, y1):
+            yield {'x': sum_x / count, 'y': sum_y / count, 'count': count}
+    
+    @staticmethod
+    def cell_size(level):
+        
+        return SPATIAL_CELL * (1 << level)
+    
+    def _cells(self, table, level, x0, y0, x1, y1):
+        
+
+        size = self.cell_size(level)
+        cx0, cy0 = math.floor(x0 / size), math.floor(y0 / size)
+        cx1, cy1 = math.floor(x1 / size), math.floor(y1 / size)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(table):
+            for cell, entry in table.items():
+                if cx0 <= cell[0] <= cx1 and cy0 <= cell[1] <= cy1:
+                    yield cell, entry
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                entry = table.get((cx, cy))
+                if entry:
+                    yield (cx, cy), entry
+    
+    def _build(self):
+        
+
+        nodes = list(self.graph)
+        n = len(nodes)
+        coords = np.fromiter(
+            itertools.chain.from_iterable(_node_xy(self.positions, node) for node in nodes),
+            dtype=np.float64, count=2 * n
+        ).reshape(n, 2)
+        self.points = dict(zip(nodes, map(tuple, coords.tolist())))
+        cells = np.floor(coords / SPATIAL_CELL).astype(np.int64)
+        for node_id, cell in zip(nodes, map(tuple, cells.tolist())):
+            members = self.members.get(cell)
+            if members is None:
+                self.members[cell] = {node_id}
+            else:
+                members.add(node_id)
+        
+        for level, table in enumerate(self.levels):
+            low = cells.min(axis=0)
+            span = int(cells[:, 1].max() - low[1]) + 1
+            keys = (cells[:, 0] - low[0]) * span + (cells[:, 1] - low[1])
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            counts = np.bincount(inverse)
+            sum_x = np.bincount(inverse, weights=coords[:, 0])
+            sum_y = np.bincount(inverse, weights=coords[:, 1])
+            for cell, count, total_x, total_y in zip(map(tuple, cells[first].tolist()), counts.tolist(), sum_x.tolist(), sum_y.tolist()):
+                table[cell] = [count, total_x, total_y]
+            cells >>= 1
+    
+    def _insert(self, node_id):
+        
+        x, y = _node_xy(self.positions, node_id)
+        x, y = float(x), float(y)
+        self.points[node_id] = (x, y)
+        cx, cy = math.floor(x / SPATIAL_CELL), math.floor(y / SPATIAL_CELL)
+        self.members.setdefault((cx, cy), set()).add(node_id)
+        for table in self.levels:
+            entry = table.get((cx, cy))
+            if entry is None:
+                table[(cx, cy)] = [1, x, y]
+            else:
+                entry[0] += 1
+                entry[1] += x
+                entry[2] += y
+            cx >>= 1
+            cy >>= 1
+    
+    def _delete(self, node_id):
+        
+        x, y = self.points.pop(node_id)
+        cx, cy = math.floor(x / SPATIAL_CELL), math.floor(y / SPATIAL_CELL)
+        members = self.members[(cx, cy)]
+        members.discard(node_id)
+        if not members:
+            del self.members[(cx, cy)]
+        for table in self.levels:
+            entry = table[(cx, cy)]
+            if entry[0] == 1:
+                del table[(cx, cy)]
+            else:
+                entry[0] -= 1
+                entry[1] -= x
+                entry[2] -= y
+            cx >>= 1
+            cy >>= 1
+
+def _spatial_index(workspace):
+    
+    index = workspace.get('spatial_index')
+    if index is None or index.graph is not workspace['graph'] or index.positions is not workspace['positions']:
+        index = SpatialIndex(workspace['graph'], workspace['positions'])
+        workspace['spatial_index'] = index
+    return index
+
+class DynamicMST(GraphListener):
+    
+    def __init__(self, graph):
+        
+        super().__init__(graph)
+        self.tree = {node_id: {} for node_id in graph}
+        self._orders = {}
+        for u, v, weight in _spanning_forest_edges(graph):
+            self._link(u, v, weight)
+    
+    def edges(self, algorithm='kruskal'):
+        
+        order = self._orders.get(algorithm)
+        if order is None:
+            order = self._prim_order() if algorithm == 'prim' else self._kruskal_order()
+            self._orders[algorithm] = order
+        return order
+    
+    def components(self, algorithm='kruskal'):
+        
+        key = ('forest', algorithm)
+        groups = self._orders.get(key)
+        if groups is None:
+            label = {}
+            groups = []
+            for root in self.tree:
+                if root in label:
+                    continue
+                label[root] = len(groups)
+                queue = deque([root])
+                size = 0
+                while queue:
+                    node_id = queue.popleft()
+                    size += 1
+                    for neighbor in self.tree[node_id]:
+                        if neighbor not in label:
+                            label[neighbor] = label[root]
+                            queue.append(neighbor)
+                groups.append((size, []))
+            for edge in self.edges(algorithm):
+                groups[label[edge[0]]][1].append(edge)
+            self._orders[key] = groups
+        return groups
+    
+    def on_add_node(self, node_id):
+        
+        self.tree[node_id] = {}
+        self._orders.clear()
+    
+    def on_remove_node(self, node_id):
+        
+        del self.tree[node_id]
+        self._orders.clear()
+    
+    def on_add_edge(self, u, v):
+        
+        if u != v:
+            self._insert(u, v, self.graph[u][v].get('weight', 1))
+    
+    def on_remove_edge(self, u, v, weight):
+        
+        if v in self.tree[u]:
+            self._cut(u, v)
+            self._replace(u, v)
+    
+    def on_reweight(self, u, v, old_weight, weight):
+        
+        if u == v:
+            return
+        if v in self.tree[u]:
+            if weight <= old_weight:
+                self.tree[u][v] = weight
+                self.tree[v][u] = weight
+                self._orders.clear()
+            else:
+                self._cut(u, v)
+                self._replace(u, v)
+        elif weight < old_weight:
+            self._insert(u, v, weight)
+    
+    def _link(self, u, v, weight):
+        
+        self.tree[u][v] = weight
+        self.tree[v][u] = weight
+        self._orders.clear()
+    
+    def _cut(self, u, v):
+        
+        del self.tree[u][v]
+        del self.tree[v][u]
+        self._orders.clear()
+    
+    def _insert(self, u, v, weight):
+        
+
+        path = self._tree_path(u, v)
+        if path is None:
+            self._link(u, v, weight)
+            return
+        
+        a, b = max(zip(path, path[1:]), key=lambda pair: self.tree[pair[0]][pair[1]])
+        if self.tree[a][b] > weight:
+            self._cut(a, b)
+            self._link(u, v, weight)
+    
+    def _tree_path(self, u, v):
+        
+        parents = ({u: None}, {v: None})
+        queues = (deque([u]), deque([v]))
+        while queues[0] and queues[1]:
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            parent, other = parents[side], parents[1 - side]
+            for _ in range(len(queues[side])):
+                node_id = queues[side].popleft()
+                for neighbor in self.tree[node_id]:
+                    if neighbor in parent:
+                        continue
+                    parent[neighbor] = node_id
+                    if neighbor in other:
+                        return self._join_path(parents, neighbor)
+                    queues[side].append(neighbor)
+        return None
+    
+    @staticmethod
+    def _join_path(parents, meeting):
+        
+        path = []
+        node_id = meeting
+        while node_id is not None:
+            path.append(node_id)
+            node_id = parents[0][node_id]
+        path.reverse()
+        node_id = parents[1][meeting]
+        while node_id is not None:
+            path.append(node_id)
+            node_id = parents[1][node_id]
+        return path
+    
+    def _replace(self, u, v):
+        
+
+        side = self._smaller_side(u, v)
+        best = None
+        for node_id in side:
+            for neighbor, data in self.graph.adj[node_id].items():
+                if neighbor not in side:
+                    weight = data.get('weight', 1)
+                    if best is None or weight < best[2]:
+                        best = (node_id, neighbor, weight)
+        if best is not None:
+            self._link(*best)
+    
+    def _smaller_side(self, u, v):
+        
+        sides = ({u}, {v})
+        queues = (deque([u]), deque([v]))
+        while True:
+            for side, queue in zip(sides, queues):
+                if not queue:
+                    return side
+                node_id = queue.popleft()
+                for neighbor in self.tree[node_id]:
+                    if neighbor not in side:
+                        side.add(neighbor)
+                        queue.append(neighbor)
+    
+    def _kruskal_order(self):
+        
+        order = []
+        seen = set()
+        for u, neighbors in self.tree.items():
+            seen.add(u)
+            for v, weight in neighbors.items():
+                if v not in seen:
+                    order.append((u, v, weight))
+        order.sort(key=lambda edge: edge[2])
+        return order
+    
+    def _prim_order(self):
+        
+        order = []
+        visited = set()
+        counter = itertools.count()
+        for root in self.tree:
+            if root in visited:
+                continue
+            visited.add(root)
+            heap = [(weight, next(counter), root, v) for v, weight in self.tree[root].items()]
+            heapq.heapify(heap)
+            while heap:
+                weight, _, u, v = heapq.heappop(heap)
+                if v in visited:
+                    continue
+                visited.add(v)
+                order.append((u, v, weight))
+                for neighbor, neighbor_weight in self.tree[v].items():
+                    if neighbor not in visited:
+                        heapq.heappush(heap, (neighbor_weight, next(counter), v, neighbor))
+        return order
+
+def _mst_engine(workspace):
+    
+    engine = workspace.get('mst_engine')
+    if engine is None or engine.graph is not workspace['graph']:
+        engine = DynamicMST(workspace['graph'])
+        workspace['mst_engine'] = engine
+    return engine
+
+def _add_node(workspace, node_id, x, y, changes=None):
+    
+    workspace['graph'].add_node(node_id)
+    workspace['positions'][node_id] = {'x': x, 'y': y}
+    for listener in _listeners(workspace):
+        listener.on_add_node(node_id)
+    if changes is not None:
+        changes.touch_node(node_id)
+        changes.on_undo(lambda: _remove_node(workspace, node_id))
+
+def _remove_node(workspace, node_id, changes=None):
+    
+    graph = workspace['graph']
+    if graph.is_directed():
+        incident = list(graph.out_edges(node_id)) + list(graph.in_edges(node_id))
+    else:
+        incident = list(graph.edges(node_id))
+    for u, v in incident:
+        if graph.has_edge(u, v):
+            _remove_edge(workspace, u, v, changes)
+    
+    graph.remove_node(node_id)
+    pos = workspace['positions'].pop(node_id, None)
+    for listener in _listeners(workspace):
+        listener.on_remove_node(node_id)
+    if changes is not None:
+        changes.touch_node(node_id)
+        if pos is None:
+            pos = {'x': 400, 'y': 300}
+        changes.on_undo(lambda: _add_node(workspace, node_id, pos['x'], pos['y']))
+
+def _set_edge(workspace, u, v, weight, changes=None):
+    
+    graph = workspace['graph']
+    old_weight = graph[u][v].get('weight', 1) if graph.has_edge(u, v) else None
+    graph.add_edge(u, v, weight=weight)
+    for listener in _listeners(workspace):
+        if old_weight is None:
+            listener.on_add_edge(u, v)
+        else:
+            listener.on_reweight(u, v, old_weight, weight)
+    if changes is not None:
+        changes.touch_edge(u, v)
+        if old_weight is None:
+            changes.on_undo(lambda: _remove_edge(workspace, u, v))
+        else:
+            changes.on_undo(lambda: _set_edge(workspace, u, v, old_weight))
+
+def _remove_edge(workspace, u, v, changes=None):
+    
+    graph = workspace['graph']
+    weight = graph[u][v].get('weight', 1)
+    graph.remove_edge(u, v)
+    for listener in _listeners(workspace):
+        listener.on_remove_edge(u, v, weight)
+    if changes is not None:
+        changes.touch_edge(u, v)
+        changes.on_undo(lambda: _set_edge(workspace, u, v, weight))
+
+def _set_position(workspace, node_id, x, y, changes=None):
+    
+    old_pos = workspace['positions'].get(node_id, {'x': 400, 'y': 300})
+    workspace['positions'][node_id] = {'x': x, 'y': y}
+    for listener in _listeners(workspace):
+        listener.on_move(node_id)
+    if changes is not None:
+        changes.touch_node(node_id)
+        changes.on_undo(lambda: _set_position(workspace, node_id, old_pos['x'], old_pos['y']))
+
+def _op_add_node(workspace, data, changes):
+    
+    node_id = data.get('node_id')
+    x = data.get('x', 400)
+    y = data.get('y', 300)
+    
+    if node_id and node_id not in workspace['graph']:
+        _add_node(workspace, node_id, x, y, changes)
+        return {'success': True, 'message': 'Node đã được thêm'}
+    
+    return {'success': False, 'message': 'Node đã tồn tại hoặc không hợp lệ'}
+
+def _op_add_edge(workspace, data, changes):
+    
+    node1 = data.get('node1')
+    node2 = data.get('node2')
+    weight = data.get('weight', 1)
+    
+    if not (node1 in workspace['graph'] and node2 in workspace['graph']):
+        return {'success': False, 'message': 'Một hoặc cả hai node không tồn tại'}
+    
+    if not workspace['is_directed']:
+        _set_edge(workspace, node1, node2, weight, changes)
+        return {'success': True, 'message': f'Cạnh {node1}-{node2} đã được thêm'}
+    
+    direction = data.get('direction', 'both')
+    
+    if direction == 'one_way_1_to_2':
+        _set_edge(workspace, node1, node2, weight, changes)
+        return {'success': True, 'message': f'Cạnh {node1} → {node2} đã được thêm'}
+    elif direction == 'one_way_2_to_1':
+        _set_edge(workspace, node2, node1, weight, changes)
+        return {'success': True, 'message': f'Cạnh {node2} → {node1} đã được thêm'}
+    else:
+        _set_edge(workspace, node1, node2, weight, changes)
+        _set_edge(workspace, node2, node1, weight, changes)
+        return {'success': True, 'message': f'Cạnh 2 chiều {node1} ↔ {node2} đã được thêm'}
+
+def _op_remove_node(workspace, data, changes):
+    
+    node_id = data.get('node_id')
+    
+    if node_id in workspace['graph']:
+        _remove_node(workspace, node_id, changes)
+        return {'success': True, 'message': f'Đã xóa đỉnh {node_id}'}
+    
+    return {'success': False, 'message': 'Đỉnh không tồn tại'}
+
+def _op_remove_edge(workspace, data, changes):
+    
+    node1 = data.get('node1')
+    node2 = data.get('node2')
+    
+    if node1 in workspace['graph'] and node2 in workspace['graph']:
+        if workspace['graph'].has_edge(node1, node2):
+            _remove_edge(workspace, node1, node2, changes)
+            return {'success': True, 'message': f'Đã xóa cạnh {node1}-{node2}'}
+        else:
+            return {'success': False, 'message': 'Cạnh không tồn tại'}
+    
+    return {'success': False, 'message': 'Một hoặc cả hai đỉnh không tồn tại'}
+
+def _op_update_position(workspace, data, changes):
+    
+    node_id = data.get('node_id')
+    
+    if node_id in workspace['positions']:
+        _set_position(workspace, node_id, data.get('x'), data.get('y'), changes)
+        return {'success': True}
+    
+    return {'success': False}
+
+GRAPH_OPERATIONS = {
+    'add_node': _op_add_node,
+    'add_edge': _op_add_edge,
+    'remove_node': _op_remove_node,
+    'remove_edge': _op_remove_edge,
+    'update_position': _op_update_position
+}
+
+def _apply_operation(workspace, name, data, changes):
+    
+    operation = GRAPH_OPERATIONS.get(name)
+    if operation is None:
+        return {'success': False, 'message': f'Thao tác không hợp lệ: {name}'}
+    
+    mark = changes.mark()
+    try:
+        return operation(workspace, data, changes)
+    except Exception as e:
+        changes.rollback(mark)
+        return {'success': False, 'message': f'Lỗi: {str(e)}'}
+
+def _graph_delta(workspace, changes, version):
+    
+    graph = workspace['graph']
+    positions = workspace['positions']
+    
+    nodes = []
+    removed_nodes = []
+    for node_id in changes.nodes:
+        if node_id in graph:
+            pos = positions.get(node_id, {'x': 400, 'y': 300})
+            nodes.append({'id': node_id, 'x': pos['x'], 'y': pos['y']})
+        else:
+            removed_nodes.append(node_id)
+    
+    edges = []
+    removed_edges = []
+    seen = set()
+    for u, v in changes.edges:
+        if not workspace['is_directed']:
+            if (v, u) in seen:
+                continue
+            seen.add((u, v))
+        if graph.has_edge(u, v):
+            edges.append({'source': u, 'target': v, 'weight': graph[u][v].get('weight', 1)})
+        else:
+            removed_edges.append({'source': u, 'target': v})
+    
+    return {
+        'nodes': nodes,
+        'removed_nodes': removed_nodes,
+        'edges': edges,
+        'removed_edges': removed_edges,
+        'stats': _graph_stats(workspace),
+        'version': version
+    }
+
+@app.route('/')
+def index():
+    
+    return render_template('index.html')
+
+@app.route('/api/add_node', methods=['POST'])
+@workspace_mutation
+def add_node():
+    
+    return jsonify(_apply_operation(graph_data, 'add_node', request.json, _request_changes()))
+
+@app.route('/api/add_edge', methods=['POST'])
+@workspace_mutation
+def add_edge():
+    
+    return jsonify(_apply_operation(graph_data, 'add_edge', request.json, _request_changes()))
+
+@app.route('/api/remove_node', methods=['POST'])
+@workspace_mutation
+def remove_node():
+    
+    return jsonify(_apply_operation(graph_data, 'remove_node', request.json, _request_changes()))
+
+@app.route('/api/remove_edge', methods=['POST'])
+@workspace_mutation
+def remove_edge():
+    
+    return jsonify(_apply_operation(graph_data, 'remove_edge', request.json, _request_changes()))
+
+def _viewport_only(workspace):
+    
+
+    max_nodes = request.args.get('max_nodes', type=int)
+    return max_nodes is not None and workspace['graph'].number_of_nodes() > max_nodes
+
+@app.route('/api/get_graph', methods=['GET'])
+def get_graph():
+    
+    if _viewport_only(graph_data):
+        return jsonify({
+            'nodes': [],
+            'edges': [],
+            'viewport': True,
+            'stats': _graph_stats(graph_data),
+            'is_directed': graph_data['is_directed'],
+            'version': graph_data['version']
+        })
+    
+    serialized = _serialize_graph(graph_data)
+    return jsonify({
+        'nodes': serialized['nodes'],
+        'edges': serialized['edges'],
+        'stats': _graph_stats(graph_data),
+        'is_directed': graph_data['is_directed'],
+        'version': graph_data['version']
+    })
+
+VIEWPORT_MAX_NODES = int(os.environ.get('VIEWPORT_MAX_NODES', 3000))
+VIEWPORT_MAX_EDGES = int(os.environ.get('VIEWPORT_MAX_EDGES', 10000))
+VIEWPORT_CLUSTER_PX = 48
+
+def _viewport_subgraph(workspace, visible):
+    
+
+    graph = workspace['graph']
+    positions = workspace['positions']
+    inside = set(visible)
+    done = set()
+    extra = {}
+    edges = []
+    truncated = False
+    for node_id in visible:
+        if graph.is_directed():
+            incident = [(node_id, v, data) for v, data in graph.adj[node_id].items()]
+            incident.extend((u, node_id, graph[u][node_id]) for u in graph.pred[node_id] if u not in inside)
+        else:
+            incident = [(node_id, v, data) for v, data in graph.adj[node_id].items() if v not in done]
+            done.add(node_id)
+        for u, v, data in incident:
+            if len(edges) >= VIEWPORT_MAX_EDGES:
+                truncated = True
+                break
+            edges.append({'source': u, 'target': v, 'weight': data.get('weight', 1)})
+            for endpoint in (u, v):
+                if endpoint not in inside:
+                    extra[endpoint] = True
+        if truncated:
+            break
+    
+    nodes = []
+    for node_id in itertools.chain(visible, extra):
+        x, y = _node_xy(positions, node_id)
+        nodes.append({'id': node_id, 'x': x, 'y': y})
+    return nodes, edges, truncated
+
+@app.route('/api/viewport', methods=['GET'])
+def viewport():
+    
+    try:
+        x0 = request.args.get('x0', type=float)
+        y0 = request.args.get('y0', type=float)
+        x1 = request.args.get('x1', type=float)
+        y1 = request.args.get('y1', type=float)
+        scale = request.args.get('scale', 1.0, type=float)
+        if None in (x0, y0, x1, y1) or x1 < x0 or y1 < y0 or scale <= 0:
+            return jsonify({
+                'success': False,
+                'message': 'Vùng nhìn không hợp lệ'
+            })
+        
+        index = _spatial_index(graph_data)
+        result = {
+            'success': True,
+            'stats': _graph_stats(graph_data),
+            'is_directed': graph_data['is_directed'],
+            'version': graph_data['version']
+        }
+        
+        if index.count(x0, y0, x1, y1) > VIEWPORT_MAX_NODES:
+            level = 0
+            while level < SPATIAL_LEVELS - 1 and index.cell_size(level) * scale < VIEWPORT_CLUSTER_PX:
+                level += 1
+            result.update({
+                'mode': 'clusters',
+                'cell_size': index.cell_size(level),
+                'clusters': list(index.clusters(level, x0, y0, x1, y1)),
+                'nodes': [],
+                'edges': []
+            })
+            return jsonify(result)
+        
+        visible = list(index.nodes_in(x0, y0, x1, y1))
+        nodes, edges, truncated = _viewport_subgraph(graph_data, visible)
+        result.update({
+            'mode': 'nodes',
+            'nodes': nodes,
+            'edges': edges,
+            'truncated': truncated
+        })
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+@app.route('/api/get_graph_delta', methods=['GET'])
+def get_graph_delta():
+    
+    since = request.args.get('since', type=int)
+    version = graph_data['version']
+    
+    changes = None
+    if since is not None and 0 <= since <= version:
+        changes = _changes_since(_current_workspace_id(), since, version)
+    
+    if changes is None:
+        if _viewport_only(graph_data):
+            return jsonify({
+                'full': True,
+                'nodes': [],
+                'edges': [],
+                'viewport': True,
+                'stats': _graph_stats(graph_data),
+                'is_directed': graph_data['is_directed'],
+                'version': version
+            })
+        
+        serialized = _serialize_graph(graph_data)
+        return jsonify({
+            'full': True,
+            'nodes': serialized['nodes'],
+            'edges': serialized['edges'],
+            'stats': _graph_stats(graph_data),
+            'is_directed': graph_data['is_directed'],
+            'version': version
+        })
+    
+    delta = _graph_delta(graph_data, changes, version)
+    delta['full'] = False
+    return jsonify(delta)
+
+@app.route('/api/batch', methods=['POST'])
+@workspace_mutation
+def batch():
+    
+    changes = _request_changes()
+    try:
+        data = request.json or {}
+        operations = data.get('operations')
+        atomic = data.get('atomic', True)
+        
+        if not isinstance(operations, list) or not operations:
+            return jsonify({
+                'success': False,
+                'message': 'Danh sách thao tác không hợp lệ'
+            })
+        
+        if len(operations) > BATCH_MAX_OPERATIONS:
+            return jsonify({
+                'success': False,
+                'message': f'Tối đa {BATCH_MAX_OPERATIONS} thao tác mỗi lô'
+            })
+        
+        results = []
+        applied = 0
+        for index, operation in enumerate(operations):
+            if not isinstance(operation, dict):
+                result = {'success': False, 'message': 'Thao tác không hợp lệ'}
+            else:
+                result = _apply_operation(graph_data, operation.get('op'), operation, changes)
+            
+            if result['success']:
+                applied += 1
+                results.append({'success': True})
+                continue
+            
+            results.append({'success': False, 'message': result.get('message', '')})
+            if atomic:
+                changes.rollback()
+                return jsonify({
+                    'success': False,
+                    'results': results,
+                    'applied': 0,
+                    'message': f'Đã hủy toàn bộ lô: thao tác #{index + 1} thất bại ({result.get("message", "")})'
+                })
+        
+        if applied == 0:
+            return jsonify({
+                'success': False,
+                'results': results,
+                'applied': 0,
+                'message': f'Không thao tác nào thành công (0/{len(operations)})'
+            })
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'applied': applied,
+            'delta': _graph_delta(graph_data, changes, graph_data['version'] + 1),
+            'message': f'Đã thực hiện {applied}/{len(operations)} thao tác'
+        })
+    except Exception as e:
+        changes.rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+LAYOUT_MULTILEVEL_MIN = int(os.environ.get('LAYOUT_MULTILEVEL_MIN', 1000))
+LAYOUT_TIME_BUDGET = float(os.environ.get('LAYOUT_TIME_BUDGET', 30))
+LAYOUT_MAX_ITERATIONS = 1000
+LAYOUT_COARSEST = 100
+LAYOUT_CUTOFF = 2.0
+LAYOUT_GRAVITY = 0.02
+LAYOUT_PAIR_BUDGET = 10
+LAYOUT_STREAM_FPS = 10
+
+class ForceLayout:
+    
+    def __init__(self, graph, positions=None, iterations=50, time_budget=LAYOUT_TIME_BUDGET, seed=42):
+        
+        self.nodes = list(graph)
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.rng = np.random.default_rng(seed)
+        self.timed_out = False
+        
+        index = {node_id: i for i, node_id in enumerate(self.nodes)}
+        edges = [(index[u], index[v], abs(w)) for u, v, w in graph.edges(data='weight', default=1) if u != v]
+        src = np.array([edge[0] for edge in edges], dtype=np.int64)
+        dst = np.array([edge[1] for edge in edges], dtype=np.int64)
+        weight = self._normalize(np.array([edge[2] for edge in edges], dtype=np.float64))
+        
+        self.initial = None
+        if positions is not None:
+            self.initial = self._warm_positions(positions)
+        if self.initial is None and len(self.nodes) > LAYOUT_MULTILEVEL_MIN:
+            self.levels = self._coarsen(len(self.nodes), src, dst, weight)
+        else:
+            self.levels = [(len(self.nodes), src, dst, weight, None)]
+        self.depth = len(self.levels) - 1
+        self.cutoff = LAYOUT_CUTOFF
+        self.pos = None
+    
+    def run(self):
+        
+        for _ in self.steps():
+            pass
+        return self.pos
+    
+    def steps(self):
+        
+
+        started = time.perf_counter()
+        total = sum(level[0] * self._level_iterations(depth) for depth, level in enumerate(self.levels))
+        done = 0
+        for depth in range(len(self.levels) - 1, -1, -1):
+            n = self.levels[depth][0]
+            if self.pos is None:
+                if self.initial is not None:
+                    self.pos = self.initial
+                    temperature = 1.0
+                else:
+                    self.pos = self.rng.random((n, 2)) * math.sqrt(n)
+                    temperature = math.sqrt(n) / 10
+            else:
+                parent = self.levels[depth][4]
+                scale = math.sqrt(n / self.levels[depth + 1][0])
+                self.pos = self.pos[parent] * scale + self.rng.normal(0, 0.5, (n, 2))
+                temperature = 1.0
+            self.depth = depth
+            self.cutoff = LAYOUT_CUTOFF
+            
+            iterations = self._level_iterations(depth)
+            cooling = temperature / (iterations + 1)
+            for _ in range(iterations):
+                if self.timed_out or time.perf_counter() - started > self.time_budget:
+                    self.timed_out = True
+                    break
+                self._step(self.levels[depth], temperature)
+                temperature -= cooling
+                done += n
+                yield done / total
+        yield 1.0
+    
+    def _level_iterations(self, depth):
+        
+
+        if depth == len(self.levels) - 1:
+            return self.iterations
+        return max(self.iterations // 4, 5)
+    
+    def coordinates(self, width, height):
+        
+
+        mapping = np.arange(len(self.nodes))
+        for level in self.levels[:self.depth]:
+            mapping = level[4][mapping]
+        pos = self.pos[mapping]
+        
+        margin = min(width, height) * 0.05
+        low = pos.min(axis=0)
+        span = np.maximum(pos.max(axis=0) - low, 1e-9)
+        scaled = margin + (pos - low) / span * (np.array([width, height]) - 2 * margin)
+        if len(self.nodes) == 1:
+            scaled[:] = (width / 2, height / 2)
+        return scaled
+    
+    def positions(self, width, height):
+        
+        scaled = self.coordinates(width, height)
+        return {node_id: (float(x), float(y)) for node_id, (x, y) in zip(self.nodes, scaled)}
+    
+    def _step(self, level, temperature):
+        
+        n, src, dst, weight, _ = level
+        pos = self.pos
+        disp = np.zeros_like(pos)
+        
+        if n > 1:
+            tree = cKDTree(pos)
+            
+
+            sample = pos[self.rng.integers(0, n, min(n, 256))]
+            expected = tree.query_ball_point(sample, self.cutoff, return_length=True).mean() * n / 2
+            if expected > LAYOUT_PAIR_BUDGET * n:
+                self.cutoff *= math.sqrt(LAYOUT_PAIR_BUDGET * n / expected)
+            elif expected < LAYOUT_PAIR_BUDGET * n / 2:
+                self.cutoff = min(self.cutoff * 1.1, LAYOUT_CUTOFF)
+            pairs = tree.query_pairs(self.cutoff, output_type='ndarray')
+            if len(pairs):
+                i, j = pairs[:, 0], pairs[:, 1]
+                delta = pos[i] - pos[j]
+                dist2 = np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-4)
+                force = delta / dist2[:, None]
+                disp += self._scatter(i, force, n) - self._scatter(j, force, n)
+        
+        if len(src):
+            delta = pos[src] - pos[dst]
+            dist = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+            force = delta * (dist * weight)[:, None]
+            disp += self._scatter(dst, force, n) - self._scatter(src, force, n)
+        
+        disp -= (pos - pos.mean(axis=0)) * LAYOUT_GRAVITY
+        length = np.maximum(np.sqrt(np.einsum('ij,ij->i', disp, disp)), 1e-9)
+        pos += disp * (np.minimum(length, max(temperature, 0.01)) / length)[:, None]
+    
+    @staticmethod
+    def _scatter(index, values, n):
+        
+        return np.stack([np.bincount(index, values[:, 0], n), np.bincount(index, values[:, 1], n)], axis=1)
+    
+    @staticmethod
+    def _normalize(weight):
+        
+        if not len(weight) or not weight.mean():
+            return np.ones_like(weight)
+        return weight / weight.mean()
+    
+    def _warm_positions(self, positions):
+        
+
+        known = [positions.get(node_id) for node_id in self.nodes]
+        if not self.nodes or sum(pos is not None for pos in known) < len(self.nodes) / 2:
+            return None
+        coords = np.array([(pos['x'], pos['y']) if pos else (np.nan, np.nan) for pos in known], dtype=np.float64)
+        missing = np.isnan(coords[:, 0])
+        present = np.flatnonzero(~missing)
+        _, first = np.unique(coords[present], axis=0, return_index=True)
+        if len(first) < len(present) / 2:
+            return None
+        low = np.nanmin(coords, axis=0)
+        span = float(np.nanmax(coords - low))
+        if span < 1e-6:
+            return None
+        
+        coords = (coords - low) / span * math.sqrt(len(self.nodes))
+        coords[missing] = self.rng.random((int(missing.sum()), 2)) * math.sqrt(len(self.nodes))
+        duplicate = np.zeros(len(coords), dtype=bool)
+        duplicate[present] = True
+        duplicate[present[first]] = False
+        coords[duplicate] += self.rng.normal(0, 0.1, (int(duplicate.sum()), 2))
+        return coords
+    
+    def _coarsen(self, n, src, dst, weight):
+        
+        levels = []
+        while n > LAYOUT_COARSEST:
+            parent = self._match(n, src, dst)
+            coarse_n = int(parent.max()) + 1
+            if coarse_n > n * 0.85:
+                break
+            levels.append((n, src, dst, weight, parent))
+            
+            low = np.minimum(parent[src], parent[dst])
+            high = np.maximum(parent[src], parent[dst])
+            keep = low != high
+            keys, inverse = np.unique(low[keep] * coarse_n + high[keep], return_inverse=True)
+            n = coarse_n
+            src = keys // coarse_n
+            dst = keys % coarse_n
+            weight = self._normalize(np.bincount(inverse, weight[keep], len(keys)))
+        levels.append((n, src, dst, weight, None))
+        return levels
+    
+    def _match(self, n, src, dst):
+        
+
+        cluster = [-1] * n
+        order = self.rng.permutation(len(src))
+        pairs = list(zip(src[order].tolist(), dst[order].tolist()))
+        next_id = 0
+        for u, v in pairs:
+            if cluster[u] < 0 and cluster[v] < 0:
+                cluster[u] = cluster[v] = next_id
+                next_id += 1
+        for u, v in pairs:
+            if cluster[u] < 0 and cluster[v] >= 0:
+                cluster[u] = cluster[v]
+            elif cluster[v] < 0 and cluster[u] >= 0:
+                cluster[v] = cluster[u]
+        for node in range(n):
+            if cluster[node] < 0:
+                cluster[node] = next_id
+                next_id += 1
+        return np.array(cluster, dtype=np.int64)
+
+def _layout_params(data):
+    
+    return {
+        'iterations': min(max(int(data.get('iterations', 50)), 1), LAYOUT_MAX_ITERATIONS),
+        'time_budget': min(max(float(data.get('time_budget', LAYOUT_TIME_BUDGET)), 0.1), LAYOUT_TIME_BUDGET),
+        'warm_start': bool(data.get('warm_start', False)),
+        'width': max(float(data.get('width', 800)), 1),
+        'height': max(float(data.get('height', 600)), 1)
+    }
+
+def _spring_layout_engine(workspace, params):
+    
+    positions = workspace['positions'] if params['warm_start'] else None
+    return ForceLayout(workspace['graph'], positions, params['iterations'], params['time_budget'])
+
+def _compute_spring_layout(workspace, params):
+    
+    layout = _spring_layout_engine(workspace, params)
+    layout.run()
+    return layout.positions(params['width'], params['height'])
+
+@app.route('/api/spring_layout', methods=['POST'])
+@workspace_mutation
+def spring_layout():
+    
+    if graph_data['graph'].number_of_nodes() > 0:
+
+        positions = _compute_spring_layout(graph_data, _layout_params(request.get_json(silent=True) or {}))
+        
+
+        _drop_derived(graph_data, ('adjacency_index', 'spatial_index'))
+        changes = _request_changes()
+        for node_id, (x, y) in positions.items():
+            _set_position(graph_data, node_id, x, y, changes)
+        return jsonify({'success': True, 'message': 'Spring layout đã được áp dụng'})
+    
+    return jsonify({'success': False, 'message': 'Không có node nào'})
+
+@app.route('/api/spring_layout/stream', methods=['GET'])
+def spring_layout_stream():
+    
+
+    if graph_data['graph'].number_of_nodes() == 0:
+        return jsonify({'success': False, 'message': 'Không có node nào'})
+    
+    try:
+        data = request.args.to_dict()
+        data['warm_start'] = data.get('warm_start', '').lower() in ('1', 'true')
+        params = _layout_params(data)
+        params['fps'] = min(max(float(data.get('fps', LAYOUT_STREAM_FPS)), 1), 30)
+        job_id = _submit_job(graph_data, 'spring_layout', params)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': f'Lỗi: {str(e)}'})
+    if job_id is None:
+        return jsonify({
+            'success': False,
+            'message': f'Mỗi workspace chỉ được chạy tối đa {JOB_MAX_PER_WORKSPACE} tác vụ cùng lúc'
+        })
+    
+    workspace_id = _current_workspace_id()
+    nodes = list(graph_data['graph'])
+    version = graph_data['version']
+    interval = 1 / params['fps']
+    
+    def event(name, payload):
+        
+        return f'event: {name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n'
+    
+    def generate():
+        
+
+        sent = None
+        seq = 0
+        status = 'queued'
+        last_write = time.monotonic()
+        try:
+            while True:
+                row = _db().execute(
+                    'SELECT status, frame_seq, frame, progress, result, error FROM jobs WHERE id = ?', (job_id,)
+                ).fetchone()
+                if row is None:
+                    status, result, error = 'failed', None, 'Không tìm thấy tác vụ'
+                    break
+                status, frame_seq, frame, progress, result, error = row
+                if frame_seq != seq and frame is not None:
+                    seq = frame_seq
+                    coords = np.frombuffer(frame, dtype='<i4').reshape(-1, 2).astype(np.int64)
+                    if sent is None:
+                        yield event('init', {
+                            'nodes': nodes,
+                            'xy': coords.ravel().tolist(),
+                            'progress': progress,
+                            'version': version
+                        })
+                    else:
+                        moved = np.flatnonzero((coords != sent).any(axis=1))
+                        if 3 * len(moved) < 2 * len(coords):
+                            update = {'i': moved.tolist(), 'd': (coords[moved] - sent[moved]).ravel().tolist()}
+                        else:
+                            update = {'d': (coords - sent).ravel().tolist()}
+                        update['progress'] = progress
+                        yield event('frame', update)
+                    sent = coords
+                    last_write = time.monotonic()
+                if status not in JOB_ACTIVE:
+                    break
+                if time.monotonic() - last_write > 1:
+                    yield ': keepalive\n\n'
+                    last_write = time.monotonic()
+                time.sleep(interval)
+            
+            if status == 'done':
+                yield event('done', {'progress': 1, 'timed_out': json.loads(result).get('timed_out', False)})
+            else:
+                yield event('failed', {'message': error or 'Tác vụ đã bị hủy'})
+        finally:
+            if status in JOB_ACTIVE:
+                _cancel_job(job_id, workspace_id)
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+@app.route('/api/circular_layout', methods=['POST'])
+@workspace_mutation
+def circular_layout():
+    
+    if graph_data['graph'].number_of_nodes() > 0:
+
+        params = _layout_params(request.get_json(silent=True) or {})
+        positions = nx.circular_layout(graph_data['graph'])
+        
+
+        _drop_derived(graph_data, ('adjacency_index', 'spatial_index'))
+        changes = _request_changes()
+        for node_id, (x, y) in positions.items():
+            _set_position(graph_data, node_id, (x + 1) * params['width'] / 2, (y + 1) * params['height'] / 2, changes)
+        return jsonify({'success': True, 'message': 'Circular layout đã được áp dụng'})
+    
+    return jsonify({'success': False, 'message': 'Không có node nào'})
+
+@app.route('/api/clear_all', methods=['POST'])
+@workspace_mutation
+def clear_all():
+    
+    graph_data['graph'].clear()
+    graph_data['positions'].clear()
+    graph_data['selected_node'] = None
+    _drop_derived(graph_data)
+    _request_changes().mark_reset()
+    return jsonify({'success': True, 'message': 'Đã xóa tất cả'})
+
+@app.route('/api/update_position', methods=['POST'])
+@workspace_mutation
+def update_position():
+    
+    return jsonify(_apply_operation(graph_data, 'update_position', request.json, _request_changes()))
+
+@app.route('/api/update_positions', methods=['POST'])
+@workspace_mutation
+def update_positions():
+    
+    try:
+        data = request.json or {}
+        updates = data.get('updates')
+        
+        if not isinstance(updates, list):
+            return jsonify({
+                'success': False,
+                'message': 'Danh sách vị trí không hợp lệ'
+            })
+        
+
+        latest = {}
+        for update in updates:
+            latest[update['node_id']] = (update['x'], update['y'])
+        
+        changes = _request_changes()
+        applied = 0
+        ignored = 0
+        for node_id, (x, y) in latest.items():
+            if node_id in graph_data['positions']:
+                _set_position(graph_data, node_id, x, y, changes)
+                applied += 1
+            else:
+                ignored += 1
+        
+        received = len(updates) + int(data.get('coalesced', 0))
+        dropped = received - len(latest)
+        position_channel.record(received, applied, dropped, ignored)
+        
+        return jsonify({
+            'success': True,
+            'applied': applied,
+            'dropped': dropped,
+            'ignored': ignored
+        })
+    except Exception as e:
+        _request_changes().rollback()
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+@app.route('/api/toggle_directed', methods=['POST'])
+@workspace_mutation
+def toggle_directed():
+    
+    data = request.json
+    is_directed = data.get('is_directed', False)
+    
+
+    old_positions = graph_data['positions'].copy()
+    
+
+    if is_directed:
+        new_graph = nx.DiGraph()
+    else:
+        new_graph = nx.Graph()
+    
+
+    new_graph.add_nodes_from(graph_data['graph'].nodes())
+    
+
+    for edge in graph_data['graph'].edges(data=True):
+        new_graph.add_edge(edge[0], edge[1], **edge[2])
+    
+
+    graph_data['graph'] = new_graph
+    graph_data['positions'] = old_positions
+    graph_data['is_directed'] = is_directed
+    _request_changes().mark_reset()
+    
+    return jsonify({
+        'success': True, 
+        'message': f'Đã chuyển sang đồ thị {"có hướng" if is_directed else "vô hướng"}'
+    })
+
+@app.route('/api/export_graph', methods=['GET'])
+def export_graph():
+    
+    try:
+        if request.args.get('format') == 'binary':
+            return Response(
+                _serialize_graph_binary(graph_data, compact=request.args.get('precision') == 'float32'),
+                mimetype='application/octet-stream',
+                headers={'Content-Disposition': 'attachment; filename=graph.gbin'}
+            )
+        
+        return jsonify({
+            'success': True,
+            'data': _serialize_graph(graph_data)
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi khi xuất: {str(e)}'
+        })
+
+@app.route('/api/import_graph', methods=['POST'])
+@workspace_mutation
+def import_graph():
+    
+    try:
+        if request.mimetype == 'application/octet-stream':
+            _load_graph_binary(graph_data, request.get_data())
+        else:
+            graph_file_data = request.get_json(silent=True)
+            
+            if not graph_file_data:
+                return jsonify({
+                    'success': False,
+                    'message': 'Dữ liệu không hợp lệ'
+                })
+            
+            _load_graph(graph_data, graph_file_data)
+        
+        _request_changes().mark_reset()
+        
+        return jsonify({
+            'success': True,
+            'message': 'Đã tải đồ thị thành công'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi khi tải: {str(e)}'
+        })
+
+IMPORT_CHUNK_SIZE = 64 * 1024
+IMPORT_MAX_LINE_BYTES = int(os.environ.get('IMPORT_MAX_LINE_BYTES', 64 * 1024))
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 10000))
+IMPORT_ERROR_SAMPLES = 100
+
+def _iter_body_lines(stream):
+    
+    pending = b''
+    overlong = False
+    while True:
+        chunk = stream.read(IMPORT_CHUNK_SIZE)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            yield None if overlong or len(line) > IMPORT_MAX_LINE_BYTES else line, len(line) + 1
+            overlong = False
+        if len(pending) > IMPORT_MAX_LINE_BYTES:
+            pending = b''
+            overlong = True
+    if pending or overlong:
+        yield None if overlong or len(pending) > IMPORT_MAX_LINE_BYTES else pending, len(pending)
+
+def _import_node_id(value):
+    
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError('Tên đỉnh không hợp lệ')
+
+def _import_weight(value):
+    
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = int(value)
+        except ValueError:
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError('Trọng số không phải là số')
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError('Trọng số không phải là số')
+    return value
+
+def _parse_ndjson_edge(text):
+    
+    try:
+        record = json.loads(text)
+    except ValueError:
+        raise ValueError('JSON không hợp lệ')
+    if isinstance(record, list) and len(record) in (2, 3):
+        source, target, weight = (record + [1])[:3]
+    elif isinstance(record, dict):
+        source, target, weight = record.get('source'), record.get('target'), record.get('weight', 1)
+    else:
+        raise ValueError('Dòng phải là object {source, target, weight} hoặc mảng [source, target, weight]')
+    return _import_node_id(source), _import_node_id(target), _import_weight(weight)
+
+def _parse_csv_edge(text):
+    
+    row = text.split(',') if '"' not in text else next(csv.reader([text]))
+    if len(row) not in (2, 3):
+        raise ValueError('Dòng CSV phải có 2 hoặc 3 cột')
+    weight = row[2] if len(row) == 3 and row[2].strip() else 1
+    return _import_node_id(row[0]), _import_node_id(row[1]), _import_weight(weight)
+
+def _random_position():
+    
+    return {'x': random.uniform(50, 750), 'y': random.uniform(50, 550)}
+
+@app.route('/api/import_edges', methods=['POST'])
+def import_edges():
+    
+    import_format = request.args.get('format') or ('csv' if request.mimetype == 'text/csv' else 'ndjson')
+    mode = request.args.get('mode', 'replace')
+    if import_format not in ('ndjson', 'csv') or mode not in ('replace', 'append'):
+        return jsonify({
+            'success': False,
+            'message': 'Định dạng hoặc chế độ nhập không hợp lệ'
+        })
+    
+    directed = request.args.get('directed', '0') in ('1', 'true')
+    parse = _parse_csv_edge if import_format == 'csv' else _parse_ndjson_edge
+    total_bytes = request.content_length
+    _current_workspace_id()
+    
+    def event(payload):
+        
+        return json.dumps(payload, ensure_ascii=False) + '\n'
+    
+    def generate():
+        
+        staging = nx.DiGraph() if directed or mode == 'append' else nx.Graph()
+        counts = {'lines': 0, 'edges': 0, 'errors': 0, 'bytes': 0}
+        samples = []
+        batch = []
+        
+        def reject(message):
+            
+            counts['errors'] += 1
+            if len(samples) < IMPORT_ERROR_SAMPLES:
+                samples.append({'line': counts['lines'], 'error': message})
+        
+        def flush():
+            
+            with _gc_paused():
+                staging.add_edges_from(batch)
+            counts['edges'] += len(batch)
+            batch.clear()
+            if staging.number_of_nodes() + counts['edges'] > WORKSPACE_MAX_ELEMENTS:
+                raise ValueError('Đồ thị vượt quá giới hạn kích thước của workspace')
+        
+        try:
+            for raw, size in _iter_body_lines(request.stream):
+                counts['lines'] += 1
+                counts['bytes'] += size
+                if raw is None:
+                    reject(f'Dòng dài quá {IMPORT_MAX_LINE_BYTES} byte')
+                    continue
+                try:
+                    text = raw.decode('utf-8').strip()
+                except UnicodeDecodeError:
+                    reject('Dòng không phải UTF-8')
+                    continue
+                if counts['lines'] == 1:
+                    text = text.lstrip('\ufeff')
+                    if import_format == 'csv' and text.lower().replace(' ', '').startswith('source,target'):
+                        continue
+                if not text or text.startswith('#'):
+                    continue
+                
+                try:
+                    source, target, weight = parse(text)
+                except ValueError as e:
+                    reject(str(e))
+                    continue
+                batch.append((source, target, {'weight': weight}))
+                
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    flush()
+                    yield event(dict(counts, type='progress', total_bytes=total_bytes))
+            flush()
+            
+            if counts['edges'] == 0:
+                yield event(dict(
+                    counts, type='done', success=False, error_samples=samples,
+                    message='Không có cạnh hợp lệ nào để nhập'
+                ))
+                return
+            
+            with _workspace_transaction() as workspace:
+                if mode == 'replace':
+                    workspace['graph'] = staging
+                    workspace['positions'] = {node: _random_position() for node in staging}
+                    workspace['is_directed'] = directed
+                    workspace['selected_node'] = None
+                else:
+                    graph = workspace['graph']
+                    incoming = staging if graph.is_directed() else staging.to_undirected(as_view=True)
+                    added = sum(1 for node in incoming if node not in graph)
+                    added += sum(1 for u, v in incoming.edges() if not graph.has_edge(u, v))
+                    if _workspace_size(workspace) - 1 + added > WORKSPACE_MAX_ELEMENTS:
+                        raise ValueError('Đồ thị vượt quá giới hạn kích thước của workspace')
+                    with _gc_paused():
+                        for node in staging:
+                            if node not in graph:
+                                workspace['positions'][node] = _random_position()
+                        graph.add_nodes_from(staging)
+                        graph.add_edges_from(staging.edges(data=True))
+                _drop_derived(workspace)
+                _request_changes().mark_reset()
+                _commit_workspace(workspace)
+                version = workspace['version']
+                num_nodes = workspace['graph'].number_of_nodes()
+            workspace_store.touch(_current_workspace_id())
+            
+            yield event(dict(
+                counts, type='done', success=True, nodes=num_nodes, version=version,
+                error_samples=samples,
+                message=f'Đã nhập {counts["edges"]} cạnh ({counts["errors"]} dòng lỗi bị bỏ qua)'
+            ))
+        except Exception as e:
+            yield event(dict(counts, type='done', success=False, error_samples=samples, message=f'Lỗi khi nhập: {str(e)}'))
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+SAVED_GRAPH_NAME_MAX = 100
+SAVED_GRAPH_COMPRESSION = 6
+SAVED_GRAPHS_PAGE_SIZE = 50
+
+def _saved_graph_info(row):
+    
+    name, num_nodes, num_edges, is_directed, size, created_at, updated_at = row
+    return {
+        'name': name,
+        'num_nodes': num_nodes,
+        'num_edges': num_edges,
+        'is_directed': bool(is_directed),
+        'size': size,
+        'created_at': created_at,
+        'updated_at': updated_at
+    }
+
+def _saved_graph_name():
+    
+    name = str((request.get_json(silent=True) or {}).get('filename', '')).strip()
+    if not name or len(name) > SAVED_GRAPH_NAME_MAX:
+        raise ValueError(f'Tên đồ thị phải có từ 1 đến {SAVED_GRAPH_NAME_MAX} ký tự')
+    return name
+
+def _remove_saved_file(filename):
+    
+    try:
+        os.remove(os.path.join(GRAPHS_FOLDER, filename))
+    except FileNotFoundError:
+        pass
+
+@app.route('/api/save_graph', methods=['POST'])
+def save_graph():
+    
+    try:
+        name = _saved_graph_name()
+        workspace = graph_data
+        payload = gzip.compress(_serialize_graph_binary(workspace), compresslevel=SAVED_GRAPH_COMPRESSION)
+        filename = uuid.uuid4().hex + '.gbin.gz'
+        with open(os.path.join(GRAPHS_FOLDER, filename), 'wb') as f:
+            f.write(payload)
+        
+        now = time.time()
+        owner = _current_workspace_id()
+        info = (
+            name, workspace['graph'].number_of_nodes(), workspace['graph'].number_of_edges(),
+            int(workspace['is_directed']), len(payload)
+        )
+        conn = _db()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            previous = conn.execute(
+                'SELECT filename, created_at FROM saved_graphs WHERE owner = ? AND name = ?', (owner, name)
+            ).fetchone()
+            created_at = previous[1] if previous else now
+            conn.execute(
+                'INSERT OR REPLACE INTO saved_graphs '
+                '(owner, name, filename, num_nodes, num_edges, is_directed, size, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (owner, name, filename) + info[1:] + (created_at, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            _remove_saved_file(filename)
+            raise
+        if previous:
+            _remove_saved_file(previous[0])
+        
+        return jsonify({
+            'success': True,
+            'message': f'Đã lưu đồ thị "{name}" lên server',
+            'graph': _saved_graph_info(info + (created_at, now))
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi khi lưu: {str(e)}'
+        })
+
+@app.route('/api/saved_graphs', methods=['GET'])
+def list_saved_graphs():
+    
+    try:
+        page = max(1, request.args.get('page', 1, type=int))
+        page_size = min(500, max(1, request.args.get('page_size', SAVED_GRAPHS_PAGE_SIZE, type=int)))
+        query = request.args.get('q', '').strip()
+        
+        where, params = 'WHERE owner = ?', (_current_workspace_id(),)
+        if query:
+            where += " AND name LIKE ? ESCAPE '\\'"
+            params += ('%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%',)
+        conn = _db()
+        total = conn.execute(f'SELECT COUNT(*) FROM saved_graphs {where}', params).fetchone()[0]
+        rows = conn.execute(
+            'SELECT name, num_nodes, num_edges, is_directed, size, created_at, updated_at '
+            f'FROM saved_graphs {where} ORDER BY updated_at DESC LIMIT ? OFFSET ?',
+            params + (page_size, (page - 1) * page_size)
+        ).fetchall()
+        
+        return jsonify({
+            'success': True,
+            'graphs': [_saved_graph_info(row) for row in rows],
+            'total': total,
+            'page': page,
+            'page_size': page_size
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+@app.route('/api/load_saved_graph', methods=['POST'])
+@workspace_mutation
+def load_saved_graph():
+    
+    try:
+        name = _saved_graph_name()
+        row = _db().execute(
+            'SELECT filename FROM saved_graphs WHERE owner = ? AND name = ?', (_current_workspace_id(), name)
+        ).fetchone()
+        if row is None:
+            return jsonify({
+                'success': False,
+                'message': f'Không tìm thấy đồ thị "{name}"'
+            })
+        
+        with open(os.path.join(GRAPHS_FOLDER, row[0]), 'rb') as f:
+            payload = gzip.decompress(f.read())
+        _load_graph_binary(graph_data, payload)
+        _request_changes().mark_reset()
+        
+        return jsonify({
+            'success': True,
+            'message': f'Đã tải đồ thị "{name}"'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi khi tải: {str(e)}'
+        })
+
+@app.route('/api/delete_saved_graph', methods=['POST'])
+def delete_saved_graph():
+    
+    try:
+        name = _saved_graph_name()
+        owner = _current_workspace_id()
+        conn = _db()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute(
+                'SELECT filename FROM saved_graphs WHERE owner = ? AND name = ?', (owner, name)
+            ).fetchone()
+            conn.execute('DELETE FROM saved_graphs WHERE owner = ? AND name = ?', (owner, name))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        
+        if row is None:
+            return jsonify({
+                'success': False,
+                'message': f'Không tìm thấy đồ thị "{name}"'
+            })
+        _remove_saved_file(row[0])
+        
+        return jsonify({
+            'success': True,
+            'message': f'Đã xóa đồ thị "{name}"'
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi khi xóa: {str(e)}'
+        })
+
+SHORTEST_PATH_CACHE_SOURCES = int(os.environ.get('SHORTEST_PATH_CACHE_SOURCES', 32))
+ALL_PAIRS_MAX_NODES = int(os.environ.get('ALL_PAIRS_MAX_NODES', 400))
+ALL_PAIRS_INLINE_MAX_NODES = int(os.environ.get('ALL_PAIRS_INLINE_MAX_NODES', 200))
+
+class ShortestPathEngine:
+    
+    def __init__(self, graph, version):
+        
+        self.graph = graph
+        self.version = version
+        self.trees = OrderedDict()
+        self.all_pairs = None
+        self.integral_weights = True
+        self.heuristic_scale = None
+    
+    def query(self, source, target):
+        
+        if self.all_pairs is not None:
+            return self._query_all_pairs(source, target) + ('floyd_warshall', True)
+        
+        cached = source in self.trees
+        if cached:
+            self.trees.move_to_end(source)
+        else:
+            self.trees[source] = nx.dijkstra_predecessor_and_distance(self.graph, source, weight='weight')
+            while len(self.trees) > SHORTEST_PATH_CACHE_SOURCES:
+                self.trees.popitem(last=False)
+        
+        pred, dist = self.trees[source]
+        if target not in dist:
+            raise nx.NetworkXNoPath(f'No path between {source} and {target}.')
+        
+        path = [target]
+        while path[-1] != source:
+            path.append(pred[path[-1]][0])
+        path.reverse()
+        return path, dist[target], 'dijkstra', cached
+    
+    def settled(self, source):
+        
+        if source in self.trees:
+            return len(self.trees[source][1])
+        return 0
+    
+    def bidirectional(self, source, target):
+        
+        if self.graph.is_directed():
+            adjacency = (self.graph.succ, self.graph.pred)
+        else:
+            adjacency = (self.graph.adj, self.graph.adj)
+        
+        dists = ({source: 0}, {target: 0})
+        parents = ({source: None}, {target: None})
+        done = (set(), set())
+        heaps = ([(0, 0, source)], [(0, 0, target)])
+        counter = itertools.count(1)
+        best = math.inf
+        meet = None
+        settled = 0
+        
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            other = 1 - side
+            d, _, node = heapq.heappop(heaps[side])
+            if node in done[side]:
+                continue
+            done[side].add(node)
+            settled += 1
+            
+            for neighbor, attrs in adjacency[side][node].items():
+                nd = d + attrs.get('weight', 1)
+                if nd < dists[side].get(neighbor, math.inf):
+                    dists[side][neighbor] = nd
+                    parents[side][neighbor] = node
+                    heapq.heappush(heaps[side], (nd, next(counter), neighbor))
+                if neighbor in dists[other]:
+                    total = dists[side][neighbor] + dists[other][neighbor]
+                    if total < best:
+                        best = total
+                        meet = neighbor
+        
+        if meet is None:
+            raise nx.NetworkXNoPath(f'No path between {source} and {target}.')
+        
+        path = []
+        node = meet
+        while node is not None:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+        node = parents[1][meet]
+        while node is not None:
+            path.append(node)
+            node = parents[1][node]
+        return path, best, settled
+    
+    def astar(self, source, target, positions):
+        
+        scale = self._heuristic_scale(positions)
+        goal = _node_xy(positions, target)
+        
+        def heuristic(node):
+            
+            x, y = _node_xy(positions, node)
+            return scale * math.hypot(x - goal[0], y - goal[1])
+        
+        g_score = {source: 0}
+        parents = {source: None}
+        done = set()
+        heap = [(heuristic(source), 0, source)]
+        counter = itertools.count(1)
+        settled = 0
+        
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            settled += 1
+            
+            if node == target:
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = parents[node]
+                path.reverse()
+                return path, g_score[target], settled, scale
+            
+            for neighbor, attrs in self.graph.adj[node].items():
+                ng = g_score[node] + attrs.get('weight', 1)
+                if ng < g_score.get(neighbor, math.inf):
+                    g_score[neighbor] = ng
+                    parents[neighbor] = node
+                    heapq.heappush(heap, (ng + heuristic(neighbor), next(counter), neighbor))
+        
+        raise nx.NetworkXNoPath(f'No path between {source} and {target}.')
+    
+    def _heuristic_scale(self, positions):
+        
+
+        if self.heuristic_scale is None:
+            scale = math.inf
+            for u, v, weight in self.graph.edges(data='weight', default=1):
+                if weight < 0:
+                    scale = 0
+                    break
+                ux, uy = _node_xy(positions, u)
+                vx, vy = _node_xy(positions, v)
+                length = math.hypot(ux - vx, uy - vy)
+                if length > 0:
+                    scale = min(scale, weight / length)
+            self.heuristic_scale = 0 if math.isinf(scale) else scale
+        return self.heuristic_scale
+    
+    def precompute_all_pairs(self, progress=None):
+        
+        if self.all_pairs is not None:
+            return True
+        n = self.graph.number_of_nodes()
+        if n > ALL_PAIRS_MAX_NODES:
+            return False
+        
+        nodes = list(self.graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        dist = np.full((n, n), np.inf)
+        pred = np.full((n, n), -1, dtype=np.int32)
+        integral = True
+        for u, v, weight in self.graph.edges(data='weight', default=1):
+            integral = integral and isinstance(weight, numbers.Integral)
+            i, j = index[u], index[v]
+            dist[i, j] = min(dist[i, j], weight)
+            pred[i, j] = i
+            if not self.graph.is_directed():
+                dist[j, i] = dist[i, j]
+                pred[j, i] = j
+        np.fill_diagonal(dist, 0)
+        np.fill_diagonal(pred, -1)
+        
+
+        for k in range(n):
+            if progress is not None:
+                progress(k / n)
+            candidate = dist[:, k, None] + dist[None, k, :]
+            better = candidate < dist
+            if better.any():
+                dist = np.where(better, candidate, dist)
+                pred = np.where(better, pred[None, k, :], pred)
+        
+        self.all_pairs = (nodes, index, dist, pred)
+        self.integral_weights = integral
+        return True
+    
+    def _query_all_pairs(self, source, target):
+        
+        nodes, index, dist, pred = self.all_pairs
+        i, j = index[source], index[target]
+        if not np.isfinite(dist[i, j]):
+            raise nx.NetworkXNoPath(f'No path between {source} and {target}.')
+        
+        path = [j]
+        while path[-1] != i:
+            path.append(int(pred[i, path[-1]]))
+        return [nodes[k] for k in reversed(path)], self.distance(dist[i, j].item())
+    
+    def distance(self, value):
+        
+        return int(value) if self.integral_weights and math.isfinite(value) else value
+
+def _node_xy(positions, node_id):
+    
+    pos = positions.get(node_id, {'x': 400, 'y': 300})
+    return pos.get('x') or 0, pos.get('y') or 0
+
+def _shortest_path_engine(workspace):
+    
+    engine = workspace.get('shortest_paths')
+    if engine is None or engine.version != workspace['version'] or engine.graph is not workspace['graph']:
+        engine = ShortestPathEngine(workspace['graph'], workspace['version'])
+        workspace['shortest_paths'] = engine
+    return engine
+
+@app.route('/api/shortest_path', methods=['POST'])
+def shortest_path():
+    
+    try:
+        data = request.json
+        source = data.get('source')
+        target = data.get('target')
+        
+        if not source or not target:
+            return jsonify({
+                'success': False,
+                'message': 'Vui lòng chọn node bắt đầu và node kết thúc'
+            })
+        
+        if source not in graph_data['graph'] or target not in graph_data['graph']:
+            return jsonify({
+                'success': False,
+                'message': 'Node không tồn tại trong đồ thị'
+            })
+        
+        if source == target:
+            return jsonify({
+                'success': True,
+                'path': [source],
+                'distance': 0,
+                'message': f'Node bắt đầu và kết thúc trùng nhau'
+            })
+        
+        algorithm = data.get('algorithm', 'dijkstra')
+        if algorithm not in ('dijkstra', 'bidirectional', 'astar'):
+            return jsonify({
+                'success': False,
+                'message': f'Thuật toán không hợp lệ: {algorithm}'
+            })
+        
+        try:
+            engine = _shortest_path_engine(graph_data)
+            started = time.perf_counter()
+            heuristic_scale = None
+            
+            if algorithm == 'bidirectional':
+                path, distance, settled = engine.bidirectional(source, target)
+                method, cached = algorithm, False
+            elif algorithm == 'astar':
+                path, distance, settled, heuristic_scale = engine.astar(source, target, graph_data['positions'])
+                method, cached = algorithm, False
+            else:
+                if data.get('all_pairs') and graph_data['graph'].number_of_nodes() <= ALL_PAIRS_INLINE_MAX_NODES:
+                    engine.precompute_all_pairs()
+                path, distance, method, cached = engine.query(source, target)
+                settled = engine.settled(source)
+            
+            return jsonify({
+                'success': True,
+                'path': path,
+                'distance': round(distance, 2),
+                'method': method,
+                'cached': cached,
+                'settled': settled,
+                'heuristic_scale': heuristic_scale,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+                'message': f'Đường đi ngắn nhất từ {source} đến {target}: {" → ".join(path)} (độ dài: {round(distance, 2)})'
+            })
+        except nx.NetworkXNoPath:
+            return jsonify({
+                'success': False,
+                'message': f'Không tìm thấy đường đi từ {source} đến {target}'
+            })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+TRAVERSAL_CHUNK_SIZE = 1000
+
+class JsonArrayStream:
+    
+    def __init__(self, items):
+        
+        self.items = items
+
+class JsonTextStream:
+    
+    def __init__(self, pieces):
+        
+        self.pieces = pieces
+
+def _json_stream_response(fields, chunk_size=TRAVERSAL_CHUNK_SIZE):
+    
+    fields = [(key, value) for key, value in fields if key != 'success']
+    state = {'failed': False}
+    
+    def generate():
+        
+
+        started = set()
+        closing = ''
+        yield '{'
+        try:
+            for key, value in fields:
+                prefix = (',' if started else '') + json.dumps(key) + ':'
+                started.add(key)
+                if isinstance(value, JsonArrayStream):
+                    yield prefix + '['
+                    closing = ']'
+                    buffer = []
+                    first = True
+                    for item in value.items:
+                        buffer.append(json.dumps(item))
+                        if len(buffer) >= chunk_size:
+                            yield ('' if first else ',') + ','.join(buffer)
+                            first = False
+                            buffer = []
+                    if buffer:
+                        yield ('' if first else ',') + ','.join(buffer)
+                    yield ']'
+                elif isinstance(value, JsonTextStream):
+                    yield prefix + '"'
+                    closing = '"'
+                    for piece in value.pieces:
+                        yield json.dumps(piece)[1:-1]
+                    yield '"'
+                else:
+                    yield prefix + json.dumps(value)
+                closing = ''
+            yield (',' if started else '') + '"success":true}'
+        except Exception as e:
+            state['failed'] = True
+            error = json.dumps(f'Lỗi: {str(e)}')
+            tail = closing + (',' if started else '') + '"success":false,"error":' + error
+            if 'message' not in started:
+                tail += ',"message":' + error
+            yield tail + '}'
+    
+    response = Response(generate(), mimetype='application/json')
+    response.stream_state = state
+    return response
+
+def _traverse(neighbors, start, depth_first=False, allowed=None):
+    
+    visited = {start}
+    yield start, None
+    
+    if depth_first:
+        stack = [(start, iter(neighbors(start)))]
+        while stack:
+            node, remaining = stack[-1]
+            for neighbor in remaining:
+                if neighbor not in visited and (allowed is None or neighbor in allowed):
+                    visited.add(neighbor)
+                    yield neighbor, node
+                    stack.append((neighbor, iter(neighbors(neighbor))))
+                    break
+            else:
+                stack.pop()
+    else:
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for neighbor in neighbors(node):
+                if neighbor not in visited and (allowed is None or neighbor in allowed):
+                    visited.add(neighbor)
+                    yield neighbor, node
+                    queue.append(neighbor)
+
+def _traversal_response(label, start_node, depth_first):
+    
+    neighbors = _adjacency_index(graph_data).neighbors
+    order = [node for node, _ in _traverse(neighbors, start_node, depth_first)]
+    
+    def message():
+        
+        yield f'{label} từ {start_node}: '
+        for index, node in enumerate(order):
+            yield (' → ' if index else '') + str(node)
+    
+    return _json_stream_response([
+        ('success', True),
+        ('order', JsonArrayStream(order)),
+        ('message', JsonTextStream(message()))
+    ])
+
+@app.route('/api/bfs', methods=['POST'])
+def bfs_traversal():
+    
+    try:
+        data = request.json
+        start_node = data.get('start_node')
+        
+        if not start_node:
+            return jsonify({
+                'success': False,
+                'message': 'Vui lòng chọn đỉnh bắt đầu'
+            })
+        
+        if start_node not in graph_data['graph']:
+            return jsonify({
+                'success': False,
+                'message': 'Đỉnh không tồn tại trong đồ thị'
+            })
+        
+
+        return _traversal_response('BFS', start_node, depth_first=False)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+@app.route('/api/dfs', methods=['POST'])
+def dfs_traversal():
+    
+    try:
+        data = request.json
         start_node = data.get('start_node')
         
-        if not start_node:
+        if not start_node:
+            return jsonify({
+                'success': False,
+                'message': 'Vui lòng chọn đỉnh bắt đầu'
+            })
+        
+        if start_node not in graph_data['graph']:
+            return jsonify({
+                'success': False,
+                'message': 'Đỉnh không tồn tại trong đồ thị'
+            })
+        
+
+        return _traversal_response('DFS', start_node, depth_first=True)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 256))
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+RESULT_CACHE_MAX_ENTRY_BYTES = int(os.environ.get('RESULT_CACHE_MAX_ENTRY_BYTES', 8 * 1024 * 1024))
+
+class ResultCache:
+    
+    def __init__(self, max_entries, max_bytes, max_entry_bytes):
+        
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.evictions = 0
+        self.oversized = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, key, body, mimetype):
+        
+        if len(body) > self.max_entry_bytes:
+            with self._lock:
+                self.oversized += 1
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            self._entries[key] = (body, mimetype)
+            self._bytes += len(body)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+    
+    def discard(self, key):
+        
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= len(entry[0])
+    
+    def record_not_modified(self):
+        
+        with self._lock:
+            self.not_modified += 1
+    
+    def stats(self):
+        
+        with self._lock:
+            requests = self.hits + self.misses + self.not_modified
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'evictions': self.evictions,
+                'oversized': self.oversized,
+                'hit_rate': round((self.hits + self.not_modified) / requests, 3) if requests else 0.0
+            }
+
+result_cache = ResultCache(RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_MAX_ENTRY_BYTES)
+
+def _capture_stream(chunks, key, mimetype, workspace, version, state=None):
+    
+    parts = []
+    size = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if parts is not None:
+                size += len(chunk)
+                if size <= result_cache.max_entry_bytes:
+                    parts.append(chunk)
+                else:
+                    parts = None
+            yield chunk
+    except BaseException:
+        result_cache.discard(key)
+        raise
+    if state and state['failed']:
+        result_cache.discard(key)
+    elif parts is not None and workspace['version'] == version:
+        result_cache.put(key, b''.join(parts), mimetype)
+
+def _is_successful(response):
+    
+    if response.status_code != 200:
+        return False
+    result = response.get_json(silent=True)
+    return not (isinstance(result, dict) and result.get('success') is False)
+
+def cached_result(view):
+    
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        
+        workspace = _current_workspace()
+        version = workspace['version']
+        key = (_current_workspace_id(), workspace['epoch'], version, request.endpoint,
+               tuple(sorted(request.args.items(multi=True))))
+        etag = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:24]
+        
+        if request.if_none_match.contains_weak(etag):
+            result_cache.record_not_modified()
+            response = Response(status=304)
+            response.set_etag(etag)
+        else:
+            entry = result_cache.get(key)
+            if entry is not None:
+                response = Response(entry[0], mimetype=entry[1])
+                response.set_etag(etag)
+            else:
+                response = view(*args, **kwargs)
+                if response.is_streamed:
+                    if response.status_code == 200:
+                        response.response = _capture_stream(response.response, key, response.mimetype, workspace,
+                                                            version, getattr(response, 'stream_state', None))
+                elif _is_successful(response):
+                    if workspace['version'] == version:
+                        result_cache.put(key, response.get_data(), response.mimetype)
+                    response.set_etag(etag)
+        
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('Cookie')
+        return response
+    
+    return wrapper
+
+COMPONENT_WORKERS = int(os.environ.get('COMPONENT_WORKERS', os.cpu_count() or 1))
+BIPARTITE_PARALLEL_MIN_EDGES = int(os.environ.get('BIPARTITE_PARALLEL_MIN_EDGES', 200000))
+BIPARTITE_WITNESS_MAX_EDGES = int(os.environ.get('BIPARTITE_WITNESS_MAX_EDGES', 2000000))
+
+_component_executor = None
+_component_executor_pid = None
+_component_executor_lock = threading.Lock()
+
+def _component_pool():
+    
+    global _component_executor, _component_executor_pid
+    with _component_executor_lock:
+        if _component_executor is None or _component_executor_pid != os.getpid():
+            _component_executor = ProcessPoolExecutor(
+                max_workers=COMPONENT_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _component_executor_pid = os.getpid()
+        return _component_executor
+
+def _reset_component_pool(broken):
+    
+    global _component_executor
+    with _component_executor_lock:
+        if _component_executor is broken:
+            _component_executor = None
+
+def _undirected_adjacency(graph):
+    
+    if not graph.is_directed():
+        return graph.adj
+    return {node: set(graph.succ[node]) | set(graph.pred[node]) for node in graph}
+
+def _tree_cycle(parent, u, v):
+    
+
+    left = [u]
+    while parent[left[-1]] is not None:
+        left.append(parent[left[-1]])
+    position = {node: index for index, node in enumerate(left)}
+    right = [v]
+    while right[-1] not in position:
+        right.append(parent[right[-1]])
+    return left[:position[right[-1]] + 1] + right[-2::-1]
+
+def _two_color(adjacency, nodes):
+    
+    color = {}
+    parent = {}
+    for root in nodes:
+        if root in color:
+            continue
+        color[root] = 0
+        parent[root] = None
+        queue = deque([root])
+        popleft = queue.popleft
+        append = queue.append
+        while queue:
+            u = popleft()
+            opposite = 1 - color[u]
+            for v in adjacency[u]:
+                side = color.get(v)
+                if side is None:
+                    color[v] = opposite
+                    parent[v] = u
+                    append(v)
+                elif side != opposite:
+                    return None, _tree_cycle(parent, u, v)
+    return color, None
+
+def _two_color_batch(batch):
+    
+    nodes, edges = batch
+    adjacency = {node: [] for node in nodes}
+    for u, v in edges:
+        adjacency[u].append(v)
+        adjacency[v].append(u)
+    return _two_color(adjacency, nodes)
+
+def _shortest_odd_cycle(adjacency, nodes, cycle):
+    
+
+    scanned = 0
+    for source in itertools.chain(list(cycle), nodes):
+        limit = (len(cycle) - 1) // 2
+        if limit == 0:
+            break
+        parent = {source: None}
+        depth = {source: 0}
+        queue = deque([source])
+        while queue:
+            u = queue.popleft()
+            if depth[u] >= limit:
+                break
+            found = None
+            for v in adjacency[u]:
+                scanned += 1
+                if v not in depth:
+                    parent[v] = u
+                    depth[v] = depth[u] + 1
+                    queue.append(v)
+                elif depth[v] == depth[u]:
+                    found = v
+                    break
+            if found is not None:
+                cycle = _tree_cycle(parent, u, found)
+                break
+        if scanned > BIPARTITE_WITNESS_MAX_EDGES:
+            return cycle, False
+    return cycle, True
+
+def _bipartite_coloring(graph):
+    
+    if graph.number_of_edges() >= BIPARTITE_PARALLEL_MIN_EDGES and COMPONENT_WORKERS >= 2:
+        components = list(nx.weakly_connected_components(graph) if graph.is_directed() else nx.connected_components(graph))
+        if len(components) > 1:
+            batches = [([], []) for _ in range(min(len(components), COMPONENT_WORKERS * 4))]
+            loads = [(0, index) for index in range(len(batches))]
+            for nodes in sorted(components, key=len, reverse=True):
+                edges = list(graph.edges(nodes))
+                load, index = heapq.heappop(loads)
+                batches[index][0].extend(nodes)
+                batches[index][1].extend(edges)
+                heapq.heappush(loads, (load + len(nodes) + len(edges), index))
+            
+            pool = _component_pool()
+            try:
+                results = list(pool.map(_two_color_batch, batches))
+            except BrokenProcessPool:
+                _reset_component_pool(pool)
+            else:
+                cycles = [cycle for _, cycle in results if cycle is not None]
+                if cycles:
+                    return None, min(cycles, key=len)
+                color = {}
+                for part, _ in results:
+                    color.update(part)
+                return color, None
+    
+    return _two_color(_undirected_adjacency(graph), graph)
+
+@app.route('/api/check_bipartite', methods=['GET'])
+@cached_result
+def check_bipartite():
+    
+    try:
+        if graph_data['graph'].number_of_nodes() == 0:
+            return jsonify({
+                'success': False,
+                'message': 'Đồ thị rỗng'
+            })
+        
+        graph = graph_data['graph']
+        color_dict, cycle = _bipartite_coloring(graph)
+        
+        if cycle is None:
+            set1 = [node for node, color in color_dict.items() if color == 0]
+            set2 = [node for node, color in color_dict.items() if color == 1]
+            
+            return jsonify({
+                'success': True,
+                'is_bipartite': True,
+                'set1': set1,
+                'set2': set2,
+                'color_dict': color_dict,
+                'message': f'Đây là đồ thị 2 phía!\nTập 1: {{{", ".join(set1)}}}\nTập 2: {{{", ".join(set2)}}}'
+            })
+        else:
+            cycle, shortest = _shortest_odd_cycle(_undirected_adjacency(graph), graph, cycle)
+            label = 'Chu trình lẻ ngắn nhất' if shortest else 'Chu trình lẻ'
+            return jsonify({
+                'success': True,
+                'is_bipartite': False,
+                'odd_cycle': cycle,
+                'cycle_length': len(cycle),
+                'shortest': shortest,
+                'message': f'Đây KHÔNG phải là đồ thị 2 phía\n{label} (độ dài {len(cycle)}): {" → ".join(cycle + cycle[:1])}'
+            })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+REPRESENTATION_CHUNK_CELLS = int(os.environ.get('REPRESENTATION_CHUNK_CELLS', 65536))
+
+def _adjacency_csr(graph, nodes):
+    
+    matrix = nx.to_scipy_sparse_array(graph, nodelist=nodes, weight='weight', format='csr')
+    matrix.sort_indices()
+    if np.array_equal(matrix.data, np.round(matrix.data)):
+        matrix.data = matrix.data.astype(np.int64)
+    return matrix
+
+def _dense_rows(matrix, start, stop):
+    
+    row = np.zeros(matrix.shape[1], dtype=matrix.dtype)
+    for i in range(start, stop):
+        begin, end = matrix.indptr[i], matrix.indptr[i + 1]
+        columns = matrix.indices[begin:end]
+        row[columns] = matrix.data[begin:end]
+        yield row.tolist()
+        row[columns] = 0
+
+def _page_bounds(total, page, page_size):
+    
+    if page_size is None:
+        return 0, total
+    page_size = max(1, page_size)
+    start = min(total, (max(1, page) - 1) * page_size)
+    return start, min(total, start + page_size)
+
+@app.route('/api/get_representations', methods=['GET'])
+@cached_result
+def get_representations():
+    
+    try:
+        graph = graph_data['graph']
+        if graph.number_of_nodes() == 0:
             return jsonify({
                 'success': False,
-                'message': 'Vui lòng chọn đỉnh bắt đầu'
+                'message': 'Đồ thị rỗng'
             })
         
-        if start_node not in graph_data['graph']:
+        matrix_format = request.args.get('format', 'dense')
+        if matrix_format not in ('dense', 'csr'):
             return jsonify({
                 'success': False,
-                'message': 'Đỉnh không tồn tại trong đồ thị'
+                'message': f'Định dạng ma trận không hợp lệ: {matrix_format}'
             })
         
-
-        from collections import deque
+        page = request.args.get('page', 1, type=int)
+        page_size = request.args.get('page_size', type=int)
         
-        visited = set()
-        queue = deque([start_node])
-        bfs_order = []
-        visited.add(start_node)
+        nodes = sorted(graph.nodes())
+        n = len(nodes)
+        matrix = _adjacency_csr(graph, nodes)
         
-        while queue:
-            current = queue.popleft()
-            bfs_order.append(current)
-            
+        if matrix_format == 'csr':
+            adj_matrix = {
+                'format': 'csr',
+                'shape': [n, n],
+                'indptr': matrix.indptr.tolist(),
+                'indices': matrix.indices.tolist(),
+                'data': matrix.data.tolist()
+            }
+        else:
+            row_offset = min(n, max(0, request.args.get('row_offset', 0, type=int)))
+            row_limit = request.args.get('row_limit', type=int)
+            row_stop = n if row_limit is None else min(n, row_offset + max(0, row_limit))
+            adj_matrix = JsonArrayStream(_dense_rows(matrix, row_offset, row_stop))
+        
+        start, stop = _page_bounds(n, page, page_size)
+        adj_list = {}
+        for node in nodes[start:stop]:
+            adj_list[node] = [
+                {'node': neighbor, 'weight': attrs.get('weight', 1)}
+                for neighbor, attrs in graph.adj[node].items()
+            ]
+        
+        num_edges = graph.number_of_edges()
+        start, stop = _page_bounds(num_edges, page, page_size)
+        edge_list = [
+            {'source': u, 'target': v, 'weight': weight}
+            for u, v, weight in itertools.islice(graph.edges(data='weight', default=1), start, stop)
+        ]
+        
+        fields = [
+            ('success', True),
+            ('nodes', nodes),
+            ('adjacency_matrix', adj_matrix),
+            ('adjacency_list', adj_list),
+            ('edge_list', edge_list),
+            ('total_nodes', n),
+            ('total_edges', num_edges),
+            ('page', page),
+            ('page_size', page_size),
+            ('is_directed', graph_data['is_directed'])
+        ]
+        if matrix_format == 'dense':
+            fields.append(('row_offset', row_offset))
+        return _json_stream_response(fields, chunk_size=max(1, REPRESENTATION_CHUNK_CELLS // n))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
 
-            neighbors = sorted(list(graph_data['graph'].neighbors(current)), 
-                             key=lambda n: (graph_data['positions'].get(n, {}).get('y', 0), 
-                                          graph_data['positions'].get(n, {}).get('x', 0)))
-            
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
+MST_PARALLEL_MIN_EDGES = int(os.environ.get('MST_PARALLEL_MIN_EDGES', 200000))
+
+def _kruskal_edges(edges):
+    
+    edges.sort(key=lambda edge: edge[2])
+    parent = {}
+    size = {}
+    forest = []
+    for u, v, weight in edges:
+        roots = []
+        for node_id in (u, v):
+            parent.setdefault(node_id, node_id)
+            while parent[node_id] != node_id:
+                parent[node_id] = parent[parent[node_id]]
+                node_id = parent[node_id]
+            roots.append(node_id)
+        root_u, root_v = roots
+        if root_u == root_v:
+            continue
+        if size.get(root_u, 1) < size.get(root_v, 1):
+            root_u, root_v = root_v, root_u
+        parent[root_v] = root_u
+        size[root_u] = size.get(root_u, 1) + size.get(root_v, 1)
+        forest.append((u, v, weight))
+    return forest
+
+def _spanning_forest_edges(graph):
+    
+    if graph.number_of_edges() < MST_PARALLEL_MIN_EDGES or COMPONENT_WORKERS < 2:
+        return _kruskal_edges(list(graph.edges(data='weight', default=1)))
+    
+    components = [list(graph.edges(nodes, data='weight', default=1)) for nodes in nx.connected_components(graph)]
+    if len(components) < 2:
+        return _kruskal_edges(components[0])
+    
+
+    batches = [[] for _ in range(min(len(components), COMPONENT_WORKERS * 4))]
+    loads = [(0, index) for index in range(len(batches))]
+    for edges in sorted(components, key=len, reverse=True):
+        load, index = heapq.heappop(loads)
+        batches[index].extend(edges)
+        heapq.heappush(loads, (load + len(edges), index))
+    
+    pool = _component_pool()
+    try:
+        return list(itertools.chain.from_iterable(pool.map(_kruskal_edges, batches)))
+    except BrokenProcessPool:
+        _reset_component_pool(pool)
+        return _kruskal_edges(list(itertools.chain.from_iterable(components)))
+
+def _minimum_spanning(workspace, algorithm, label, forest=False):
+    
+    if workspace['graph'].number_of_nodes() == 0:
+        return {
+            'success': False,
+            'message': 'Đồ thị rỗng'
+        }
+    
+    if workspace['is_directed']:
+        return {
+            'success': False,
+            'message': f'Thuật toán {label} chỉ áp dụng cho đồ thị vô hướng'
+        }
+    
+    if not forest and not _stats_engine(workspace).is_connected():
+        return {
+            'success': False,
+            'message': 'Đồ thị không liên thông'
+        }
+    
+    engine = _mst_engine(workspace)
+    mst_edges = []
+    total_weight = 0
+    for source, target, weight in engine.edges(algorithm):
+        mst_edges.append({
+            'source': source,
+            'target': target,
+            'weight': weight
+        })
+        total_weight += weight
+    
+    if not forest:
+        return {
+            'success': True,
+            'edges': mst_edges,
+            'total_weight': round(total_weight, 2),
+            'message': f'Cây khung nhỏ nhất ({label})\nTổng trọng số: {round(total_weight, 2)}'
+        }
+    
+    components = []
+    for size, edges in engine.components(algorithm):
+        components.append({
+            'num_nodes': size,
+            'edges': [{'source': source, 'target': target, 'weight': weight} for source, target, weight in edges],
+            'total_weight': round(sum(edge[2] for edge in edges), 2)
+        })
+    
+    return {
+        'success': True,
+        'edges': mst_edges,
+        'components': components,
+        'num_components': len(components),
+        'total_weight': round(total_weight, 2),
+        'message': f'Rừng khung nhỏ nhất ({label})\n{len(components)} thành phần liên thông\nTổng trọng số: {round(total_weight, 2)}'
+    }
+
+def _forest_requested():
+    
+    return request.args.get('forest', '').lower() in ('1', 'true')
+
+@app.route('/api/prim_mst', methods=['GET'])
+@cached_result
+def prim_mst():
+    
+    try:
+        return jsonify(_minimum_spanning(graph_data, 'prim', 'Prim', _forest_requested()))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+@app.route('/api/kruskal_mst', methods=['GET'])
+@cached_result
+def kruskal_mst():
+    
+    try:
+        return jsonify(_minimum_spanning(graph_data, 'kruskal', 'Kruskal', _forest_requested()))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+EULER_PROGRESS_STEPS = 0xFFFF
+
+def _hierholzer_path(graph, start, progress=None):
+    
+    path = []
+    stack = [start]
+    total = graph.number_of_edges() + 1
+    steps = 0
+    if graph.is_directed():
+        remaining = {node_id: iter(graph.succ[node_id]) for node_id in graph}
+        while stack:
+            steps += 1
+            if progress is not None and not steps & EULER_PROGRESS_STEPS:
+                progress(len(path) / total, 'Đang dựng đường đi Euler')
+            neighbor = next(remaining[stack[-1]], stack)
+            if neighbor is stack:
+                path.append(stack.pop())
+            else:
+                stack.append(neighbor)
+    else:
+        adjacency = {node_id: [] for node_id in graph}
+        for index, (u, v) in enumerate(graph.edges()):
+            adjacency[u].append((v, index))
+            if u != v:
+                adjacency[v].append((u, index))
+        used = bytearray(graph.number_of_edges())
+        pointer = dict.fromkeys(graph, 0)
+        while stack:
+            steps += 1
+            if progress is not None and not steps & EULER_PROGRESS_STEPS:
+                progress(len(path) / total, 'Đang dựng đường đi Euler')
+            node_id = stack[-1]
+            edges = adjacency[node_id]
+            position = pointer[node_id]
+            while position < len(edges) and used[edges[position][1]]:
+                position += 1
+            if position == len(edges):
+                pointer[node_id] = position
+                path.append(stack.pop())
+            else:
+                neighbor, index = edges[position]
+                used[index] = 1
+                pointer[node_id] = position + 1
+                stack.append(neighbor)
+    path.reverse()
+    return path
+
+def _euler_trail(workspace, circuit_only=False, progress=None):
+    
+    graph = workspace['graph']
+    if graph.number_of_nodes() == 0:
+        return {
+            'success': False,
+            'message': 'Đồ thị rỗng'
+        }
+    
+
+    engine = _stats_engine(workspace)
+    is_circuit = engine.is_eulerian()
+    if not is_circuit:
+        if circuit_only:
+            return {
+                'success': False,
+                'message': 'Hierholzer chỉ áp dụng cho chu trình Euler (tất cả đỉnh có bậc chẵn)'
+            }
+        if not engine.has_eulerian_path():
+            return {
+                'success': False,
+                'message': 'Đồ thị không có đường đi Euler'
+            }
+    
+    start = next(iter(graph))
+    for node_id, degree in engine.degrees.items():
+        if is_circuit:
+            if degree:
+                start = node_id
+                break
+        elif (engine.balance[node_id] == 1) if engine.directed else degree % 2:
+            start = node_id
+            break
+    
+    return {
+        'success': True,
+        'path': _hierholzer_path(graph, start, progress),
+        'is_circuit': is_circuit
+    }
+
+def _euler_fields(trail, algorithm, label, compact=False):
+    
+    path = trail['path']
+    
+    def edges():
+        
+        for index in range(1, len(path)):
+            yield {'source': path[index - 1], 'target': path[index]}
+    
+    if compact:
+        return [
+            ('success', True),
+            ('is_circuit', trail['is_circuit']),
+            ('algorithm', algorithm),
+            ('num_edges', len(path) - 1),
+            ('path', JsonArrayStream(path))
+        ]
+    
+    def message():
         
+        yield f'{"Chu trình" if trail["is_circuit"] else "Đường đi"} Euler ({label}): '
+        for index, node_id in enumerate(path):
+            yield (' → ' if index else '') + str(node_id)
+    
+    return [
+        ('success', True),
+        ('path', JsonArrayStream(path)),
+        ('edges', JsonArrayStream(edges())),
+        ('is_circuit', trail['is_circuit']),
+        ('algorithm', algorithm),
+        ('message', JsonTextStream(message()))
+    ]
+
+def _materialize_fields(fields):
+    
+    result = {}
+    for key, value in fields:
+        if isinstance(value, JsonArrayStream):
+            value = list(value.items)
+        elif isinstance(value, JsonTextStream):
+            value = ''.join(value.pieces)
+        result[key] = value
+    return result
+
+def _compute_eulerian_path(workspace, compact=False, progress=None):
+    
+    trail = _euler_trail(workspace, progress=progress)
+    if not trail['success']:
+        return trail
+    return _materialize_fields(_euler_fields(trail, 'hierholzer', 'Hierholzer', compact))
+
+def _compute_hierholzer(workspace, compact=False, progress=None):
+    
+    trail = _euler_trail(workspace, circuit_only=True, progress=progress)
+    if not trail['success']:
+        return trail
+    return _materialize_fields(_euler_fields(trail, 'hierholzer', 'Hierholzer', compact))
+
+def _compact_requested():
+    
+    return request.args.get('compact', '').lower() in ('1', 'true')
 
+@app.route('/api/eulerian_path', methods=['GET'])
+@cached_result
+def eulerian_path():
+    
+    try:
+        if _exceeds_inline_limit(graph_data):
+            return _job_redirect(graph_data, 'eulerian_path', {'compact': True})
+        trail = _euler_trail(graph_data)
+        if not trail['success']:
+            return jsonify(trail)
+        return _json_stream_response(_euler_fields(trail, 'hierholzer', 'Hierholzer', _compact_requested()))
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'order': bfs_order,
-            'message': f'BFS từ {start_node}: {" → ".join(bfs_order)}'
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
         })
+
+@app.route('/api/hierholzer', methods=['GET'])
+@cached_result
+def hierholzer():
+    
+    try:
+        if _exceeds_inline_limit(graph_data):
+            return _job_redirect(graph_data, 'hierholzer', {'compact': True})
+        trail = _euler_trail(graph_data, circuit_only=True)
+        if not trail['success']:
+            return jsonify(trail)
+        return _json_stream_response(_euler_fields(trail, 'hierholzer', 'Hierholzer', _compact_requested()))
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Lỗi: {str(e)}'
         })
 
-@app.route('/api/dfs', methods=['POST'])
-def dfs_traversal():
+FLOW_ALGORITHMS = {
+    'edmonds_karp': nx_flow.edmonds_karp,
+    'dinitz': nx_flow.dinitz,
+    'boykov_kolmogorov': nx_flow.boykov_kolmogorov,
+    'preflow_push': nx_flow.preflow_push,
+    'shortest_augmenting_path': nx_flow.shortest_augmenting_path
+}
+FLOW_INCREMENTAL = 'incremental'
+FLOW_DEFAULT_ALGORITHM = FLOW_INCREMENTAL
+FLOW_EPSILON = 1e-9
+FLOW_PROGRESS_STEPS = 0xFFFF
+
+class FlowNetwork(GraphListener):
+    
+    def __init__(self, graph):
+        
+        super().__init__(graph)
+        self.residual = nx_flow.build_residual_network(graph, 'weight')
+        for _, _, attr in self.residual.edges(data=True):
+            attr['flow'] = 0
+        self.total_capacity = sum(capacity for _, _, capacity in self.residual.edges(data='capacity'))
+        self.terminals = None
+        self._touched = set()
+        self._lock = threading.Lock()
+    
+    def solve(self, source, sink, algorithm, progress=None, warm=True):
+        
+        with self._lock:
+            started = time.perf_counter()
+            terminals, self.terminals = self.terminals, None
+            warm_start = algorithm == FLOW_INCREMENTAL and warm and terminals is not None
+            if warm_start:
+                self._incremental_flow(source, sink, self._touched.union(terminals), progress)
+            elif algorithm == FLOW_INCREMENTAL:
+                self._reset_flow()
+                self._incremental_flow(source, sink, (), progress)
+            else:
+                FLOW_ALGORITHMS[algorithm](self.graph, source, sink, capacity='weight', residual=self.residual)
+            self.terminals = (source, sink)
+            self._touched.clear()
+            elapsed = time.perf_counter() - started
+            
+            residual = self.residual
+            flow_edges = []
+            for u, neighbors in residual.adj.items():
+                for v, attr in neighbors.items():
+                    if attr['flow'] > FLOW_EPSILON:
+                        flow_edges.append({
+                            'source': u,
+                            'target': v,
+                            'flow': round(attr['flow'], 2),
+                            'capacity': attr['capacity']
+                        })
+            
+            reachable = {source}
+            queue = deque([source])
+            while queue:
+                u = queue.popleft()
+                for v, attr in residual.adj[u].items():
+                    if v not in reachable and attr['capacity'] - attr['flow'] > FLOW_EPSILON:
+                        reachable.add(v)
+                        queue.append(v)
+            
+            cut_edges = []
+            for u in reachable:
+                for v, attr in residual.adj[u].items():
+                    if v not in reachable and attr['capacity'] > 0:
+                        cut_edges.append({'source': u, 'target': v, 'capacity': attr['capacity']})
+            
+            return {
+                'max_flow': residual.graph['flow_value'],
+                'elapsed_ms': round(elapsed * 1000, 2),
+                'warm_start': warm_start,
+                'flow_edges': flow_edges,
+                'min_cut': {
+                    'source_side': list(reachable),
+                    'sink_side': [node_id for node_id in residual if node_id not in reachable],
+                    'edges': cut_edges
+                }
+            }
+    
+    def _reset_flow(self):
+        
+        for _, _, attr in self.residual.edges(data=True):
+            attr['flow'] = 0
+    
+    def _incremental_flow(self, source, sink, unbalanced, progress=None):
+        
+        succ = self.residual._succ
+        excess = {}
+        deficit = {}
+        for u in unbalanced:
+            if u == source or u == sink or u not in succ:
+                continue
+            balance = -sum(attr['flow'] for attr in succ[u].values())
+            if balance > FLOW_EPSILON:
+                excess[u] = balance
+            elif balance < -FLOW_EPSILON:
+                deficit[u] = -balance
+        
+        def value():
+            
+            return sum(attr['flow'] for attr in succ[source].values())
+        
+        rerouted = augmented = None
+        if progress is not None:
+            bound = sum(attr['capacity'] for attr in succ[source].values()) or 1
+            
+            def rerouted(pushed):
+                
+                progress(0, 'Đang điều chỉnh luồng trước đó')
+            
+            def augmented(pushed):
+                
+                progress(min(max((initial + pushed) / bound, 0), 0.99), 'Đang tính luồng cực đại')
+        
+        if excess:
+            targets = dict(deficit)
+            targets[source] = targets[sink] = math.inf
+            self._augment(excess, targets, rerouted)
+            deficit = {u: targets[u] for u in deficit if targets[u] > FLOW_EPSILON}
+        if deficit:
+            self._augment({source: math.inf, sink: math.inf}, deficit, rerouted)
+        initial = value()
+        self._augment({source: math.inf}, {sink: math.inf}, augmented)
+        self.residual.graph['flow_value'] = value()
+    
+    def _augment(self, supply, demand, progress=None):
+        
+        succ = self.residual._succ
+        pushed = 0
+        while True:
+            path = self._augmenting_path(supply, demand, progress and (lambda: progress(pushed)))
+            if path is None:
+                return pushed
+            start = path[0][0]
+            target = path[-1][1]
+            amount = min(supply[start], demand[target], min(attr['capacity'] - attr['flow'] for _, _, attr in path))
+            for u, v, attr in path:
+                attr['flow'] += amount
+                succ[v][u]['flow'] -= amount
+            supply[start] -= amount
+            demand[target] -= amount
+            pushed += amount
+            if progress is not None:
+                progress(pushed)
+    
+    def _augmenting_path(self, supply, demand, check=None):
+        
+        succ = self.residual._succ
+        pred = self.residual._pred
+        forward = {node_id: None for node_id, amount in supply.items() if amount > FLOW_EPSILON}
+        backward = {node_id: None for node_id, amount in demand.items() if amount > FLOW_EPSILON}
+        forward_fringe = list(forward)
+        backward_fringe = list(backward)
+        steps = 0
+        meet = None
+        while meet is None and forward_fringe and backward_fringe:
+            if len(forward_fringe) <= len(backward_fringe):
+                fringe, forward_fringe = forward_fringe, []
+                for u in fringe:
+                    steps += 1
+                    if check is not None and not steps & FLOW_PROGRESS_STEPS:
+                        check()
+                    for v, attr in succ[u].items():
+                        if v not in forward and attr['capacity'] - attr['flow'] > FLOW_EPSILON:
+                            forward[v] = u
+                            if v in backward:
+                                meet = v
+                                break
+                            forward_fringe.append(v)
+                    if meet is not None:
+                        break
+            else:
+                fringe, backward_fringe = backward_fringe, []
+                for v in fringe:
+                    steps += 1
+                    if check is not None and not steps & FLOW_PROGRESS_STEPS:
+                        check()
+                    for u, attr in pred[v].items():
+                        if u not in backward and attr['capacity'] - attr['flow'] > FLOW_EPSILON:
+                            backward[u] = v
+                            if u in forward:
+                                meet = u
+                                break
+                            backward_fringe.append(u)
+                    if meet is not None:
+                        break
+        if meet is None:
+            return None
+        
+        path = []
+        v = meet
+        while forward[v] is not None:
+            u = forward[v]
+            path.append((u, v, succ[u][v]))
+            v = u
+        path.reverse()
+        u = meet
+        while backward[u] is not None:
+            v = backward[u]
+            path.append((u, v, succ[u][v]))
+            u = v
+        return path
+    
+    def on_add_node(self, node_id):
+        
+        self.residual.add_node(node_id)
+    
+    def on_remove_node(self, node_id):
+        
+        self.residual.remove_node(node_id)
+    
+    def on_add_edge(self, u, v):
+        
+        self._sync(u, v)
+    
+    def on_remove_edge(self, u, v, weight):
+        
+        self._sync(u, v)
+    
+    def on_reweight(self, u, v, old_weight, weight):
+        
+        self._sync(u, v)
+    
+    def _capacity(self, u, v):
+        
+        if not self.graph.has_edge(u, v):
+            return 0
+        return max(self.graph[u][v].get('weight', 1), 0)
+    
+    def _sync(self, u, v):
+        
+
+        if u == v:
+            return
+        residual = self.residual
+        old = residual[u][v]['capacity'] + residual[v][u]['capacity'] if residual.has_edge(u, v) else 0
+        forward = self._capacity(u, v)
+        backward = self._capacity(v, u)
+        self._touched.update((u, v))
+        if forward or backward:
+            flow = max(min(residual[u][v]['flow'] if residual.has_edge(u, v) else 0, forward), -backward)
+            residual.add_edge(u, v, capacity=forward, flow=flow)
+            residual.add_edge(v, u, capacity=backward, flow=-flow)
+        elif residual.has_edge(u, v):
+            residual.remove_edge(u, v)
+            residual.remove_edge(v, u)
+        self.total_capacity += forward + backward - old
+        residual.graph['inf'] = 3 * self.total_capacity or 1
+
+def _flow_network(workspace):
+    
+    network = workspace.get('flow_network')
+    if network is None or network.graph is not workspace['graph']:
+        network = FlowNetwork(workspace['graph'])
+        workspace['flow_network'] = network
+    return network
+
+def _compute_ford_fulkerson(workspace, data, progress=None):
+    
+    source = data.get('source')
+    sink = data.get('sink')
+    algorithm = data.get('algorithm') or FLOW_DEFAULT_ALGORITHM
+    
+    if not source or not sink:
+        return {
+            'success': False,
+            'message': 'Vui lòng chọn đỉnh nguồn (source) và đỉnh đích (sink)'
+        }
+    
+    if source not in workspace['graph'] or sink not in workspace['graph']:
+        return {
+            'success': False,
+            'message': 'Đỉnh không tồn tại trong đồ thị'
+        }
+    
+    if source == sink:
+        return {
+            'success': False,
+            'message': 'Đỉnh nguồn và đỉnh đích phải khác nhau'
+        }
+    
+    if not workspace['is_directed']:
+        return {
+            'success': False,
+            'message': 'Ford-Fulkerson yêu cầu đồ thị có hướng'
+        }
+    
+    if algorithm != FLOW_INCREMENTAL and algorithm not in FLOW_ALGORITHMS:
+        return {
+            'success': False,
+            'message': f'Thuật toán luồng không hợp lệ: {algorithm}'
+        }
+    
+    compare = bool(data.get('compare'))
+    if progress is not None:
+        algorithm = FLOW_INCREMENTAL
+        compare = False
+    
+    network = _flow_network(workspace)
+    timings = []
+    if compare:
+        for name in (FLOW_INCREMENTAL, *FLOW_ALGORITHMS):
+            if name != algorithm:
+                other = network.solve(source, sink, name, warm=False)
+                timings.append({'algorithm': name, 'elapsed_ms': other['elapsed_ms'], 'max_flow': round(other['max_flow'], 2)})
+    
+    result = network.solve(source, sink, algorithm, progress, warm=not compare)
+    flow_value = round(result['max_flow'], 2)
+    cut = result['min_cut']
+    cut['capacity'] = round(sum(edge['capacity'] for edge in cut['edges']), 2)
+    
+    message = (f'Luồng cực đại từ {source} đến {sink}: {flow_value}\n'
+               f'Thuật toán: {algorithm} ({result["elapsed_ms"]} ms'
+               f'{", tiếp tục từ luồng trước" if result["warm_start"] else ""})\n'
+               f'Lát cắt nhỏ nhất: {len(cut["edges"])} cạnh, {len(cut["source_side"])} đỉnh phía nguồn')
+    response = {
+        'success': True,
+        'max_flow': flow_value,
+        'flow_edges': result['flow_edges'],
+        'min_cut': cut,
+        'algorithm': algorithm,
+        'elapsed_ms': result['elapsed_ms'],
+        'warm_start': result['warm_start'],
+        'message': message
+    }
+    
+    if timings:
+        timings.append({'algorithm': algorithm, 'elapsed_ms': result['elapsed_ms'], 'max_flow': flow_value})
+        timings.sort(key=lambda entry: entry['elapsed_ms'])
+        response['timings'] = timings
+        response['message'] += '\n' + '\n'.join(f'{entry["algorithm"]}: {entry["elapsed_ms"]} ms' for entry in timings)
+    
+    return response
+
+@app.route('/api/ford_fulkerson', methods=['POST'])
+def ford_fulkerson():
+    
+    try:
+        if _exceeds_inline_limit(graph_data):
+            return _job_redirect(graph_data, 'ford_fulkerson', request.json or {})
+        return jsonify(_compute_ford_fulkerson(graph_data, request.json))
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Lỗi: {str(e)}'
+        })
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_MAX_PER_WORKSPACE = int(os.environ.get('JOB_MAX_PER_WORKSPACE', 2))
+JOB_TIMEOUT = int(os.environ.get('JOB_TIMEOUT', 600))
+JOB_RETENTION = int(os.environ.get('JOB_RETENTION', 3600))
+JOB_INLINE_MAX_ELEMENTS = int(os.environ.get('JOB_INLINE_MAX_ELEMENTS', 20000))
+JOB_TIMEOUT_ERROR = 'Tác vụ vượt quá thời gian cho phép'
+JOB_PROGRESS_INTERVAL = 0.25
+JOB_POLL_INTERVAL = 0.5
+JOB_ACTIVE = ('queued', 'running')
+
+class JobCancelled(Exception):
+    
+    pass
+
+class JobTimeout(Exception):
+    
+    pass
+
+class JobProgress:
     
-    try:
-        data = request.json
-        start_node = data.get('start_node')
+    def __init__(self, job_id, deadline=math.inf):
         
-        if not start_node:
-            return jsonify({
-                'success': False,
-                'message': 'Vui lòng chọn đỉnh bắt đầu'
-            })
+        self.job_id = job_id
+        self.deadline = deadline
+        self._last = 0.0
+    
+    def __call__(self, fraction, message=None, force=False):
         
-        if start_node not in graph_data['graph']:
-            return jsonify({
-                'success': False,
-                'message': 'Đỉnh không tồn tại trong đồ thị'
-            })
+        now = time.monotonic()
+        if not force and now - self._last < JOB_PROGRESS_INTERVAL:
+            return
+        self._last = now
+        self._check_deadline()
+        cursor = _db().execute(
+            "UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ? AND status = 'running'",
+            (round(fraction, 4), message, self.job_id)
+        )
+        if cursor.rowcount == 0:
+            raise JobCancelled()
+    
+    def frame(self, fraction, coords):
         
-
-        visited = set()
-        dfs_order = []
+        self._last = time.monotonic()
+        self._check_deadline()
+        cursor = _db().execute(
+            "UPDATE jobs SET progress = ?, frame = ?, frame_seq = frame_seq + 1 WHERE id = ? AND status = 'running'",
+            (round(fraction, 4), coords.astype('<i4').tobytes(), self.job_id)
+        )
+        if cursor.rowcount == 0:
+            raise JobCancelled()
+    
+    def _check_deadline(self):
         
-        def dfs_recursive(node):
-            
-            visited.add(node)
-            dfs_order.append(node)
-            
+        if time.time() > self.deadline:
+            raise JobTimeout()
 
-            neighbors = sorted(list(graph_data['graph'].neighbors(node)),
-                             key=lambda n: (graph_data['positions'].get(n, {}).get('y', 0),
-                                          graph_data['positions'].get(n, {}).get('x', 0)))
-            
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    dfs_recursive(neighbor)
-        
-        dfs_recursive(start_node)
+def _job_spring_layout(workspace, params, progress):
+    
+    if workspace['graph'].number_of_nodes() == 0:
+        return {'success': False, 'message': 'Không có node nào'}
+    
+    fps = params.get('fps')
+    params = _layout_params(params)
+    layout = _spring_layout_engine(workspace, params)
+    if fps:
         
 
-        return jsonify({
+        interval = 1 / min(max(float(fps), 1), 30)
+        next_frame = 0
+        for fraction in layout.steps():
+            now = time.monotonic()
+            if now < next_frame:
+                progress(fraction, 'Đang tính bố cục lò xo')
+                continue
+            next_frame = now + interval
+            progress.frame(fraction, np.rint(layout.coordinates(params['width'], params['height'])))
+        progress.frame(1, np.rint(layout.coordinates(params['width'], params['height'])))
+        return {
             'success': True,
-            'order': dfs_order,
-            'message': f'DFS từ {start_node}: {" → ".join(dfs_order)}'
-        })
-    except Exception as e:
-        return jsonify({
+            'timed_out': layout.timed_out,
+            'message': 'Spring layout đã được tính xong'
+        }
+    
+    for fraction in layout.steps():
+        progress(fraction, 'Đang tính bố cục lò xo')
+    positions = layout.positions(params['width'], params['height'])
+    return {
+        'success': True,
+        'positions': [{'node_id': node_id, 'x': x, 'y': y} for node_id, (x, y) in positions.items()],
+        'message': 'Spring layout đã được tính xong'
+    }
+
+def _job_all_pairs(workspace, params, progress):
+    
+    engine = ShortestPathEngine(workspace['graph'], workspace['version'])
+    if not engine.precompute_all_pairs(progress):
+        return {
             'success': False,
-            'message': f'Lỗi: {str(e)}'
-        })
+            'message': f'Đồ thị quá lớn để tính mọi cặp đỉnh (tối đa {ALL_PAIRS_MAX_NODES} đỉnh)'
+        }
+    
+    nodes, _, dist, _ = engine.all_pairs
+    return {
+        'success': True,
+        'nodes': nodes,
+        'distances': [[engine.distance(value) if math.isfinite(value) else None for value in row] for row in dist.tolist()],
+        'message': f'Đã tính đường đi ngắn nhất cho {len(nodes)} đỉnh'
+    }
 
-@app.route('/api/check_bipartite', methods=['GET'])
-def check_bipartite():
+JOB_KINDS = {
+    'spring_layout': _job_spring_layout,
+    'all_pairs_shortest_paths': _job_all_pairs,
+    'eulerian_path': lambda workspace, params, progress: _compute_eulerian_path(
+        workspace, params.get('compact', False), progress),
+    'hierholzer': lambda workspace, params, progress: _compute_hierholzer(
+        workspace, params.get('compact', False), progress),
+    'ford_fulkerson': _compute_ford_fulkerson
+}
+
+_job_executor = None
+_job_executor_pid = None
+_job_executor_lock = threading.Lock()
+_job_futures = {}
+
+def _job_pool():
     
-    try:
-        if graph_data['graph'].number_of_nodes() == 0:
-            return jsonify({
-                'success': False,
-                'message': 'Đồ thị rỗng'
-            })
-        
+    global _job_executor, _job_executor_pid
+    with _job_executor_lock:
+        if _job_executor is None or _job_executor_pid != os.getpid():
+            _job_executor = ProcessPoolExecutor(
+                max_workers=JOB_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            _job_executor_pid = os.getpid()
+        return _job_executor
 
-        is_bipartite = nx.is_bipartite(graph_data['graph'])
-        
-        if is_bipartite:
+def _reset_job_pool(broken):
+    
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is broken:
+            _job_executor = None
 
-            color_dict = nx.bipartite.color(graph_data['graph'])
-            set1 = [node for node, color in color_dict.items() if color == 0]
-            set2 = [node for node, color in color_dict.items() if color == 1]
-            
-            return jsonify({
-                'success': True,
-                'is_bipartite': True,
-                'set1': set1,
-                'set2': set2,
-                'color_dict': color_dict,
-                'message': f'Đây là đồ thị 2 phía!\nTập 1: {{{", ".join(set1)}}}\nTập 2: {{{", ".join(set2)}}}'
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'is_bipartite': False,
-                'message': 'Đây KHÔNG phải là đồ thị 2 phía'
-            })
+def _run_job(job_id, kind, params, snapshot, version, deadline=math.inf):
+    
+    conn = _db()
+    if time.time() > deadline:
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'queued'",
+            (JOB_TIMEOUT_ERROR, time.time(), job_id)
+        )
+        return
+    started = conn.execute(
+        "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ? AND status = 'queued'",
+        (time.time(), job_id)
+    )
+    if started.rowcount == 0:
+        return
+    
+    try:
+        workspace = _new_workspace()
+        _load_graph_binary(workspace, snapshot)
+        workspace['version'] = version
+        result = JOB_KINDS[kind](workspace, params, JobProgress(job_id, deadline))
+        conn.execute(
+            "UPDATE jobs SET status = 'done', progress = 1, result = ?, finished_at = ? "
+            "WHERE id = ? AND status = 'running'",
+            (json.dumps(result), time.time(), job_id)
+        )
+    except JobCancelled:
+        pass
+    except JobTimeout:
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+            (JOB_TIMEOUT_ERROR, time.time(), job_id)
+        )
     except Exception as e:
-        return jsonify({
-            'success': False,
-            'message': f'Lỗi: {str(e)}'
-        })
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status = 'running'",
+            (f'Lỗi: {str(e)}', time.time(), job_id)
+        )
 
-@app.route('/api/get_representations', methods=['GET'])
-def get_representations():
+def _job_finished(job_id, pool, future):
     
+    _job_futures.pop(job_id, None)
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is None:
+        return
+    if isinstance(error, BrokenProcessPool):
+        _reset_job_pool(pool)
+    _db().execute(
+        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND status IN ('queued', 'running')",
+        (f'Lỗi: {str(error)}', time.time(), job_id)
+    )
+
+def _expire_jobs(conn, now):
+    
+    expired = [row[0] for row in conn.execute(
+        "SELECT id FROM jobs WHERE status IN ('queued', 'running') AND created_at < ?", (now - JOB_TIMEOUT,)
+    )]
+    conn.execute(
+        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? "
+        "WHERE status IN ('queued', 'running') AND created_at < ?",
+        (JOB_TIMEOUT_ERROR, now, now - JOB_TIMEOUT)
+    )
+    conn.execute('DELETE FROM jobs WHERE finished_at < ?', (now - JOB_RETENTION,))
+    return expired
+
+def _job_info(row):
+    
+    job_id, kind, status, progress, message, result, error, version, created_at, started_at, finished_at = row
+    info = {
+        'job_id': job_id,
+        'kind': kind,
+        'status': status,
+        'progress': progress,
+        'message': message,
+        'version': version,
+        'created_at': created_at,
+        'started_at': started_at,
+        'finished_at': finished_at
+    }
+    if status == 'queued':
+        info['queue_position'] = _db().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?", (created_at,)
+        ).fetchone()[0]
+    if result is not None:
+        info['result'] = json.loads(result)
+    if error is not None:
+        info['error'] = error
+    return info
+
+def _load_job(job_id):
+    
+    return _db().execute(
+        'SELECT id, kind, status, progress, message, result, error, version, created_at, started_at, finished_at '
+        'FROM jobs WHERE id = ? AND workspace_id = ?',
+        (job_id, _current_workspace_id())
+    ).fetchone()
+
+def _submit_job(workspace, kind, params):
+    
+    workspace_id = _current_workspace_id()
+    snapshot = _serialize_graph_binary(workspace)
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    
+    conn = _db()
+    conn.execute('BEGIN IMMEDIATE')
     try:
-        if graph_data['graph'].number_of_nodes() == 0:
-            return jsonify({
-                'success': False,
-                'message': 'Đồ thị rỗng'
-            })
-        
+        expired = _expire_jobs(conn, now)
+        active = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE workspace_id = ? AND status IN ('queued', 'running')",
+            (workspace_id,)
+        ).fetchone()[0]
+        if active < JOB_MAX_PER_WORKSPACE:
+            conn.execute(
+                'INSERT INTO jobs (id, workspace_id, kind, status, progress, version, created_at) '
+                "VALUES (?, ?, ?, 'queued', 0, ?, ?)",
+                (job_id, workspace_id, kind, workspace['version'], now)
+            )
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    
+    for expired_id in expired:
+        future = _job_futures.get(expired_id)
+        if future is not None:
+            future.cancel()
+    if active >= JOB_MAX_PER_WORKSPACE:
+        return None
+    
+    pool = _job_pool()
+    future = pool.submit(_run_job, job_id, kind, params, snapshot, workspace['version'], now + JOB_TIMEOUT)
+    _job_futures[job_id] = future
+    future.add_done_callback(functools.partial(_job_finished, job_id, pool))
+    return job_id
 
-        nodes = sorted(list(graph_data['graph'].nodes()))
-        n = len(nodes)
-        
+def _cancel_job(job_id, workspace_id):
+    
+    cursor = _db().execute(
+        "UPDATE jobs SET status = 'cancelled', finished_at = ? "
+        "WHERE id = ? AND workspace_id = ? AND status IN ('queued', 'running')",
+        (time.time(), job_id, workspace_id)
+    )
+    if cursor.rowcount == 0:
+        return False
+    
+    future = _job_futures.get(job_id)
+    if future is not None:
+        future.cancel()
+    return True
 
-        adj_matrix = []
-        node_to_idx = {node: i for i, node in enumerate(nodes)}
-        
-        for i in range(n):
-            row = [0] * n
-            for j in range(n):
-                if graph_data['graph'].has_edge(nodes[i], nodes[j]):
-                    weight = graph_data['graph'].get_edge_data(nodes[i], nodes[j]).get('weight', 1)
-                    row[j] = weight
-            adj_matrix.append(row)
-        
+def _exceeds_inline_limit(workspace):
+    
+    graph = workspace['graph']
+    return graph.number_of_nodes() + graph.number_of_edges() > JOB_INLINE_MAX_ELEMENTS
 
-        adj_list = {}
-        for node in nodes:
-            neighbors = []
-            for neighbor in graph_data['graph'].neighbors(node):
-                weight = graph_data['graph'].get_edge_data(node, neighbor).get('weight', 1)
-                neighbors.append({'node': neighbor, 'weight': weight})
-            adj_list[node] = neighbors
-        
-
-        edge_list = []
-        for edge in graph_data['graph'].edges():
-            weight = graph_data['graph'].get_edge_data(edge[0], edge[1]).get('weight', 1)
-            edge_list.append({
-                'source': edge[0],
-                'target': edge[1],
-                'weight': weight
-            })
-        
-        return jsonify({
-            'success': True,
-            'nodes': nodes,
-            'adjacency_matrix': adj_matrix,
-            'adjacency_list': adj_list,
-            'edge_list': edge_list,
-            'is_directed': graph_data['is_directed']
-        })
-    except Exception as e:
+def _job_redirect(workspace, kind, params):
+    
+    job_id = _submit_job(workspace, kind, params)
+    if job_id is None:
         return jsonify({
             'success': False,
-            'message': f'Lỗi: {str(e)}'
+            'message': f'Mỗi workspace chỉ được chạy tối đa {JOB_MAX_PER_WORKSPACE} tác vụ cùng lúc'
         })
+    
+    response = jsonify({
+        'success': True,
+        'job_id': job_id,
+        'kind': kind,
+        'status': 'queued',
+        'version': workspace['version'],
+        'message': f'Đồ thị có hơn {JOB_INLINE_MAX_ELEMENTS} đỉnh + cạnh nên được tính dưới dạng tác vụ nền'
+    })
+    response.status_code = 202
+    response.headers['Location'] = f'/api/jobs/{job_id}'
+    return response
 
-@app.route('/api/prim_mst', methods=['GET'])
-def prim_mst():
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
     
     try:
-        if graph_data['graph'].number_of_nodes() == 0:
-            return jsonify({
-                'success': False,
-                'message': 'Đồ thị rỗng'
-            })
+        data = request.json or {}
+        kind = data.get('kind')
+        params = data.get('params') or {}
         
-        if graph_data['is_directed']:
+        if kind not in JOB_KINDS or not isinstance(params, dict):
             return jsonify({
                 'success': False,
-                'message': 'Thuật toán Prim chỉ áp dụng cho đồ thị vô hướng'
+                'message': f'Loại tác vụ không hợp lệ: {kind}'
             })
         
-        if not nx.is_connected(graph_data['graph']):
+        job_id = _submit_job(graph_data, kind, params)
+        if job_id is None:
             return jsonify({
                 'success': False,
-                'message': 'Đồ thị không liên thông'
-            })
-        
-
-        mst = nx.minimum_spanning_tree(graph_data['graph'], algorithm='prim', weight='weight')
-        
-        mst_edges = []
-        total_weight = 0
-        for edge in mst.edges():
-            weight = graph_data['graph'].get_edge_data(edge[0], edge[1]).get('weight', 1)
-            mst_edges.append({
-                'source': edge[0],
-                'target': edge[1],
-                'weight': weight
+                'message': f'Mỗi workspace chỉ được chạy tối đa {JOB_MAX_PER_WORKSPACE} tác vụ cùng lúc'
             })
-            total_weight += weight
         
         return jsonify({
             'success': True,
-            'edges': mst_edges,
-            'total_weight': round(total_weight, 2),
-            'message': f'Cây khung nhỏ nhất (Prim)\nTổng trọng số: {round(total_weight, 2)}'
+            'job_id': job_id,
+            'status': 'queued',
+            'version': graph_data['version']
         })
     except Exception as e:
         return jsonify({
@@ -633,47 +4674,18 @@ def prim_mst():
             'message': f'Lỗi: {str(e)}'
         })
 
-@app.route('/api/kruskal_mst', methods=['GET'])
-def kruskal_mst():
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
     
     try:
-        if graph_data['graph'].number_of_nodes() == 0:
-            return jsonify({
-                'success': False,
-                'message': 'Đồ thị rỗng'
-            })
-        
-        if graph_data['is_directed']:
-            return jsonify({
-                'success': False,
-                'message': 'Thuật toán Kruskal chỉ áp dụng cho đồ thị vô hướng'
-            })
-        
-        if not nx.is_connected(graph_data['graph']):
-            return jsonify({
-                'success': False,
-                'message': 'Đồ thị không liên thông'
-            })
-        
-
-        mst = nx.minimum_spanning_tree(graph_data['graph'], algorithm='kruskal', weight='weight')
-        
-        mst_edges = []
-        total_weight = 0
-        for edge in mst.edges():
-            weight = graph_data['graph'].get_edge_data(edge[0], edge[1]).get('weight', 1)
-            mst_edges.append({
-                'source': edge[0],
-                'target': edge[1],
-                'weight': weight
-            })
-            total_weight += weight
-        
+        rows = _db().execute(
+            'SELECT id, kind, status, progress, message, NULL, error, version, created_at, started_at, finished_at '
+            'FROM jobs WHERE workspace_id = ? ORDER BY created_at DESC LIMIT 20',
+            (_current_workspace_id(),)
+        ).fetchall()
         return jsonify({
             'success': True,
-            'edges': mst_edges,
-            'total_weight': round(total_weight, 2),
-            'message': f'Cây khung nhỏ nhất (Kruskal)\nTổng trọng số: {round(total_weight, 2)}'
+            'jobs': [_job_info(row) for row in rows]
         })
     except Exception as e:
         return jsonify({
@@ -681,113 +4693,36 @@ def kruskal_mst():
             'message': f'Lỗi: {str(e)}'
         })
 
-@app.route('/api/eulerian_path', methods=['GET'])
-def eulerian_path():
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
     
     try:
-        if graph_data['graph'].number_of_nodes() == 0:
+        row = _load_job(job_id)
+        if row is None:
             return jsonify({
                 'success': False,
-                'message': 'Đồ thị rỗng'
+                'message': 'Không tìm thấy tác vụ'
             })
-        
-
-        if graph_data['is_directed']:
-
-            if nx.is_eulerian(graph_data['graph']):
-
-                path = list(nx.eulerian_circuit(graph_data['graph']))
-                path_nodes = [path[0][0]] + [edge[1] for edge in path]
-                return jsonify({
-                    'success': True,
-                    'path': path_nodes,
-                    'edges': [{'source': e[0], 'target': e[1]} for e in path],
-                    'is_circuit': True,
-                    'algorithm': 'fleury',
-                    'message': f'Chu trình Euler (Fleury): {" → ".join(path_nodes)}'
-                })
-            elif nx.has_eulerian_path(graph_data['graph']):
-
-                path = list(nx.eulerian_path(graph_data['graph']))
-                path_nodes = [path[0][0]] + [edge[1] for edge in path]
-                return jsonify({
-                    'success': True,
-                    'path': path_nodes,
-                    'edges': [{'source': e[0], 'target': e[1]} for e in path],
-                    'is_circuit': False,
-                    'algorithm': 'fleury',
-                    'message': f'Đường đi Euler (Fleury): {" → ".join(path_nodes)}'
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'message': 'Đồ thị không có đường đi Euler'
-                })
-        else:
-
-            if nx.is_eulerian(graph_data['graph']):
-
-                path = list(nx.eulerian_circuit(graph_data['graph']))
-                path_nodes = [path[0][0]] + [edge[1] for edge in path]
-                return jsonify({
-                    'success': True,
-                    'path': path_nodes,
-                    'edges': [{'source': e[0], 'target': e[1]} for e in path],
-                    'is_circuit': True,
-                    'algorithm': 'fleury',
-                    'message': f'Chu trình Euler (Fleury): {" → ".join(path_nodes)}'
-                })
-            elif nx.has_eulerian_path(graph_data['graph']):
-
-                path = list(nx.eulerian_path(graph_data['graph']))
-                path_nodes = [path[0][0]] + [edge[1] for edge in path]
-                return jsonify({
-                    'success': True,
-                    'path': path_nodes,
-                    'edges': [{'source': e[0], 'target': e[1]} for e in path],
-                    'is_circuit': False,
-                    'algorithm': 'fleury',
-                    'message': f'Đường đi Euler (Fleury): {" → ".join(path_nodes)}'
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'message': 'Đồ thị không có đường đi Euler'
-                })
+        return jsonify(dict(_job_info(row), success=True))
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Lỗi: {str(e)}'
         })
 
-@app.route('/api/hierholzer', methods=['GET'])
-def hierholzer():
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
     
     try:
-        if graph_data['graph'].number_of_nodes() == 0:
-            return jsonify({
-                'success': False,
-                'message': 'Đồ thị rỗng'
-            })
-        
-
-        if not nx.is_eulerian(graph_data['graph']):
+        if not _cancel_job(job_id, _current_workspace_id()):
             return jsonify({
                 'success': False,
-                'message': 'Hierholzer chỉ áp dụng cho chu trình Euler (tất cả đỉnh có bậc chẵn)'
+                'message': 'Tác vụ không tồn tại hoặc đã kết thúc'
             })
         
-
-        path = list(nx.eulerian_circuit(graph_data['graph']))
-        path_nodes = [path[0][0]] + [edge[1] for edge in path]
-        
         return jsonify({
             'success': True,
-            'path': path_nodes,
-            'edges': [{'source': e[0], 'target': e[1]} for e in path],
-            'is_circuit': True,
-            'algorithm': 'hierholzer',
-            'message': f'Chu trình Euler (Hierholzer): {" → ".join(path_nodes)}'
+            'message': 'Đã hủy tác vụ'
         })
     except Exception as e:
         return jsonify({
@@ -795,117 +4730,79 @@ def hierholzer():
             'message': f'Lỗi: {str(e)}'
         })
 
-@app.route('/api/ford_fulkerson', methods=['POST'])
-def ford_fulkerson():
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
     
-    try:
-        data = request.json
-        source = data.get('source')
-        sink = data.get('sink')
-        
-        if not source or not sink:
-            return jsonify({
-                'success': False,
-                'message': 'Vui lòng chọn đỉnh nguồn (source) và đỉnh đích (sink)'
-            })
-        
-        if source not in graph_data['graph'] or sink not in graph_data['graph']:
-            return jsonify({
-                'success': False,
-                'message': 'Đỉnh không tồn tại trong đồ thị'
-            })
-        
-        if source == sink:
-            return jsonify({
-                'success': False,
-                'message': 'Đỉnh nguồn và đỉnh đích phải khác nhau'
-            })
-        
-        if not graph_data['is_directed']:
-            return jsonify({
-                'success': False,
-                'message': 'Ford-Fulkerson yêu cầu đồ thị có hướng'
-            })
-        
-
-        flow_value, flow_dict = nx.maximum_flow(graph_data['graph'], source, sink, capacity='weight')
-        
-
-        flow_edges = []
-        for u in flow_dict:
-            for v in flow_dict[u]:
-                if flow_dict[u][v] > 0:
-                    capacity = graph_data['graph'].get_edge_data(u, v).get('weight', 1)
-                    flow_edges.append({
-                        'source': u,
-                        'target': v,
-                        'flow': round(flow_dict[u][v], 2),
-                        'capacity': capacity
-                    })
-        
-        return jsonify({
-            'success': True,
-            'max_flow': round(flow_value, 2),
-            'flow_edges': flow_edges,
-            'message': f'Luồng cực đại từ {source} đến {sink}: {round(flow_value, 2)}'
-        })
-    except Exception as e:
+    if _load_job(job_id) is None:
         return jsonify({
             'success': False,
-            'message': f'Lỗi: {str(e)}'
+            'message': 'Không tìm thấy tác vụ'
         })
+    
+    def generate():
+        
+        last = None
+        deadline = time.monotonic() + JOB_TIMEOUT
+        while time.monotonic() < deadline:
+            row = _load_job(job_id)
+            if row is None:
+                return
+            info = _job_info(row)
+            state = (info['status'], info['progress'], info['message'])
+            if info['status'] not in JOB_ACTIVE:
+                yield f'event: done\ndata: {json.dumps(info, ensure_ascii=False)}\n\n'
+                return
+            if state != last:
+                last = state
+                yield f'event: progress\ndata: {json.dumps(info, ensure_ascii=False)}\n\n'
+            time.sleep(JOB_POLL_INTERVAL)
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+def _job_stats():
+    
+    counts = dict(_db().execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+    return {
+        'queue_depth': counts.get('queued', 0),
+        'running': counts.get('running', 0),
+        'done': counts.get('done', 0),
+        'failed': counts.get('failed', 0),
+        'cancelled': counts.get('cancelled', 0),
+        'workers': JOB_WORKERS,
+        'max_per_workspace': JOB_MAX_PER_WORKSPACE
+    }
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    
+    return jsonify({
+        'success': True,
+        'workspaces': workspace_store.stats(),
+        'position_channel': position_channel.stats(),
+        'result_cache': result_cache.stats(),
+        'jobs': _job_stats()
+    })
 
 def _build_ascii_tree(root, order, is_bfs=True):
     
     if not order:
         return ""
     
-    from collections import defaultdict, deque
+    from collections import defaultdict
     
 
     children = defaultdict(list)
-    visited = set([root])
-    
-    if is_bfs:
-
-        queue = deque([root])
-        order_set = set(order)
-        
-        while queue:
-            current = queue.popleft()
-
-            neighbors = sorted(list(graph_data['graph'].neighbors(current)),
-                             key=lambda n: (graph_data['positions'].get(n, {}).get('y', 0),
-                                          graph_data['positions'].get(n, {}).get('x', 0)))
-            
-            for neighbor in neighbors:
-                if neighbor not in visited and neighbor in order_set:
-                    children[current].append(neighbor)
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-    else:
-
-        parent_map = {root: None}
-        
-        def build_dfs_tree(node):
-            
-
-            neighbors = sorted(list(graph_data['graph'].neighbors(node)),
-                             key=lambda n: (graph_data['positions'].get(n, {}).get('y', 0),
-                                          graph_data['positions'].get(n, {}).get('x', 0)))
-            for neighbor in neighbors:
-                if neighbor not in visited and neighbor in order:
-                    visited.add(neighbor)
-                    children[node].append(neighbor)
-                    parent_map[neighbor] = node
-                    build_dfs_tree(neighbor)
-        
-        build_dfs_tree(root)
+    neighbors = _adjacency_index(graph_data).neighbors
+    for node, parent in _traverse(neighbors, root, depth_first=not is_bfs, allowed=set(order)):
+        if parent is not None:
+            children[parent].append(node)
     
 
     lines = []
-    
-    def draw_tree(node, prefix="", is_last=True):
+    stack = [(root, "", True)]
+    while stack:
+        node, prefix, is_last = stack.pop()
         
 
         connector = "└── " if is_last else "├── "
@@ -914,14 +4811,10 @@ def _build_ascii_tree(root, order, is_bfs=True):
         
 
         child_list = children.get(node, [])
-        for i, child in enumerate(child_list):
-
-            is_last_child = (i == len(child_list) - 1)
-
-            extension = "    " if is_last else "│   "
-            draw_tree(child, prefix + extension, is_last_child)
+        extension = "    " if is_last else "│   "
+        for i in range(len(child_list) - 1, -1, -1):
+            stack.append((child_list[i], prefix + extension, i == len(child_list) - 1))
     
-    draw_tree(root)
     return "\n".join(lines)
 
 if __name__ == '__main__':
@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app
+
+
+def _graph(components, nodes, edges, seed):
+
+    rng = random.Random(seed)
+    graph = nx.Graph()
+    for c in range(components):
+        ids = [f'c{c}n{i}' for i in range(nodes)]
+        graph.add_edges_from((ids[i - 1], ids[i], {'weight': rng.randint(1, 100)}) for i in range(1, nodes))
+        graph.add_edges_from(
+            (rng.choice(ids), rng.choice(ids), {'weight': rng.randint(1, 100)})
+            for _ in range(edges - nodes + 1)
+        )
+    return graph
+
+
+def _run(graph, workers, repeat):
+
+    app.COMPONENT_WORKERS = workers
+    app.MST_PARALLEL_MIN_EDGES = 0 if workers > 1 else float('inf')
+    if app._component_executor is not None:
+        app._component_executor.shutdown()
+        app._component_executor = None
+    if workers > 1:
+        app._component_pool().submit(int).result()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        forest = app._spanning_forest_edges(graph)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), sum(edge[2] for edge in forest), len(forest)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Rừng khung nhỏ nhất: thời gian theo số tiến trình của component pool')
+    parser.add_argument('--components', type=int, default=300)
+    parser.add_argument('--nodes', type=int, default=1000, help='số đỉnh mỗi thành phần')
+    parser.add_argument('--edges', type=int, default=3000, help='số cạnh mỗi thành phần')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    graph = _graph(args.components, args.nodes, args.edges, args.seed)
+    print(f'{args.components} thành phần, {graph.number_of_nodes()} đỉnh, {graph.number_of_edges()} cạnh, '
+          f'{os.cpu_count()} CPU, trung vị {args.repeat} lần')
+
+    baseline = None
+    for workers in args.workers:
+        elapsed, total, count = _run(graph, workers, args.repeat)
+        baseline = baseline or elapsed
+        print(f'{workers} tiến trình: {elapsed:.2f}s ({baseline / elapsed:.2f}x), {count} cạnh, tổng trọng số {total}')
+
+    if app._component_executor is not None:
+        app._component_executor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""So sánh thứ tự duyệt BFS/DFS dùng chỉ mục kề với cách làm trước đó.
+
+Đường cơ sở là nguyên văn vòng lặp cũ của bfs_traversal/dfs_traversal: mỗi lần thăm một đỉnh lại gọi
+sorted(graph.neighbors(n), key=(y, x)), không ghi nhớ; DFS cũ là đệ quy.
+
+Kích thước mặc định 20000 đỉnh / 100000 cạnh (bậc trung bình 10) là mức đồ thị 100k cạnh mà yêu cầu
+nêu ra: cỡ một đồ thị đường phố hay mạng xã hội vừa, nhập qua /api/import_edges và xem bằng chế độ
+vùng nhìn. Ở cỡ này DFS đệ quy cũ đã vượt giới hạn đệ quy mặc định của Python.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from collections import deque
+
+import networkx as nx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app
+
+
+def _previous_bfs(graph_data, start_node):
+
+    visited = set()
+    queue = deque([start_node])
+    bfs_order = []
+    visited.add(start_node)
+
+    while queue:
+        current = queue.popleft()
+        bfs_order.append(current)
+
+        neighbors = sorted(list(graph_data['graph'].neighbors(current)),
+                           key=lambda n: (graph_data['positions'].get(n, {}).get('y', 0),
+                                          graph_data['positions'].get(n, {}).get('x', 0)))
+
+        for neighbor in neighbors:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return bfs_order
+
+
+def _previous_dfs(graph_data, start_node):
+
+    visited = set()
+    dfs_order = []
+
+    def dfs_recursive(node):
+
+        visited.add(node)
+        dfs_order.append(node)
+
+        neighbors = sorted(list(graph_data['graph'].neighbors(node)),
+                           key=lambda n: (graph_data['positions'].get(n, {}).get('y', 0),
+                                          graph_data['positions'].get(n, {}).get('x', 0)))
+
+        for neighbor in neighbors:
+            if neighbor not in visited:
+                dfs_recursive(neighbor)
+
+    dfs_recursive(start_node)
+    return dfs_order
+
+
+def _dfs_depth(neighbors, start):
+
+    depth = 0
+    stack = [(start, iter(neighbors(start)))]
+    visited = {start}
+    while stack:
+        depth = max(depth, len(stack))
+        node, remaining = stack[-1]
+        for neighbor in remaining:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                stack.append((neighbor, iter(neighbors(neighbor))))
+                break
+        else:
+            stack.pop()
+    return depth
+
+
+def _timed(function, repeat):
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='So sánh thứ tự duyệt BFS/DFS: cách cũ sắp xếp láng giềng ở mỗi lần thăm và chỉ mục kề')
+    parser.add_argument('--nodes', type=int, default=20000)
+    parser.add_argument('--edges', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    graph = nx.relabel_nodes(nx.gnm_random_graph(args.nodes, args.edges, seed=args.seed), str)
+    workspace = app._new_workspace()
+    workspace['graph'] = graph
+    workspace['positions'] = {node: {'x': rng.uniform(0, 4000), 'y': rng.uniform(0, 4000)} for node in graph}
+    start = next(iter(graph))
+    print(f'{args.nodes} đỉnh, {args.edges} cạnh, trung vị {args.repeat} lần')
+
+    started = time.perf_counter()
+    index = app._adjacency_index(workspace)
+    print(f'dựng chỉ mục kề (một lần): {(time.perf_counter() - started) * 1000:.1f} ms')
+
+    recursion_limit = sys.getrecursionlimit()
+    depth = _dfs_depth(index.neighbors, start)
+    if depth + 100 > recursion_limit:
+        print(f'DFS cũ (đệ quy) sâu {depth} tầng, vượt giới hạn đệ quy mặc định {recursion_limit} '
+              f'(RecursionError); nâng giới hạn để đo')
+        sys.setrecursionlimit(depth + 1000)
+
+    for label, previous, depth_first in (('BFS', _previous_bfs, False), ('DFS', _previous_dfs, True)):
+        before = _timed(lambda: previous(workspace, start), args.repeat)
+        after = _timed(lambda: list(app._traverse(index.neighbors, start, depth_first)), args.repeat)
+        assert previous(workspace, start) == [node for node, _ in app._traverse(index.neighbors, start, depth_first)]
+        print(f'{label}: sắp xếp láng giềng ở mỗi lần thăm {before:.1f} ms, chỉ mục kề {after:.1f} ms '
+              f'({before / after:.1f}x)')
+
+    nodes = list(graph)
+    moves = [(rng.choice(nodes), rng.uniform(0, 4000), rng.uniform(0, 4000)) for _ in range(1000)]
+    started = time.perf_counter()
+    for node_id, x, y in moves:
+        app._set_position(workspace, node_id, x, y)
+    moved = (time.perf_counter() - started) * 1000 / len(moves)
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(1000)]
+    started = time.perf_counter()
+    for u, v in pairs:
+        if u != v:
+            app._set_edge(workspace, u, v, 1)
+    added = (time.perf_counter() - started) * 1000 / len(pairs)
+    assert app._adjacency_index(workspace) is index
+    print(f'cập nhật tăng dần: update_position {moved:.3f} ms, add_edge {added:.3f} ms mỗi thao tác')
+
+    assert _previous_bfs(workspace, start) == [node for node, _ in app._traverse(index.neighbors, start, False)]
+
+
+if __name__ == '__main__':
+    main()
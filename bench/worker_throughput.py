@@ -0,0 +1,195 @@
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOST = '127.0.0.1'
+COOKIE = 'workspace_id'
+
+
+def _request(port, workspace_id, method, path, payload=None):
+
+    conn = http.client.HTTPConnection(HOST, port, timeout=60)
+    headers = {'Cookie': f'{COOKIE}={workspace_id}'}
+    body = None
+    if payload is not None:
+        body = json.dumps(payload)
+        headers['Content-Type'] = 'application/json'
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        data = response.read()
+    finally:
+        conn.close()
+    if response.status != 200:
+        return False
+    return json.loads(data).get('success', True) is not False
+
+
+def _start_server(workers, port, db):
+
+    env = dict(os.environ, WORKSPACE_DB=db)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'{HOST}:{port}', '--timeout', '120', 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            _request(port, '0' * 32, 'GET', '/api/metrics')
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('gunicorn không khởi động được')
+
+
+def _stop_server(server):
+
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def _graph(nodes, edges, rng):
+
+    return {
+        'nodes': [{'id': f'n{i}', 'x': rng.uniform(0, 4000), 'y': rng.uniform(0, 4000)} for i in range(nodes)],
+        'edges': [
+            {'source': f'n{rng.randrange(nodes)}', 'target': f'n{rng.randrange(nodes)}', 'weight': rng.randint(1, 9)}
+            for _ in range(edges)
+        ],
+        'is_directed': False
+    }
+
+
+def _operation(rng, nodes, write_ratio):
+
+    node_id = f'n{rng.randrange(nodes)}'
+    if rng.random() < write_ratio:
+        if rng.random() < 0.8:
+            return 'POST', '/api/update_position', {'node_id': node_id, 'x': rng.uniform(0, 4000), 'y': rng.uniform(0, 4000)}
+        return 'POST', '/api/add_edge', {'node1': node_id, 'node2': f'n{rng.randrange(nodes)}', 'weight': rng.randint(1, 9)}
+    choice = rng.random()
+    if choice < 0.4:
+        x, y = rng.uniform(0, 3200), rng.uniform(0, 3400)
+        return 'GET', f'/api/viewport?x0={x:.0f}&y0={y:.0f}&x1={x + 800:.0f}&y1={y + 600:.0f}', None
+    if choice < 0.7:
+        return 'POST', '/api/bfs', {'start_node': node_id}
+    return 'GET', '/api/check_bipartite', None
+
+
+def _client(port, workspace_id, nodes, write_ratio, start, duration, seed, results):
+
+    rng = random.Random(seed)
+    timings = []
+    errors = 0
+    while time.time() < start:
+        time.sleep(0.001)
+    deadline = start + duration
+    while time.time() < deadline:
+        method, path, payload = _operation(rng, nodes, write_ratio)
+        started = time.perf_counter()
+        try:
+            ok = _request(port, workspace_id, method, path, payload)
+        except OSError:
+            ok = False
+        timings.append(time.perf_counter() - started)
+        errors += not ok
+    results.put((timings, errors))
+
+
+def _run(workers, args, workload, port):
+
+    rng = random.Random(args.seed)
+    db = os.path.join(tempfile.mkdtemp(), 'workspaces.db')
+    server = _start_server(workers, port, db)
+    try:
+        count = 1 if workload['shared'] else args.clients
+        workspaces = ['%032x' % rng.getrandbits(128) for _ in range(count)]
+        for workspace_id in workspaces:
+            _request(port, workspace_id, 'POST', '/api/import_graph', _graph(args.nodes, args.edges, rng))
+
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        start = time.time() + 2
+        clients = [
+            context.Process(target=_client, args=(
+                port, workspaces[i % count], args.nodes, workload['write_ratio'],
+                start, args.duration, args.seed + i, results
+            ))
+            for i in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        timings, errors = [], 0
+        for _ in clients:
+            client_timings, client_errors = results.get()
+            timings.extend(client_timings)
+            errors += client_errors
+        for client in clients:
+            client.join()
+    finally:
+        _stop_server(server)
+
+    timings.sort()
+    return {
+        'rps': len(timings) / args.duration,
+        'requests': len(timings),
+        'errors': errors,
+        'p50': statistics.median(timings) * 1000 if timings else 0,
+        'p95': timings[min(len(timings) - 1, int(0.95 * len(timings)))] * 1000 if timings else 0
+    }
+
+
+WORKLOADS = {
+    'mixed': {'write_ratio': 0.2, 'shared': False,
+              'label': '80% đọc / 20% ghi, mỗi client một workspace'},
+    'write': {'write_ratio': 1.0, 'shared': False,
+              'label': '100% ghi, mỗi client một workspace (vẫn chung một khoá ghi SQLite)'},
+    'write-shared': {'write_ratio': 1.0, 'shared': True,
+                     'label': '100% ghi, mọi client cùng một workspace (BEGIN IMMEDIATE tuần tự hoá)'}
+}
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Thông lượng (req/s) của gunicorn -w N với nhiều client song song')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=8, help='số client chạy song song')
+    parser.add_argument('--duration', type=float, default=10, help='số giây đo cho mỗi cấu hình')
+    parser.add_argument('--nodes', type=int, default=2000)
+    parser.add_argument('--edges', type=int, default=6000)
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), nargs='+', default=['mixed', 'write', 'write-shared'])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f'{args.clients} client song song, {args.duration:g}s mỗi cấu hình, '
+          f'{args.nodes} đỉnh, {args.edges} cạnh mỗi workspace, {os.cpu_count()} CPU')
+    for name in args.workload:
+        workload = WORKLOADS[name]
+        print(f'\n{name}: {workload["label"]}')
+        baseline = None
+        for workers in args.workers:
+            result = _run(workers, args, workload, args.port)
+            baseline = baseline or result['rps']
+            print(f'  -w {workers}: {result["rps"]:.1f} req/s ({result["rps"] / baseline:.2f}x), '
+                  f'p50 {result["p50"]:.1f} ms, p95 {result["p95"]:.1f} ms, '
+                  f'{result["requests"]} request, {result["errors"]} lỗi')
+
+
+if __name__ == '__main__':
+    main()
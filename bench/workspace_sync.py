@@ -0,0 +1,108 @@
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _client(db, workspace_id):
+
+    os.environ['WORKSPACE_DB'] = db
+    sys.path.insert(0, ROOT)
+    import app
+    client = app.app.test_client()
+    client.set_cookie(app.WORKSPACE_COOKIE, workspace_id)
+    return client
+
+
+def _worker(db, workspace_id, requests, results):
+
+    client = _client(db, workspace_id)
+    timings = []
+    for path, payload in iter(requests.get, None):
+        started = time.perf_counter()
+        response = client.post(path, json=payload)
+        timings.append(time.perf_counter() - started)
+        results.put(response.get_json()['success'])
+    results.put(timings)
+
+
+def _percentile(values, q):
+
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Độ trễ sửa đồ thị khi nhiều worker luân phiên phục vụ cùng một workspace')
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--edges', type=int, default=200000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    db = os.path.join(tempfile.mkdtemp(), 'workspaces.db')
+    workspace_id = '%032x' % rng.getrandbits(128)
+
+    nodes = [{'id': f'n{i}', 'x': rng.uniform(0, 4000), 'y': rng.uniform(0, 4000)} for i in range(args.nodes)]
+    edges = [
+        {'source': f'n{rng.randrange(args.nodes)}', 'target': f'n{rng.randrange(args.nodes)}', 'weight': rng.randint(1, 9)}
+        for _ in range(args.edges)
+    ]
+    started = time.perf_counter()
+    _client(db, workspace_id).post('/api/import_graph', json={'nodes': nodes, 'edges': edges, 'is_directed': False})
+    print(f'import: {time.perf_counter() - started:.2f}s ({args.nodes} đỉnh, {args.edges} cạnh)')
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    queues = []
+    workers = []
+    for _ in range(args.workers):
+        requests = context.Queue()
+        worker = context.Process(target=_worker, args=(db, workspace_id, requests, results))
+        worker.start()
+        queues.append(requests)
+        workers.append(worker)
+
+    for requests in queues:
+        requests.put(('/api/update_position', {'node_id': 'n0', 'x': 0, 'y': 0}))
+        results.get()
+
+    failed = 0
+    started = time.perf_counter()
+    for i in range(args.requests):
+        node_id = f'n{rng.randrange(args.nodes)}'
+        if i % 10 == 9:
+            path = '/api/add_edge'
+            payload = {'node1': node_id, 'node2': f'n{rng.randrange(args.nodes)}', 'weight': rng.randint(1, 9)}
+        else:
+            path = '/api/update_position'
+            payload = {'node_id': node_id, 'x': rng.uniform(0, 4000), 'y': rng.uniform(0, 4000)}
+        queues[i % args.workers].put((path, payload))
+        failed += not results.get()
+    elapsed = time.perf_counter() - started
+
+    timings = []
+    for requests in queues:
+        requests.put(None)
+    for _ in workers:
+        timings.extend(results.get()[1:])
+    for worker in workers:
+        worker.join()
+
+    timings = [t * 1000 for t in timings]
+    print(f'{args.requests} request luân phiên trên {args.workers} worker: {elapsed:.2f}s, {failed} lỗi')
+    print(f'độ trễ mỗi request: trung vị {statistics.median(timings):.2f} ms, '
+          f'p95 {_percentile(timings, 0.95):.2f} ms, tối đa {max(timings):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -16,11 +16,12 @@ let connectingFromNode = null;
 let highlightedPath = []; // Lưu đường đi được highlight
 let traversalOrder = []; // Lưu thứ tự duyệt đồ thị
 let animationIndex = 0; // Chỉ số animation
-let animationInterval = null; // Interval cho animation
+let animation = null; // Hoạt ảnh đang chạy: { start, interval, total }
 let bipartiteColors = {}; // Lưu màu cho đồ thị 2 phía
 let mstEdges = []; // Lưu các cạnh của MST
 let eulerianEdges = []; // Lưu các cạnh của đường đi Euler
 let flowEdges = []; // Lưu các cạnh của luồng cực đại
+let oddCycle = []; // Chu trình lẻ chứng minh đồ thị không phải 2 phía
 
 // Biến cho zoom và pan
 let scale = 1;
@@ -29,6 +30,16 @@ let offsetY = 0;
 let isPanning = false;
 let panStart = { x: 0, y: 0 };
 
+// Đồ thị quá lớn: chỉ tải các đỉnh/cạnh trong vùng nhìn (hoặc cụm đỉnh khi thu nhỏ)
+const VIEWPORT_THRESHOLD = 20000; // số đỉnh
+const VIEWPORT_MARGIN = 0.25; // tải thêm ra ngoài mỗi cạnh màn hình
+const VIEWPORT_DEBOUNCE = 150; // ms
+let viewportMode = false;
+let viewportClusters = [];
+let viewportCellSize = 0;
+let viewportTimer = null;
+let viewportRequest = 0;
+
 // Chuyển đổi tọa độ từ màn hình sang canvas (tính đến zoom và pan)
 function screenToCanvas(screenX, screenY) {
     return {
@@ -37,7 +48,7 @@ function screenToCanvas(screenX, screenY) {
     };
 }
 
-// Vẽ mũi tên cho đồ thị có hướng
+// Thêm đầu mũi tên (đồ thị có hướng) vào path hiện tại; cả lô mũi tên được fill một lần
 function drawArrow(ctx, fromX, fromY, toX, toY) {
     const headLength = 15; // Độ dài mũi tên
     const dx = toX - fromX;
@@ -48,9 +59,6 @@ function drawArrow(ctx, fromX, fromY, toX, toY) {
     const arrowEndX = toX - Math.cos(angle) * 20;
     const arrowEndY = toY - Math.sin(angle) * 20;
     
-    // Vẽ mũi tên
-    ctx.fillStyle = '#667eea';
-    ctx.beginPath();
     ctx.moveTo(arrowEndX, arrowEndY);
     ctx.lineTo(
         arrowEndX - headLength * Math.cos(angle - Math.PI / 6),
@@ -61,15 +69,16 @@ function drawArrow(ctx, fromX, fromY, toX, toY) {
         arrowEndY - headLength * Math.sin(angle + Math.PI / 6)
     );
     ctx.closePath();
-    ctx.fill();
 }
 
 // Tải dữ liệu đồ thị ban đầu
 async function loadGraph() {
     try {
-        const response = await fetch('/api/get_graph');
+        const response = await fetch(`/api/get_graph?max_nodes=${VIEWPORT_THRESHOLD}`);
         const data = await response.json();
         graphData = data;
+        viewportMode = Boolean(data.viewport);
+        viewportClusters = [];
         
         console.log('Loaded graph data:', graphData); // Debug
         
@@ -81,13 +90,105 @@ async function loadGraph() {
             checkbox.checked = graphData.is_directed || false;
         }
         
-        drawGraph();
+        if (viewportMode) {
+            await loadViewport();
+        } else {
+            drawGraph();
+        }
     } catch (error) {
         console.error('Lỗi khi tải đồ thị:', error);
         showNotification('❌ Không thể tải dữ liệu đồ thị', 'error');
     }
 }
 
+// Chỉ tải phần thay đổi kể từ phiên bản hiện có
+async function refreshGraph() {
+    if (graphData.version === undefined || viewportMode) {
+        await loadGraph();
+        return;
+    }
+    
+    try {
+        const response = await fetch(`/api/get_graph_delta?since=${graphData.version}&max_nodes=${VIEWPORT_THRESHOLD}`);
+        const delta = await response.json();
+        
+        if (delta.viewport) {
+            await loadGraph();
+        } else if (delta.full) {
+            graphData = {
+                nodes: delta.nodes,
+                edges: delta.edges,
+                stats: delta.stats,
+                is_directed: delta.is_directed,
+                version: delta.version
+            };
+            updateStats();
+            
+            const checkbox = document.getElementById('directedCheckbox');
+            if (checkbox) {
+                checkbox.checked = graphData.is_directed || false;
+            }
+            
+            drawGraph();
+        } else {
+            applyGraphDelta(delta);
+        }
+    } catch (error) {
+        console.error('Lỗi khi cập nhật đồ thị:', error);
+        await loadGraph();
+    }
+}
+
+// Tải các đỉnh/cạnh nằm trong vùng đang nhìn (có lề) từ chỉ mục không gian phía server
+async function loadViewport() {
+    const request = ++viewportRequest;
+    const topLeft = screenToCanvas(0, 0);
+    const bottomRight = screenToCanvas(canvas.width, canvas.height);
+    const marginX = (bottomRight.x - topLeft.x) * VIEWPORT_MARGIN;
+    const marginY = (bottomRight.y - topLeft.y) * VIEWPORT_MARGIN;
+    const params = new URLSearchParams({
+        x0: topLeft.x - marginX,
+        y0: topLeft.y - marginY,
+        x1: bottomRight.x + marginX,
+        y1: bottomRight.y + marginY,
+        scale: scale
+    });
+    
+    try {
+        const response = await fetch(`/api/viewport?${params}`);
+        const data = await response.json();
+        
+        // Bỏ qua phản hồi cũ nếu người dùng đã kéo/zoom tiếp
+        if (request !== viewportRequest || !viewportMode) {
+            return;
+        }
+        if (!data.success) {
+            showNotification('❌ ' + data.message, 'error');
+            return;
+        }
+        
+        graphData.nodes = data.nodes;
+        graphData.edges = data.edges;
+        graphData.stats = data.stats;
+        graphData.is_directed = data.is_directed;
+        graphData.version = data.version;
+        viewportClusters = data.clusters || [];
+        viewportCellSize = data.cell_size || 0;
+        updateStats();
+        drawGraph();
+    } catch (error) {
+        console.error('Lỗi khi tải vùng nhìn:', error);
+    }
+}
+
+function scheduleViewport() {
+    if (!viewportMode) {
+        return;
+    }
+    clearTimeout(viewportTimer);
+    viewportTimer = setTimeout(loadViewport, VIEWPORT_DEBOUNCE);
+}
+
 // Cập nhật thống kê
 function updateStats() {
     if (graphData.stats) {
@@ -95,169 +196,480 @@ function updateStats() {
         document.getElementById('numEdges').textContent = graphData.stats.num_edges || 0;
         document.getElementById('density').textContent = (graphData.stats.density || 0).toFixed(2);
         document.getElementById('connected').textContent = graphData.stats.is_connected ? 'Có' : 'Không';
+        document.getElementById('numComponents').textContent = graphData.stats.num_components || 0;
+        document.getElementById('oddVertices').textContent = graphData.stats.odd_degree_vertices || 0;
     }
 }
 
-// Vẽ đồ thị
+// Bộ vẽ: cạnh và đỉnh được vẽ sẵn lên các lớp offscreen, chỉ vẽ lại khi dữ liệu, highlight hoặc mức zoom đổi.
+// Mỗi khung (requestAnimationFrame) chỉ ghép các lớp rồi vẽ phần động: đỉnh đang kéo/chọn và các cạnh của nó.
+const NODE_RADIUS = 20;
+const LABEL_MIN_RADIUS = 6; // bán kính đỉnh trên màn hình (px) nhỏ hơn thì bỏ nhãn
+const LIVE_PADDING = 40; // phần đệm quanh đỉnh động: viền, số thứ tự, mũi tên
+const FRAME_SAMPLES = 60;
+
+const EDGE_STYLES = {
+    mst: { color: '#20c997', width: 4 },
+    euler: { color: '#e64980', width: 4 },
+    flow: { color: '#fd7e14', width: 4 },
+    path: { color: '#ff6b6b', width: 4 },
+    oddCycle: { color: '#e03131', width: 4 },
+    normal: { color: '#667eea', width: 2 }
+};
+
+const edgeLayer = document.createElement('canvas');
+const trailEdgeLayer = document.createElement('canvas'); // vệt hoạt ảnh (cạnh Euler đã đi qua)
+const nodeLayer = document.createElement('canvas');
+const trailNodeLayer = document.createElement('canvas'); // vệt hoạt ảnh (đỉnh đã duyệt)
+
+let layersDirty = true;
+let layerView = null; // khung nhìn lúc vẽ các lớp: { scale, offsetX, offsetY, width, height }
+let layerDragged = null; // đỉnh đang kéo (bị tách khỏi lớp tĩnh)
+let renderIndex = null;
+let liveEdges = []; // các cạnh nối với đỉnh đang kéo
+let lastLiveRects = [];
+let trailTraversal = null;
+let trailEuler = null;
+let trailDrawn = 0;
+let frameScheduled = false;
+let framePending = false;
+let dragMoved = false;
+let showFps = false;
+let frameTimes = [];
+let frameStamps = [];
+let layerTime = 0;
+
+// Dữ liệu hoặc highlight thay đổi: vẽ lại các lớp ở khung kế tiếp
 function drawGraph() {
-    // Xóa canvas
-    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    layersDirty = true;
+    requestFrame();
+}
+
+// Chỉ khung nhìn / phần động thay đổi: ghép lại các lớp có sẵn
+function requestFrame() {
+    framePending = true;
+    scheduleFrame();
+}
+
+function scheduleFrame() {
+    if (!frameScheduled) {
+        frameScheduled = true;
+        requestAnimationFrame(renderFrame);
+    }
+}
+
+// Hoạt ảnh từng bước theo thời gian thực, thay cho setInterval
+function startAnimation(total, interval) {
+    animationIndex = 0;
+    animation = { start: performance.now(), interval: interval, total: total };
+    drawGraph();
+}
+
+function pairKey(a, b) {
+    return String(a) < String(b) ? JSON.stringify([a, b]) : JSON.stringify([b, a]);
+}
+
+// Tra cứu highlight theo khóa thay cho find/some trên từng cạnh
+function buildRenderIndex() {
+    const pathEdges = new Set();
+    for (let i = 0; i + 1 < highlightedPath.length; i++) {
+        pathEdges.add(edgeKey(highlightedPath[i], highlightedPath[i + 1]));
+    }
     
-    if (!graphData.nodes || !graphData.edges) {
-        console.error('Dữ liệu đồ thị không hợp lệ:', graphData);
+    const euler = new Map();
+    eulerianEdges.forEach((edge, i) => {
+        const key = edgeKey(edge.source, edge.target);
+        if (!euler.has(key)) {
+            euler.set(key, i);
+        }
+    });
+    
+    const cycleEdges = new Set();
+    oddCycle.forEach((nodeId, i) => cycleEdges.add(pairKey(nodeId, oddCycle[(i + 1) % oddCycle.length])));
+    
+    const traversal = new Map();
+    traversalOrder.forEach((nodeId, i) => {
+        if (!traversal.has(nodeId)) {
+            traversal.set(nodeId, i);
+        }
+    });
+    
+    return {
+        nodes: new Map(graphData.nodes.map(node => [node.id, node])),
+        edges: eulerianEdges.length ? new Map(graphData.edges.map(edge => [edgeKey(edge.source, edge.target), edge])) : null,
+        pathNodes: new Set(highlightedPath),
+        pathEdges: pathEdges,
+        mst: new Set(mstEdges.map(edge => pairKey(edge.source, edge.target))),
+        flow: new Map(flowEdges.map(edge => [JSON.stringify([edge.source, edge.target]), edge])),
+        euler: euler,
+        traversal: traversal,
+        cycleNodes: new Set(oddCycle),
+        cycleEdges: cycleEdges
+    };
+}
+
+// Kiểu cạnh theo thứ tự ưu tiên: MST > Euler (theo tiến độ hoạt ảnh) > luồng > đường đi ngắn nhất > chu trình lẻ
+function edgeStyle(index, edge, animated) {
+    if (index.mst.size && index.mst.has(pairKey(edge.source, edge.target))) {
+        return EDGE_STYLES.mst;
+    }
+    if (animated && index.euler.size) {
+        const eulerIdx = index.euler.get(edgeKey(edge.source, edge.target));
+        if (eulerIdx !== undefined && eulerIdx < animationIndex) {
+            return EDGE_STYLES.euler;
+        }
+    }
+    if (index.flow.size && index.flow.has(JSON.stringify([edge.source, edge.target]))) {
+        return EDGE_STYLES.flow;
+    }
+    if (index.pathEdges.size && index.pathEdges.has(edgeKey(edge.source, edge.target))) {
+        return EDGE_STYLES.path;
+    }
+    if (index.cycleEdges.size && index.cycleEdges.has(pairKey(edge.source, edge.target))) {
+        return EDGE_STYLES.oddCycle;
+    }
+    return EDGE_STYLES.normal;
+}
+
+// Kiểu đỉnh; lớp tĩnh bỏ qua trạng thái chọn/nối (vẽ ở phần động) và tiến độ hoạt ảnh (vẽ ở lớp vệt)
+function nodeStyle(index, node, animated, live) {
+    const isSelected = live && selectedNode === node.id;
+    const isConnecting = live && connectingFromNode && connectingFromNode.id === node.id;
+    const isInPath = index.pathNodes.has(node.id);
+    const isInCycle = index.cycleNodes.has(node.id);
+    const traversalIdx = animated ? index.traversal.get(node.id) : undefined;
+    const isCurrentTraversal = traversalIdx !== undefined && traversalIdx < animationIndex;
+    const bipartiteColor = bipartiteColors[node.id];
+    
+    let fill = '#a8dadc';
+    if (isConnecting) {
+        fill = '#ffc107'; // Màu vàng khi đang nối
+    } else if (bipartiteColor === 0) {
+        fill = '#74c0fc'; // Màu xanh dương cho tập 1
+    } else if (bipartiteColor === 1) {
+        fill = '#ffa94d'; // Màu cam cho tập 2
+    } else if (isCurrentTraversal) {
+        fill = '#51cf66'; // Màu xanh lá cho node đã duyệt
+    } else if (isInPath) {
+        fill = '#ff6b6b'; // Màu đỏ cho đường đi ngắn nhất
+    } else if (isInCycle) {
+        fill = '#ffc9c9'; // Màu hồng cho chu trình lẻ
+    } else if (isSelected) {
+        fill = '#f5576c';
+    }
+    
+    const stroke = bipartiteColor !== undefined ? '#1971c2' : (isCurrentTraversal ? '#2f9e44' : (isInPath ? '#c92a2a' : (isInCycle ? '#e03131' : (isConnecting ? '#ff6f00' : (isSelected ? '#d62828' : '#457b9d')))));
+    const width = bipartiteColor !== undefined || isCurrentTraversal || isInPath || isInCycle || isConnecting ? 4 : (isSelected ? 3 : 2);
+    
+    return {
+        fill: fill,
+        stroke: stroke,
+        width: width,
+        order: isCurrentTraversal ? traversalIdx + 1 : null,
+        key: `${fill}|${stroke}|${width}`
+    };
+}
+
+function labelsVisible(viewScale) {
+    return NODE_RADIUS * viewScale >= LABEL_MIN_RADIUS;
+}
+
+// Vẽ một lô cạnh cùng kiểu bằng một path (và một path cho mọi mũi tên)
+function strokeEdges(target, items, style) {
+    if (items.length === 0) {
+        return;
+    }
+    target.beginPath();
+    items.forEach(([, source, dest]) => {
+        target.moveTo(source.x, source.y);
+        target.lineTo(dest.x, dest.y);
+    });
+    target.strokeStyle = style.color;
+    target.lineWidth = style.width;
+    target.stroke();
+    
+    if (graphData.is_directed) {
+        target.beginPath();
+        items.forEach(([, source, dest]) => drawArrow(target, source.x, source.y, dest.x, dest.y));
+        target.fillStyle = '#667eea';
+        target.fill();
+    }
+}
+
+// Nhãn trọng số (hoặc luồng/sức chứa) ở giữa cạnh
+function drawEdgeLabels(target, items, index, viewScale) {
+    const labelled = items.filter(([edge]) => edge.weight !== 1);
+    if (labelled.length === 0 || !labelsVisible(viewScale)) {
         return;
     }
     
-    // Lưu trạng thái canvas
-    ctx.save();
+    target.beginPath();
+    labelled.forEach(([, source, dest]) => {
+        target.rect((source.x + dest.x) / 2 - 15, (source.y + dest.y) / 2 - 10, 30, 20);
+    });
+    target.fillStyle = 'white';
+    target.fill();
+    
+    target.textAlign = 'center';
+    target.textBaseline = 'middle';
+    labelled.forEach(([edge, source, dest]) => {
+        const midX = (source.x + dest.x) / 2;
+        const midY = (source.y + dest.y) / 2;
+        const flowEdge = index.flow.size ? index.flow.get(JSON.stringify([edge.source, edge.target])) : undefined;
+        
+        // Hiển thị flow/capacity nếu có
+        if (flowEdge) {
+            target.fillStyle = '#fd7e14';
+            target.font = 'bold 11px Arial';
+            target.fillText(`${flowEdge.flow}/${flowEdge.capacity}`, midX, midY);
+        } else {
+            target.fillStyle = '#28a745';
+            target.font = 'bold 12px Arial';
+            target.fillText(edge.weight.toFixed(1), midX, midY);
+        }
+    });
+}
+
+// Vẽ cạnh theo nhóm kiểu: mỗi kiểu một lần stroke
+function drawEdgeGroups(target, items, index, viewScale, animated) {
+    const groups = new Map();
+    items.forEach(item => {
+        const style = edgeStyle(index, item[0], animated);
+        if (!groups.has(style)) {
+            groups.set(style, []);
+        }
+        groups.get(style).push(item);
+    });
+    groups.forEach((group, style) => strokeEdges(target, group, style));
+    drawEdgeLabels(target, items, index, viewScale);
+}
+
+// Vẽ đỉnh theo nhóm kiểu: mỗi kiểu một lần fill + stroke, sau đó vẽ nhãn
+function drawNodeGroups(target, items, viewScale) {
+    const groups = new Map();
+    items.forEach(([node, style]) => {
+        if (!groups.has(style.key)) {
+            groups.set(style.key, { style: style, nodes: [] });
+        }
+        groups.get(style.key).nodes.push(node);
+    });
+    groups.forEach(({ style, nodes }) => {
+        target.beginPath();
+        nodes.forEach(node => {
+            target.moveTo(node.x + NODE_RADIUS, node.y);
+            target.arc(node.x, node.y, NODE_RADIUS, 0, Math.PI * 2);
+        });
+        target.fillStyle = style.fill;
+        target.fill();
+        target.strokeStyle = style.stroke;
+        target.lineWidth = style.width;
+        target.stroke();
+    });
     
-    // Áp dụng transform (zoom và pan)
-    ctx.translate(offsetX, offsetY);
-    ctx.scale(scale, scale);
+    if (!labelsVisible(viewScale)) {
+        return;
+    }
+    target.textAlign = 'center';
+    target.textBaseline = 'middle';
+    
+    // Vẽ số thứ tự duyệt nếu có
+    const ordered = items.filter(([, style]) => style.order);
+    if (ordered.length) {
+        target.fillStyle = '#2f9e44';
+        target.font = 'bold 10px Arial';
+        ordered.forEach(([node, style]) => target.fillText(style.order, node.x, node.y - 30));
+    }
     
-    // Vẽ cạnh
-    ctx.lineWidth = 2;
+    // Vẽ label
+    target.fillStyle = '#1d3557';
+    target.font = 'bold 14px Arial';
+    items.forEach(([node]) => target.fillText(node.id, node.x, node.y));
+}
+
+// Vẽ cụm đỉnh (khi thu nhỏ đồ thị lớn): kích thước theo số đỉnh trong cụm
+function drawClusters(target, viewScale) {
+    if (viewportClusters.length === 0) {
+        return;
+    }
+    const radius = cluster => Math.min(viewportCellSize * viewScale / 2, 6 + 3 * Math.log2(cluster.count)) / viewScale;
     
+    target.beginPath();
+    viewportClusters.forEach(cluster => {
+        target.moveTo(cluster.x + radius(cluster), cluster.y);
+        target.arc(cluster.x, cluster.y, radius(cluster), 0, Math.PI * 2);
+    });
+    target.fillStyle = 'rgba(168, 218, 220, 0.8)';
+    target.fill();
+    target.strokeStyle = '#457b9d';
+    target.lineWidth = 1 / viewScale;
+    target.stroke();
+    
+    target.fillStyle = '#1d3557';
+    target.font = `bold ${10 / viewScale}px Arial`;
+    target.textAlign = 'center';
+    target.textBaseline = 'middle';
+    viewportClusters.forEach(cluster => {
+        if (radius(cluster) * viewScale >= 12) {
+            target.fillText(cluster.count, cluster.x, cluster.y);
+        }
+    });
+}
+
+// Chuẩn bị một lớp offscreen theo khung nhìn lúc vẽ lớp
+function layerContext(layer) {
+    if (layer.width !== canvas.width || layer.height !== canvas.height) {
+        layer.width = canvas.width;
+        layer.height = canvas.height;
+    }
+    const layerCtx = layer.getContext('2d');
+    layerCtx.setTransform(1, 0, 0, 1, 0, 0);
+    layerCtx.clearRect(0, 0, layer.width, layer.height);
+    layerCtx.setTransform(layerView.scale, 0, 0, layerView.scale, layerView.offsetX, layerView.offsetY);
+    return layerCtx;
+}
+
+// Vẽ lại lớp cạnh và lớp đỉnh (chỉ phần nằm trong khung nhìn)
+function renderLayers(dragged) {
+    const start = performance.now();
+    renderIndex = buildRenderIndex();
+    layerView = { scale: scale, offsetX: offsetX, offsetY: offsetY, width: canvas.width, height: canvas.height };
+    layerDragged = dragged;
+    layersDirty = false;
+    trailTraversal = null;
+    trailEuler = null;
+    
+    const pad = NODE_RADIUS + LIVE_PADDING;
+    const topLeft = screenToCanvas(0, 0);
+    const bottomRight = screenToCanvas(canvas.width, canvas.height);
+    const minX = topLeft.x - pad;
+    const minY = topLeft.y - pad;
+    const maxX = bottomRight.x + pad;
+    const maxY = bottomRight.y + pad;
+    
+    const edgeItems = [];
+    liveEdges = [];
     graphData.edges.forEach(edge => {
-        const sourceNode = graphData.nodes.find(n => n.id === edge.source);
-        const targetNode = graphData.nodes.find(n => n.id === edge.target);
-        
-        if (sourceNode && targetNode) {
-            // Kiểm tra xem cạnh này có nằm trong đường đi ngắn nhất không
-            const isInPath = highlightedPath.length > 0 && 
-                highlightedPath.some((nodeId, idx) => {
-                    if (idx < highlightedPath.length - 1) {
-                        return (nodeId === edge.source && highlightedPath[idx + 1] === edge.target);
-                    }
-                    return false;
-                });
-            
-            // Kiểm tra xem cạnh này có trong MST không
-            const isInMST = mstEdges.some(e => 
-                (e.source === edge.source && e.target === edge.target) ||
-                (e.source === edge.target && e.target === edge.source)
-            );
-            
-            // Kiểm tra xem cạnh này có trong đường đi Euler không
-            const eulerIdx = eulerianEdges.findIndex(e =>
-                (e.source === edge.source && e.target === edge.target) ||
-                (!graphData.is_directed && e.source === edge.target && e.target === edge.source)
-            );
-            const isInEuler = eulerIdx >= 0 && eulerIdx < animationIndex;
-            
-            // Kiểm tra xem cạnh này có trong flow không
-            const flowEdge = flowEdges.find(e => e.source === edge.source && e.target === edge.target);
-            const isInFlow = flowEdge !== undefined;
-            
-            // Đổi màu theo loại highlight
-            if (isInMST) {
-                ctx.strokeStyle = '#20c997';
-                ctx.lineWidth = 4;
-            } else if (isInEuler) {
-                ctx.strokeStyle = '#e64980';
-                ctx.lineWidth = 4;
-            } else if (isInFlow) {
-                ctx.strokeStyle = '#fd7e14';
-                ctx.lineWidth = 4;
-            } else if (isInPath) {
-                ctx.strokeStyle = '#ff6b6b';
-                ctx.lineWidth = 4;
-            } else {
-                ctx.strokeStyle = '#667eea';
-                ctx.lineWidth = 2;
-            }
-            
-            ctx.beginPath();
-            ctx.moveTo(sourceNode.x, sourceNode.y);
-            ctx.lineTo(targetNode.x, targetNode.y);
-            ctx.stroke();
-            
-            // Vẽ mũi tên nếu là đồ thị có hướng
-            if (graphData.is_directed) {
-                drawArrow(ctx, sourceNode.x, sourceNode.y, targetNode.x, targetNode.y);
-            }
-            
-            // Vẽ trọng số
-            if (edge.weight !== 1) {
-                const midX = (sourceNode.x + targetNode.x) / 2;
-                const midY = (sourceNode.y + targetNode.y) / 2;
-                
-                ctx.fillStyle = 'white';
-                ctx.fillRect(midX - 15, midY - 10, 30, 20);
-                
-                // Hiển thị flow/capacity nếu có
-                if (flowEdge) {
-                    ctx.fillStyle = '#fd7e14';
-                    ctx.font = 'bold 11px Arial';
-                    ctx.textAlign = 'center';
-                    ctx.textBaseline = 'middle';
-                    ctx.fillText(`${flowEdge.flow}/${flowEdge.capacity}`, midX, midY);
-                } else {
-                    ctx.fillStyle = '#28a745';
-                    ctx.font = 'bold 12px Arial';
-                    ctx.textAlign = 'center';
-                    ctx.textBaseline = 'middle';
-                    ctx.fillText(edge.weight.toFixed(1), midX, midY);
-                }
-            }
+        const source = renderIndex.nodes.get(edge.source);
+        const dest = renderIndex.nodes.get(edge.target);
+        if (!source || !dest) {
+            return;
+        }
+        if (edge.source === dragged || edge.target === dragged) {
+            liveEdges.push([edge, source, dest]);
+        } else if (Math.max(source.x, dest.x) >= minX && Math.min(source.x, dest.x) <= maxX &&
+                   Math.max(source.y, dest.y) >= minY && Math.min(source.y, dest.y) <= maxY) {
+            edgeItems.push([edge, source, dest]);
         }
     });
     
-    // Vẽ nodes
+    const edgeCtx = layerContext(edgeLayer);
+    drawClusters(edgeCtx, scale);
+    drawEdgeGroups(edgeCtx, edgeItems, renderIndex, scale, false);
+    
+    const nodeItems = [];
     graphData.nodes.forEach(node => {
-        const isSelected = selectedNode === node.id;
-        const isConnecting = connectingFromNode && connectingFromNode.id === node.id;
-        const isInPath = highlightedPath.includes(node.id);
-        const isInTraversal = traversalOrder.includes(node.id);
-        const traversalIdx = traversalOrder.indexOf(node.id);
-        const isCurrentTraversal = traversalIdx >= 0 && traversalIdx < animationIndex;
-        const bipartiteColor = bipartiteColors[node.id];
-        
-        // Vẽ vòng tròn
-        ctx.beginPath();
-        ctx.arc(node.x, node.y, 20, 0, Math.PI * 2);
-        
-        if (isConnecting) {
-            ctx.fillStyle = '#ffc107'; // Màu vàng khi đang nối
-        } else if (bipartiteColor === 0) {
-            ctx.fillStyle = '#74c0fc'; // Màu xanh dương cho tập 1
-        } else if (bipartiteColor === 1) {
-            ctx.fillStyle = '#ffa94d'; // Màu cam cho tập 2
-        } else if (isCurrentTraversal) {
-            ctx.fillStyle = '#51cf66'; // Màu xanh lá cho node đã duyệt
-        } else if (isInPath) {
-            ctx.fillStyle = '#ff6b6b'; // Màu đỏ cho đường đi ngắn nhất
-        } else if (isSelected) {
-            ctx.fillStyle = '#f5576c';
-        } else {
-            ctx.fillStyle = '#a8dadc';
+        if (node.id !== dragged && node.x >= minX && node.x <= maxX && node.y >= minY && node.y <= maxY) {
+            nodeItems.push([node, nodeStyle(renderIndex, node, false, false)]);
         }
-        
-        ctx.fill();
-        ctx.strokeStyle = bipartiteColor !== undefined ? '#1971c2' : (isCurrentTraversal ? '#2f9e44' : (isInPath ? '#c92a2a' : (isConnecting ? '#ff6f00' : (isSelected ? '#d62828' : '#457b9d'))));
-        ctx.lineWidth = bipartiteColor !== undefined ? 4 : (isCurrentTraversal ? 4 : (isInPath ? 4 : (isConnecting ? 4 : (isSelected ? 3 : 2))));
-        ctx.stroke();
-        
-        // Vẽ số thứ tự duyệt nếu có
-        if (isCurrentTraversal) {
-            ctx.fillStyle = '#2f9e44';
-            ctx.font = 'bold 10px Arial';
-            ctx.textAlign = 'center';
-            ctx.textBaseline = 'middle';
-            ctx.fillText(traversalIdx + 1, node.x, node.y - 30);
+    });
+    drawNodeGroups(layerContext(nodeLayer), nodeItems, scale);
+    
+    layerTime = performance.now() - start;
+}
+
+// Vẽ thêm các bước hoạt ảnh mới lên lớp vệt, không vẽ lại các bước đã có
+function renderTrail() {
+    if (trailTraversal !== traversalOrder || trailEuler !== eulerianEdges || animationIndex < trailDrawn) {
+        layerContext(trailEdgeLayer);
+        layerContext(trailNodeLayer);
+        trailTraversal = traversalOrder;
+        trailEuler = eulerianEdges;
+        trailDrawn = 0;
+    }
+    if (animationIndex <= trailDrawn) {
+        return false;
+    }
+    
+    const edgeItems = [];
+    const nodeItems = [];
+    for (let step = trailDrawn; step < animationIndex; step++) {
+        const eulerEdge = eulerianEdges[step];
+        if (eulerEdge && renderIndex.edges) {
+            const key = edgeKey(eulerEdge.source, eulerEdge.target);
+            const edge = renderIndex.edges.get(key);
+            if (edge && renderIndex.euler.get(key) === step && edge.source !== layerDragged && edge.target !== layerDragged &&
+                edgeStyle(renderIndex, edge, true) === EDGE_STYLES.euler) {
+                edgeItems.push([edge, renderIndex.nodes.get(edge.source), renderIndex.nodes.get(edge.target)]);
+            }
         }
         
-        // Vẽ label
-        ctx.fillStyle = '#1d3557';
-        ctx.font = 'bold 14px Arial';
-        ctx.textAlign = 'center';
-        ctx.textBaseline = 'middle';
-        ctx.fillText(node.id, node.x, node.y);
-    });
+        const nodeId = traversalOrder[step];
+        const node = nodeId !== undefined ? renderIndex.nodes.get(nodeId) : undefined;
+        if (node && node.id !== layerDragged && renderIndex.traversal.get(nodeId) === step) {
+            nodeItems.push([node, nodeStyle(renderIndex, node, true, false)]);
+        }
+    }
+    trailDrawn = animationIndex;
     
-    // Khôi phục trạng thái canvas
-    ctx.restore();
+    const edgeCtx = trailEdgeLayer.getContext('2d');
+    edgeCtx.setTransform(layerView.scale, 0, 0, layerView.scale, layerView.offsetX, layerView.offsetY);
+    drawEdgeGroups(edgeCtx, edgeItems, renderIndex, layerView.scale, true);
+    
+    const nodeCtx = trailNodeLayer.getContext('2d');
+    nodeCtx.setTransform(layerView.scale, 0, 0, layerView.scale, layerView.offsetX, layerView.offsetY);
+    drawNodeGroups(nodeCtx, nodeItems, layerView.scale);
+    return edgeItems.length > 0 || nodeItems.length > 0;
+}
+
+// Hình chữ nhật (tọa độ màn hình) bao quanh các điểm, có đệm
+function screenRect(points) {
+    let minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+    points.forEach(point => {
+        minX = Math.min(minX, point.x);
+        minY = Math.min(minY, point.y);
+        maxX = Math.max(maxX, point.x);
+        maxY = Math.max(maxY, point.y);
+    });
+    const pad = (NODE_RADIUS + LIVE_PADDING) * scale + 2;
+    return {
+        x: Math.floor(minX * scale + offsetX - pad),
+        y: Math.floor(minY * scale + offsetY - pad),
+        w: Math.ceil((maxX - minX) * scale + 2 * pad),
+        h: Math.ceil((maxY - minY) * scale + 2 * pad)
+    };
+}
+
+// Phần động của khung: đỉnh đang kéo (cùng các cạnh của nó), đỉnh đang chọn/nối
+function liveItems(dragged) {
+    const ids = [];
+    [dragged, selectedNode, connectingFromNode && connectingFromNode.id].forEach(nodeId => {
+        if (nodeId !== null && nodeId !== undefined && !ids.includes(nodeId)) {
+            ids.push(nodeId);
+        }
+    });
     
+    const nodes = [];
+    const rects = [];
+    ids.forEach(nodeId => {
+        const node = renderIndex.nodes.get(nodeId);
+        if (node) {
+            nodes.push([node, nodeStyle(renderIndex, node, true, true)]);
+            rects.push(screenRect(nodeId === dragged ? liveEdges.flatMap(([, source, dest]) => [source, dest]).concat([node]) : [node]));
+        }
+    });
+    return { nodes: nodes, edges: dragged !== null ? liveEdges : [], rects: rects };
+}
+
+// Các vùng cố định của lớp thông tin (hướng dẫn nối cạnh, zoom, FPS)
+function hudRects() {
+    return [
+        { x: 10, y: 10, w: 350, h: 30 },
+        { x: canvas.width - 120, y: canvas.height - 35, w: 110, h: 25 },
+        { x: 10, y: canvas.height - 35, w: 420, h: 25 }
+    ];
+}
+
+function drawHud() {
     // Hiển thị thông tin hướng dẫn nếu đang ở chế độ nối
     if (connectingMode && connectingFromNode) {
         ctx.fillStyle = 'rgba(0, 0, 0, 0.7)';
@@ -265,6 +677,7 @@ function drawGraph() {
         ctx.fillStyle = '#ffc107';
         ctx.font = 'bold 14px Arial';
         ctx.textAlign = 'left';
+        ctx.textBaseline = 'alphabetic';
         ctx.fillText(`🔗 Nhấn Shift + Click vào đỉnh khác để nối với ${connectingFromNode.id}`, 20, 30);
     }
     
@@ -274,7 +687,110 @@ function drawGraph() {
     ctx.fillStyle = '#ffffff';
     ctx.font = 'bold 12px Arial';
     ctx.textAlign = 'left';
+    ctx.textBaseline = 'alphabetic';
     ctx.fillText(`🔍 Zoom: ${(scale * 100).toFixed(0)}%`, canvas.width - 110, canvas.height - 18);
+    
+    // FPS và thời gian vẽ (phím F để bật/tắt)
+    if (showFps && frameTimes.length) {
+        const average = frameTimes.reduce((sum, time) => sum + time, 0) / frameTimes.length;
+        const worst = Math.max(...frameTimes);
+        ctx.fillStyle = 'rgba(0, 0, 0, 0.6)';
+        ctx.fillRect(10, canvas.height - 35, 420, 25);
+        ctx.fillStyle = '#ffffff';
+        ctx.fillText(
+            `⏱ ${frameStamps.length} FPS · khung ${average.toFixed(1)} ms (max ${worst.toFixed(1)}) · lớp ${layerTime.toFixed(1)} ms · ${graphData.edges.length} cạnh`,
+            20, canvas.height - 18
+        );
+    }
+}
+
+// Vẽ một khung: ghép các lớp, vẽ phần động; nếu chỉ phần động đổi thì chỉ vẽ lại vùng bẩn
+function renderFrame(now) {
+    frameScheduled = false;
+    
+    if (!graphData.nodes || !graphData.edges) {
+        console.error('Dữ liệu đồ thị không hợp lệ:', graphData);
+        return;
+    }
+    
+    if (animation) {
+        animationIndex = Math.min(animation.total, Math.floor((now - animation.start) / animation.interval));
+        if (animationIndex >= animation.total) {
+            animation = null;
+        } else {
+            scheduleFrame();
+        }
+    }
+    
+    const start = performance.now();
+    const dragged = draggingNode && dragMoved ? draggingNode.id : null;
+    if (!layerView || dragged !== layerDragged || layerView.scale !== scale ||
+        layerView.width !== canvas.width || layerView.height !== canvas.height) {
+        layersDirty = true;
+    }
+    
+    // Khi đang pan chỉ dịch lớp có sẵn; vẽ lại khi dịch quá xa hoặc khi thả chuột
+    let shiftX = layerView ? offsetX - layerView.offsetX : 0;
+    let shiftY = layerView ? offsetY - layerView.offsetY : 0;
+    if ((shiftX || shiftY) && !(isPanning && Math.abs(shiftX) < canvas.width / 4 && Math.abs(shiftY) < canvas.height / 4)) {
+        layersDirty = true;
+    }
+    
+    let fullRedraw = layersDirty || shiftX !== 0 || shiftY !== 0;
+    if (layersDirty) {
+        renderLayers(dragged);
+        shiftX = 0;
+        shiftY = 0;
+    }
+    if (renderTrail()) {
+        fullRedraw = true;
+    }
+    if (!fullRedraw && !framePending) {
+        return;
+    }
+    framePending = false;
+    
+    const live = liveItems(dragged);
+    const dirtyRects = fullRedraw ? null : lastLiveRects.concat(live.rects, hudRects());
+    lastLiveRects = live.rects;
+    
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.save();
+    if (dirtyRects) {
+        ctx.beginPath();
+        dirtyRects.forEach(rect => ctx.rect(rect.x, rect.y, rect.w, rect.h));
+        ctx.clip();
+        dirtyRects.forEach(rect => ctx.clearRect(rect.x, rect.y, rect.w, rect.h));
+    } else {
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+    }
+    
+    ctx.drawImage(edgeLayer, shiftX, shiftY);
+    ctx.drawImage(trailEdgeLayer, shiftX, shiftY);
+    if (live.edges.length) {
+        ctx.setTransform(scale, 0, 0, scale, offsetX, offsetY);
+        drawEdgeGroups(ctx, live.edges, renderIndex, scale, true);
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+    }
+    ctx.drawImage(nodeLayer, shiftX, shiftY);
+    ctx.drawImage(trailNodeLayer, shiftX, shiftY);
+    if (live.nodes.length) {
+        ctx.setTransform(scale, 0, 0, scale, offsetX, offsetY);
+        drawNodeGroups(ctx, live.nodes, scale);
+        ctx.setTransform(1, 0, 0, 1, 0, 0);
+    }
+    
+    drawHud();
+    ctx.restore();
+    
+    frameTimes.push(performance.now() - start);
+    if (frameTimes.length > FRAME_SAMPLES) {
+        frameTimes.shift();
+    }
+    frameStamps.push(now);
+    while (frameStamps.length && frameStamps[0] <= now - 1000) {
+        frameStamps.shift();
+    }
 }
 
 // Chuyển đổi loại đồ thị
@@ -292,7 +808,7 @@ async function toggleDirected() {
         const result = await response.json();
         
         if (result.success) {
-            await loadGraph();
+            await refreshGraph();
             showNotification('✅ ' + result.message, 'success');
         } else {
             alert('❌ Có lỗi xảy ra');
@@ -354,7 +870,7 @@ async function addNode() {
         
         if (result.success) {
             document.getElementById('nodeId').value = '';
-            await loadGraph();
+            await refreshGraph();
             showNotification('✅ Đã thêm đỉnh ' + nodeId + ' thành công!', 'success');
         } else {
             alert('❌ ' + result.message);
@@ -389,7 +905,7 @@ async function addEdge() {
             document.getElementById('node1').value = '';
             document.getElementById('node2').value = '';
             document.getElementById('weight').value = '1';
-            await loadGraph();
+            await refreshGraph();
             showNotification(`✅ Đã nối cạnh ${node1} - ${node2} (trọng số: ${weight})`, 'success');
         } else {
             alert('❌ ' + result.message);
@@ -400,6 +916,139 @@ async function addEdge() {
     }
 }
 
+// Gửi nhiều thao tác trong một request duy nhất
+async function sendBatch(operations, atomic = true) {
+    const response = await fetch('/api/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ operations, atomic })
+    });
+    
+    const result = await response.json();
+    
+    if (result.success && result.delta) {
+        if (result.delta.version === graphData.version + 1) {
+            applyGraphDelta(result.delta);
+        } else {
+            // Có thay đổi khác xen giữa (tab khác), tải phần còn thiếu
+            await refreshGraph();
+        }
+    }
+    
+    return result;
+}
+
+// Khóa của cạnh (đồ thị vô hướng không phân biệt chiều)
+function edgeKey(source, target) {
+    if (!graphData.is_directed && String(target) < String(source)) {
+        return JSON.stringify([target, source]);
+    }
+    return JSON.stringify([source, target]);
+}
+
+// Áp dụng phần thay đổi (delta) vào dữ liệu đồ thị phía client
+function applyGraphDelta(delta) {
+    if (viewportMode) {
+        loadViewport();
+        return;
+    }
+    
+    const removedNodes = new Set(delta.removed_nodes);
+    
+    const nodeMap = new Map();
+    graphData.nodes.forEach(node => {
+        if (!removedNodes.has(node.id)) {
+            nodeMap.set(node.id, node);
+        }
+    });
+    delta.nodes.forEach(node => {
+        const existing = nodeMap.get(node.id);
+        if (existing) {
+            existing.x = node.x;
+            existing.y = node.y;
+        } else {
+            nodeMap.set(node.id, node);
+        }
+    });
+    graphData.nodes = Array.from(nodeMap.values());
+    
+    const edgeMap = new Map();
+    graphData.edges.forEach(edge => edgeMap.set(edgeKey(edge.source, edge.target), edge));
+    delta.removed_edges.forEach(edge => edgeMap.delete(edgeKey(edge.source, edge.target)));
+    delta.edges.forEach(edge => edgeMap.set(edgeKey(edge.source, edge.target), edge));
+    graphData.edges = Array.from(edgeMap.values()).filter(edge =>
+        !removedNodes.has(edge.source) && !removedNodes.has(edge.target)
+    );
+    
+    if (delta.stats) {
+        graphData.stats = delta.stats;
+        updateStats();
+    }
+    
+    if (delta.version !== undefined) {
+        graphData.version = delta.version;
+    }
+    
+    drawGraph();
+}
+
+// Thêm nhiều cạnh cùng lúc (mỗi dòng: đỉnh1 đỉnh2 [trọng số])
+async function addBulkEdges() {
+    const text = document.getElementById('bulkEdges').value;
+    const lines = text.split('\n').map(line => line.trim()).filter(line => line);
+    
+    if (lines.length === 0) {
+        alert('⚠️ Vui lòng nhập ít nhất một cạnh (ví dụ: A B 2)');
+        return;
+    }
+    
+    const knownNodes = new Set(graphData.nodes.map(node => node.id));
+    const operations = [];
+    const edgeOperations = [];
+    
+    for (let i = 0; i < lines.length; i++) {
+        const parts = lines[i].split(/[\s,;]+/);
+        if (parts.length < 2) {
+            alert(`❌ Dòng ${i + 1} không hợp lệ: "${lines[i]}"`);
+            return;
+        }
+        
+        [parts[0], parts[1]].forEach(nodeId => {
+            if (!knownNodes.has(nodeId)) {
+                knownNodes.add(nodeId);
+                operations.push({
+                    op: 'add_node',
+                    node_id: nodeId,
+                    x: Math.random() * (canvas.width - 100) + 50,
+                    y: Math.random() * (canvas.height - 100) + 50
+                });
+            }
+        });
+        
+        const weight = parts.length > 2 ? parseFloat(parts[2]) : 1;
+        edgeOperations.push({
+            op: 'add_edge',
+            node1: parts[0],
+            node2: parts[1],
+            weight: isNaN(weight) ? 1 : weight
+        });
+    }
+    
+    try {
+        const result = await sendBatch(operations.concat(edgeOperations));
+        
+        if (result.success) {
+            document.getElementById('bulkEdges').value = '';
+            showNotification(`✅ Đã thêm ${edgeOperations.length} cạnh`, 'success');
+        } else {
+            alert('❌ ' + result.message);
+        }
+    } catch (error) {
+        console.error('Lỗi khi thêm nhiều cạnh:', error);
+        showNotification('❌ Có lỗi xảy ra khi thêm nhiều cạnh', 'error');
+    }
+}
+
 // Xóa đỉnh
 async function removeNode() {
     const nodeId = document.getElementById('removeNodeId').value.trim();
@@ -424,7 +1073,7 @@ async function removeNode() {
         
         if (result.success) {
             document.getElementById('removeNodeId').value = '';
-            await loadGraph();
+            await refreshGraph();
             showNotification('✅ ' + result.message, 'success');
         } else {
             alert('❌ ' + result.message);
@@ -461,7 +1110,7 @@ async function removeEdge() {
         if (result.success) {
             document.getElementById('removeEdge1').value = '';
             document.getElementById('removeEdge2').value = '';
-            await loadGraph();
+            await refreshGraph();
             showNotification('✅ ' + result.message, 'success');
         } else {
             alert('❌ ' + result.message);
@@ -472,18 +1121,102 @@ async function removeEdge() {
     }
 }
 
+// Kích thước vùng vẽ gửi kèm khi tính bố cục
+function layoutSize() {
+    return { width: canvas.width, height: canvas.height };
+}
+
+// Bố cục lò xo dạng luồng: khung đầu chứa toàn bộ vị trí, các khung sau chỉ chứa độ dời (đã làm tròn)
+function streamSpringLayout() {
+    return new Promise(resolve => {
+        const source = new EventSource('/api/spring_layout/stream?' + new URLSearchParams(layoutSize()));
+        const byId = new Map(graphData.nodes.map(node => [node.id, node]));
+        let nodes = [];
+        let finished = false;
+        
+        // Kết thúc (xong hoặc người dùng dừng sớm): lưu vị trí đang hiển thị
+        const finish = async (message) => {
+            if (finished) {
+                return;
+            }
+            finished = true;
+            source.close();
+            hideProgress();
+            
+            const updates = nodes.filter(node => node).map(node => ({ node_id: node.id, x: node.x, y: node.y }));
+            if (updates.length === 0) {
+                resolve({ success: false, message: message || 'Không nhận được bố cục' });
+                return;
+            }
+            await sendNodePositions(updates, 0);
+            resolve({ success: true });
+        };
+        
+        const shift = (node, dx, dy) => {
+            if (node) {
+                node.x += dx;
+                node.y += dy;
+            }
+        };
+        
+        const render = (progress) => {
+            showProgress(`⏳ Đang tính bố cục: ${Math.round(progress * 100)}% (Hủy = dừng và giữ bố cục hiện tại)`, () => finish());
+            drawGraph();
+        };
+        
+        source.addEventListener('init', event => {
+            const data = JSON.parse(event.data);
+            // Ở chế độ vùng nhìn, đỉnh ngoài màn hình vẫn được giữ để lưu vị trí khi kết thúc
+            nodes = data.nodes.map(id => byId.get(id) || { id: id });
+            nodes.forEach((node, i) => {
+                if (node) {
+                    node.x = data.xy[2 * i];
+                    node.y = data.xy[2 * i + 1];
+                }
+            });
+            render(data.progress);
+        });
+        
+        source.addEventListener('frame', event => {
+            const data = JSON.parse(event.data);
+            if (data.i) {
+                data.i.forEach((index, k) => shift(nodes[index], data.d[2 * k], data.d[2 * k + 1]));
+            } else {
+                nodes.forEach((node, i) => shift(node, data.d[2 * i], data.d[2 * i + 1]));
+            }
+            render(data.progress);
+        });
+        
+        source.addEventListener('done', () => finish());
+        // Tác vụ nền lỗi hoặc bị hủy: giữ nguyên vị trí đã lưu trên server
+        source.addEventListener('failed', event => {
+            finished = true;
+            source.close();
+            hideProgress();
+            refreshGraph().then(() => resolve({ success: false, message: JSON.parse(event.data).message }));
+        });
+        source.onerror = () => finish('Mất kết nối khi tính bố cục');
+    });
+}
+
 // Áp dụng Spring Layout
 async function applySpringLayout() {
     try {
-        const response = await fetch('/api/spring_layout', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
-        });
-        
-        const result = await response.json();
+        let result;
+        if (isLargeGraph()) {
+            // Nhận từng khung vị trí qua SSE để canvas chuyển động trong lúc bố cục hội tụ
+            result = await streamSpringLayout();
+        } else {
+            const response = await fetch('/api/spring_layout', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(layoutSize())
+            });
+            result = await response.json();
+        }
         
         if (result.success) {
-            await loadGraph();
+            await refreshGraph();
             showNotification('✅ Đã áp dụng bố cục lò xo thành công!', 'success');
         } else {
             alert('❌ ' + result.message);
@@ -499,13 +1232,14 @@ async function applyCircularLayout() {
     try {
         const response = await fetch('/api/circular_layout', {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' }
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(layoutSize())
         });
         
         const result = await response.json();
         
         if (result.success) {
-            await loadGraph();
+            await refreshGraph();
             showNotification('✅ Đã áp dụng bố cục vòng tròn thành công!', 'success');
         } else {
             alert('❌ ' + result.message);
@@ -532,7 +1266,7 @@ async function clearAll() {
         
         if (result.success) {
             selectedNode = null;
-            await loadGraph();
+            await refreshGraph();
             showNotification('✅ Đã xóa toàn bộ đồ thị thành công!', 'success');
         }
     } catch (error) {
@@ -550,28 +1284,41 @@ async function saveGraph() {
         return;
     }
     
+    const format = document.getElementById('saveFormat').value;
+    const binary = format.startsWith('binary');
+    const extension = binary ? '.gbin' : '.json';
+    
     try {
-        const response = await fetch('/api/export_graph');
-        const result = await response.json();
+        const endpoint = binary
+            ? '/api/export_graph?format=binary' + (format === 'binary_float32' ? '&precision=float32' : '')
+            : '/api/export_graph';
+        const response = await fetch(endpoint);
+        let blob;
         
-        if (result.success) {
-            // Tạo blob và tải xuống
-            const dataStr = JSON.stringify(result.data, null, 2);
-            const blob = new Blob([dataStr], { type: 'application/json' });
-            const url = URL.createObjectURL(blob);
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = filename.endsWith('.json') ? filename : filename + '.json';
-            document.body.appendChild(a);
-            a.click();
-            document.body.removeChild(a);
-            URL.revokeObjectURL(url);
-            
-            closeModal('saveModal');
-            showNotification('✅ Đã tải file về máy thành công!', 'success');
+        if (binary && response.headers.get('Content-Type') === 'application/octet-stream') {
+            blob = await response.blob();
         } else {
-            alert('❌ ' + result.message);
+            const result = await response.json();
+            if (!result.success) {
+                alert('❌ ' + result.message);
+                return;
+            }
+            const dataStr = JSON.stringify(result.data, null, 2);
+            blob = new Blob([dataStr], { type: 'application/json' });
         }
+        
+        // Tạo link và tải xuống
+        const url = URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = filename.endsWith(extension) ? filename : filename + extension;
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+        URL.revokeObjectURL(url);
+        
+        closeModal('saveModal');
+        showNotification('✅ Đã tải file về máy thành công!', 'success');
     } catch (error) {
         console.error('Lỗi khi xuất đồ thị:', error);
         showNotification('❌ Có lỗi xảy ra khi xuất đồ thị', 'error');
@@ -588,9 +1335,135 @@ function showSaveDialog() {
     input.select();
 }
 
+// Lưu đồ thị vào thư viện trên server
+async function saveGraphToServer() {
+    const filename = document.getElementById('saveFilename').value.trim();
+    
+    if (!filename) {
+        alert('⚠️ Vui lòng nhập tên file!');
+        return;
+    }
+    
+    try {
+        const response = await fetch('/api/save_graph', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ filename: filename })
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            closeModal('saveModal');
+            showNotification('✅ ' + result.message, 'success');
+        } else {
+            alert('❌ ' + result.message);
+        }
+    } catch (error) {
+        console.error('Lỗi khi lưu lên server:', error);
+        showNotification('❌ Có lỗi xảy ra khi lưu đồ thị', 'error');
+    }
+}
+
 // Hiển thị dialog tải
 function showLoadDialog() {
-    document.getElementById('fileInput').click();
+    document.getElementById('fileSearch').value = '';
+    document.getElementById('loadModal').style.display = 'block';
+    loadFileList();
+}
+
+function escapeHTML(text) {
+    return String(text)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
+function formatFileSize(bytes) {
+    if (bytes < 1024) return `${bytes} B`;
+    if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+    return `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+}
+
+// Danh sách đồ thị đã lưu trên server (đọc từ bảng chỉ mục, không mở file)
+let fileListPage = 1;
+
+async function loadFileList(append = false) {
+    const container = document.getElementById('fileList');
+    const query = document.getElementById('fileSearch').value.trim();
+    fileListPage = append ? fileListPage + 1 : 1;
+    
+    try {
+        const response = await fetch(`/api/saved_graphs?page=${fileListPage}&q=${encodeURIComponent(query)}`);
+        const result = await response.json();
+        
+        if (!result.success) {
+            container.innerHTML = `<p style="color: #dc3545;">${escapeHTML(result.message)}</p>`;
+            return;
+        }
+        
+        let html = '';
+        result.graphs.forEach(graph => {
+            const name = escapeHTML(graph.name);
+            const nameArg = escapeHTML(JSON.stringify(graph.name));
+            const updated = new Date(graph.updated_at * 1000).toLocaleString('vi-VN');
+            html += `<div class="file-item" onclick="loadGraphFile(${nameArg})">
+                <div class="file-item-header">
+                    <span>${name}</span>
+                    <div class="file-item-actions">
+                        <button class="btn-load" onclick="event.stopPropagation(); loadGraphFile(${nameArg})">Tải</button>
+                        <button class="btn-delete" onclick="event.stopPropagation(); deleteGraphFile(${nameArg})">Xóa</button>
+                    </div>
+                </div>
+                <div class="file-item-info">
+                    ${graph.num_nodes} đỉnh · ${graph.num_edges} cạnh · ${graph.is_directed ? 'có hướng' : 'vô hướng'}
+                    · ${formatFileSize(graph.size)} · ${updated}
+                </div>
+            </div>`;
+        });
+        
+        const loaded = (result.page - 1) * result.page_size + result.graphs.length;
+        if (append) {
+            document.getElementById('fileListMore')?.remove();
+            container.insertAdjacentHTML('beforeend', html);
+        } else {
+            container.innerHTML = html || '<p style="color: #6c757d; text-align: center;">Chưa có đồ thị nào được lưu</p>';
+        }
+        if (loaded < result.total) {
+            container.insertAdjacentHTML('beforeend',
+                `<button id="fileListMore" onclick="loadFileList(true)" style="width: 100%;">Xem thêm (${result.total - loaded})</button>`);
+        }
+    } catch (error) {
+        console.error('Lỗi khi lấy danh sách đồ thị:', error);
+        showNotification('❌ Có lỗi xảy ra khi lấy danh sách đồ thị', 'error');
+    }
+}
+
+// Tải đồ thị đã lưu trên server vào workspace hiện tại
+async function loadGraphFile(filename) {
+    try {
+        const response = await fetch('/api/load_saved_graph', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ filename: filename })
+        });
+        
+        const result = await response.json();
+        
+        if (result.success) {
+            closeModal('loadModal');
+            selectedNode = null;
+            await refreshGraph();
+            showNotification('✅ ' + result.message, 'success');
+        } else {
+            alert('❌ ' + result.message);
+        }
+    } catch (error) {
+        console.error('Lỗi khi tải đồ thị:', error);
+        showNotification('❌ Có lỗi xảy ra khi tải đồ thị', 'error');
+    }
 }
 
 // Đóng modal
@@ -602,9 +1475,17 @@ function closeModal(modalId) {
 async function handleFileUpload(event) {
     const file = event.target.files[0];
     if (!file) return;
+    closeModal('loadModal');
+    
+    if (/\.(csv|ndjson|jsonl)$/.test(file.name)) {
+        await importEdgeList(file);
+        event.target.value = '';
+        return;
+    }
     
-    if (!file.name.endsWith('.json')) {
-        alert('⚠️ Vui lòng chọn file JSON!');
+    const binary = file.name.endsWith('.gbin');
+    if (!binary && !file.name.endsWith('.json')) {
+        alert('⚠️ Vui lòng chọn file JSON, GBIN, CSV hoặc NDJSON!');
         return;
     }
     
@@ -612,28 +1493,34 @@ async function handleFileUpload(event) {
         const reader = new FileReader();
         reader.onload = async (e) => {
             try {
-                const graphData = JSON.parse(e.target.result);
+                // File nhị phân được gửi nguyên vẹn, server tự giải mã
+                const request = binary
+                    ? { headers: { 'Content-Type': 'application/octet-stream' }, body: e.target.result }
+                    : { headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(JSON.parse(e.target.result)) };
                 
                 const response = await fetch('/api/import_graph', {
                     method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify(graphData)
+                    ...request
                 });
                 
                 const result = await response.json();
                 
                 if (result.success) {
-                    await loadGraph();
+                    await refreshGraph();
                     showNotification('✅ ' + result.message, 'success');
                 } else {
                     alert('❌ ' + result.message);
                 }
             } catch (error) {
-                console.error('Lỗi khi parse JSON:', error);
+                console.error('Lỗi khi đọc dữ liệu:', error);
                 alert('❌ File không đúng định dạng!');
             }
         };
-        reader.readAsText(file);
+        if (binary) {
+            reader.readAsArrayBuffer(file);
+        } else {
+            reader.readAsText(file);
+        }
     } catch (error) {
         console.error('Lỗi khi đọc file:', error);
         showNotification('❌ Có lỗi xảy ra khi đọc file', 'error');
@@ -643,6 +1530,152 @@ async function handleFileUpload(event) {
     event.target.value = '';
 }
 
+// Hiển thị tiến độ (một khung duy nhất, cập nhật tại chỗ), có thể kèm nút hủy
+function showProgress(message, onCancel = null) {
+    let box = document.getElementById('progressBox');
+    if (!box) {
+        box = document.createElement('div');
+        box.id = 'progressBox';
+        box.style.cssText = `
+            position: fixed;
+            bottom: 20px;
+            right: 20px;
+            display: flex;
+            align-items: center;
+            gap: 12px;
+            padding: 12px 20px;
+            background: #667eea;
+            color: white;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+            font-weight: 600;
+            z-index: 10000;
+        `;
+        box.innerHTML = '<span></span><button style="display: none; width: auto; margin: 0; padding: 4px 10px; background: #dc3545;">Hủy</button>';
+        document.body.appendChild(box);
+    }
+    box.querySelector('span').textContent = message;
+    const cancelButton = box.querySelector('button');
+    cancelButton.style.display = onCancel ? 'inline-block' : 'none';
+    cancelButton.onclick = onCancel;
+}
+
+function hideProgress() {
+    const box = document.getElementById('progressBox');
+    if (box) box.remove();
+}
+
+// Đồ thị lớn: bố cục lò xo được stream từng khung qua SSE thay vì chờ một lần
+const LAYOUT_STREAM_THRESHOLD = 20000;
+const JOB_POLL_INTERVAL = 500;
+
+function isLargeGraph() {
+    return viewportMode || graphData.nodes.length + graphData.edges.length > LAYOUT_STREAM_THRESHOLD;
+}
+
+async function followJob(jobId, label) {
+    const cancel = async () => {
+        await fetch(`/api/jobs/${jobId}/cancel`, { method: 'POST' });
+    };
+    
+    try {
+        while (true) {
+            const job = await (await fetch(`/api/jobs/${jobId}`)).json();
+            if (!job.success) {
+                return job;
+            }
+            if (job.status === 'done') {
+                return job.result;
+            }
+            if (job.status === 'failed') {
+                return { success: false, message: job.error };
+            }
+            if (job.status === 'cancelled') {
+                return { success: false, message: 'Tác vụ đã bị hủy' };
+            }
+            
+            const detail = job.status === 'queued'
+                ? `đang chờ (vị trí ${job.queue_position + 1})`
+                : `${Math.round(job.progress * 100)}%`;
+            showProgress(`⏳ ${label}: ${detail}`, cancel);
+            await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL));
+        }
+    } finally {
+        hideProgress();
+    }
+}
+
+// Server quyết định chạy trực tiếp hay chuyển thành tác vụ nền (HTTP 202 kèm job_id)
+async function runAlgorithm(label, request) {
+    const response = await request();
+    const result = await response.json();
+    if (response.status === 202 && result.job_id) {
+        return followJob(result.job_id, label);
+    }
+    return result;
+}
+
+// Nhập danh sách cạnh lớn (CSV/NDJSON): server đọc theo luồng và báo tiến độ từng lô
+async function importEdgeList(file) {
+    const format = file.name.endsWith('.csv') ? 'csv' : 'ndjson';
+    const mode = confirm('Nhấn OK để thay thế đồ thị hiện tại, Cancel để thêm vào đồ thị hiện tại.') ? 'replace' : 'append';
+    const directed = mode === 'replace' ? (graphData.is_directed ? 1 : 0) : 0;
+    
+    try {
+        showProgress('⏳ Đang tải lên...');
+        const response = await fetch(`/api/import_edges?format=${format}&mode=${mode}&directed=${directed}`, {
+            method: 'POST',
+            headers: { 'Content-Type': format === 'csv' ? 'text/csv' : 'application/x-ndjson' },
+            body: file
+        });
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = null;
+        
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const message = JSON.parse(line);
+                if (message.type === 'progress') {
+                    const percent = message.total_bytes ? ` (${Math.round(100 * message.bytes / message.total_bytes)}%)` : '';
+                    showProgress(`⏳ Đã đọc ${message.lines} dòng, ${message.edges} cạnh${percent}`);
+                } else {
+                    result = message;
+                }
+            }
+        }
+        if (buffer.trim()) {
+            result = JSON.parse(buffer);
+        }
+        hideProgress();
+        
+        if (result && result.success) {
+            await refreshGraph();
+            showNotification('✅ ' + result.message, 'success');
+        } else {
+            alert('❌ ' + (result ? result.message : 'Không nhận được kết quả'));
+        }
+        
+        if (result && result.error_samples && result.error_samples.length > 0) {
+            const details = result.error_samples.slice(0, 10)
+                .map(sample => `Dòng ${sample.line}: ${sample.error}`)
+                .join('\n');
+            alert(`⚠️ ${result.errors} dòng lỗi bị bỏ qua:\n${details}`);
+        }
+    } catch (error) {
+        hideProgress();
+        console.error('Lỗi khi nhập danh sách cạnh:', error);
+        showNotification('❌ Có lỗi xảy ra khi nhập danh sách cạnh', 'error');
+    }
+}
+
 // Xóa file đồ thị
 async function deleteGraphFile(filename) {
     if (!confirm(`⚠️ Bạn có chắc muốn xóa file ${filename}?`)) {
@@ -695,7 +1728,7 @@ async function createNodeAtPosition(x, y) {
         const result = await response.json();
         
         if (result.success) {
-            await loadGraph();
+            await refreshGraph();
             showNotification(`✅ Đã tạo đỉnh ${nodeId} tại vị trí click!`, 'success');
         } else {
             alert('❌ ' + result.message);
@@ -726,7 +1759,7 @@ async function connectNodes(node1, node2) {
         const result = await response.json();
         
         if (result.success) {
-            await loadGraph();
+            await refreshGraph();
             showNotification(`✅ Đã nối cạnh ${node1} - ${node2} (trọng số: ${weightValue})`, 'success');
         } else {
             alert('❌ ' + result.message);
@@ -737,17 +1770,63 @@ async function connectNodes(node1, node2) {
     }
 }
 
+// Kênh cập nhật vị trí: gom các lần di chuyển, mỗi đỉnh chỉ gửi vị trí cuối cùng trong mỗi cửa sổ
+const POSITION_FLUSH_INTERVAL = 200; // ms
+let pendingPositions = new Map();
+let coalescedPositions = 0;
+let positionFlushTimer = null;
+let positionSendChain = Promise.resolve();
+
+function queueNodePosition(nodeId, x, y) {
+    if (pendingPositions.has(nodeId)) {
+        coalescedPositions++;
+    }
+    pendingPositions.set(nodeId, { node_id: nodeId, x: x, y: y });
+    
+    if (!positionFlushTimer) {
+        positionFlushTimer = setTimeout(flushNodePositions, POSITION_FLUSH_INTERVAL);
+    }
+}
+
+async function flushNodePositions() {
+    if (positionFlushTimer) {
+        clearTimeout(positionFlushTimer);
+        positionFlushTimer = null;
+    }
+    
+    if (pendingPositions.size === 0) {
+        return;
+    }
+    
+    const updates = Array.from(pendingPositions.values());
+    const coalesced = coalescedPositions;
+    pendingPositions = new Map();
+    coalescedPositions = 0;
+    
+    await sendNodePositions(updates, coalesced);
+}
+
+// Các lần gửi nối tiếp nhau: lần sau chỉ bắt đầu khi lần trước đã xong,
+// để vị trí cũ không thể đến server sau vị trí mới
+function sendNodePositions(updates, coalesced) {
+    positionSendChain = positionSendChain.then(async () => {
+        try {
+            await fetch('/api/update_positions', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ updates: updates, coalesced: coalesced })
+            });
+        } catch (error) {
+            console.error('Lỗi khi cập nhật vị trí:', error);
+        }
+    });
+    return positionSendChain;
+}
+
 // Cập nhật vị trí node
 async function updateNodePosition(nodeId, x, y) {
-    try {
-        await fetch('/api/update_position', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ node_id: nodeId, x: x, y: y })
-        });
-    } catch (error) {
-        console.error('Lỗi khi cập nhật vị trí:', error);
-    }
+    queueNodePosition(nodeId, x, y);
+    await flushNodePositions();
 }
 
 // Xử lý sự kiện chuột
@@ -787,7 +1866,7 @@ canvas.addEventListener('mousedown', (e) => {
                 connectingMode = true;
                 selectedNode = clickedNode.id;
                 showNotification(`🔗 Đang nối từ đỉnh ${clickedNode.id}. Nhấn Shift + Click vào đỉnh khác để hoàn tất`, 'info');
-                drawGraph();
+                requestFrame();
             } else if (connectingFromNode.id !== clickedNode.id) {
                 // Hoàn tất nối cạnh
                 connectNodes(connectingFromNode.id, clickedNode.id);
@@ -801,8 +1880,9 @@ canvas.addEventListener('mousedown', (e) => {
             connectingMode = false;
             selectedNode = clickedNode.id;
             draggingNode = clickedNode;
+            dragMoved = false;
             dragOffset = { x: x - clickedNode.x, y: y - clickedNode.y };
-            drawGraph();
+            requestFrame();
             return;
         }
     } else {
@@ -814,7 +1894,7 @@ canvas.addEventListener('mousedown', (e) => {
             selectedNode = null;
             connectingFromNode = null;
             connectingMode = false;
-            drawGraph();
+            requestFrame();
         }
     }
 });
@@ -828,7 +1908,8 @@ canvas.addEventListener('mousemove', (e) => {
     if (isPanning) {
         offsetX = screenX - panStart.x;
         offsetY = screenY - panStart.y;
-        drawGraph();
+        requestFrame();
+        scheduleViewport();
         return;
     }
     
@@ -841,8 +1922,11 @@ canvas.addEventListener('mousemove', (e) => {
         // Giới hạn trong canvas (tính theo tọa độ canvas gốc)
         draggingNode.x = Math.max(20, Math.min(canvas.width / scale - 20, x));
         draggingNode.y = Math.max(20, Math.min(canvas.height / scale - 20, y));
+        queueNodePosition(draggingNode.id, draggingNode.x, draggingNode.y);
         
-        drawGraph();
+        // Chỉ đỉnh đang kéo và các cạnh của nó được vẽ lại
+        dragMoved = true;
+        requestFrame();
     }
 });
 
@@ -855,7 +1939,11 @@ canvas.addEventListener('mouseup', () => {
     if (draggingNode) {
         updateNodePosition(draggingNode.id, draggingNode.x, draggingNode.y);
         draggingNode = null;
+        dragMoved = false;
     }
+    
+    // Gắn đỉnh vừa kéo / phần vừa pan trở lại các lớp tĩnh
+    requestFrame();
 });
 
 canvas.addEventListener('mouseleave', () => {
@@ -867,7 +1955,11 @@ canvas.addEventListener('mouseleave', () => {
     if (draggingNode) {
         updateNodePosition(draggingNode.id, draggingNode.x, draggingNode.y);
         draggingNode = null;
+        dragMoved = false;
     }
+    
+    // Gắn đỉnh vừa kéo / phần vừa pan trở lại các lớp tĩnh
+    requestFrame();
 });
 
 // Xử lý zoom bằng scroll chuột
@@ -885,8 +1977,9 @@ canvas.addEventListener('wheel', (e) => {
     const zoomFactor = e.deltaY < 0 ? 1.1 : 0.9;
     const newScale = scale * zoomFactor;
     
-    // Giới hạn zoom (từ 20% đến 500%)
-    if (newScale >= 0.2 && newScale <= 5) {
+    // Giới hạn zoom (từ 20% đến 500%; đồ thị lớn cho phóng tới 5000% để xem từng đỉnh)
+    const maxScale = viewportMode ? 50 : 5;
+    if (newScale >= 0.2 && newScale <= maxScale) {
         scale = newScale;
         
         // Tính lại offset để zoom vào vị trí chuột
@@ -895,10 +1988,23 @@ canvas.addEventListener('wheel', (e) => {
         offsetX += (worldPosAfter.x - worldPosBefore.x) * scale;
         offsetY += (worldPosAfter.y - worldPosBefore.y) * scale;
         
-        drawGraph();
+        requestFrame();
+        scheduleViewport();
     }
 }, { passive: false });
 
+// Phím F: bật/tắt FPS và thời gian vẽ khung
+document.addEventListener('keydown', (e) => {
+    const tag = e.target.tagName;
+    if ((e.key === 'f' || e.key === 'F') && !e.ctrlKey && !e.metaKey && !e.altKey &&
+        tag !== 'INPUT' && tag !== 'TEXTAREA' && tag !== 'SELECT') {
+        showFps = !showFps;
+        frameTimes = [];
+        frameStamps = [];
+        requestFrame();
+    }
+});
+
 // Vô hiệu hóa context menu khi click phải
 canvas.addEventListener('contextmenu', (e) => {
     e.preventDefault();
@@ -937,6 +2043,7 @@ document.getElementById('traversalStart').addEventListener('keypress', (e) => {
 async function findShortestPath() {
     const source = document.getElementById('sourceNode').value.trim();
     const target = document.getElementById('targetNode').value.trim();
+    const algorithm = document.getElementById('pathAlgorithm').value;
     const resultDiv = document.getElementById('pathResult');
     const resultText = resultDiv.querySelector('p');
     
@@ -952,7 +2059,7 @@ async function findShortestPath() {
         const response = await fetch('/api/shortest_path', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ source, target })
+            body: JSON.stringify({ source, target, algorithm })
         });
         
         const result = await response.json();
@@ -969,7 +2076,8 @@ async function findShortestPath() {
             resultText.style.color = '#155724';
             resultText.innerHTML = `
                 <strong>✅ ${result.message}</strong><br>
-                <small>Độ dài: ${result.distance}</small>
+                <small>Độ dài: ${result.distance}</small><br>
+                <small>Số đỉnh đã duyệt: ${result.settled !== undefined ? result.settled : '-'}${result.cached ? ' (dùng cache)' : ''}</small>
             `;
             
             showNotification('✅ Đã tìm thấy đường đi ngắn nhất!', 'success');
@@ -995,10 +2103,7 @@ async function findShortestPath() {
 
 // Dừng animation duyệt
 function stopTraversalAnimation() {
-    if (animationInterval) {
-        clearInterval(animationInterval);
-        animationInterval = null;
-    }
+    animation = null;
     traversalOrder = [];
     animationIndex = 0;
 }
@@ -1010,6 +2115,7 @@ function clearAllHighlights() {
     mstEdges = [];
     eulerianEdges = [];
     flowEdges = [];
+    oddCycle = [];
     stopTraversalAnimation();
 }
 
@@ -1040,17 +2146,7 @@ async function runBFS() {
         if (result.success) {
             // Bắt đầu animation
             traversalOrder = result.order;
-            animationIndex = 0;
-            
-            animationInterval = setInterval(() => {
-                animationIndex++;
-                drawGraph();
-                
-                if (animationIndex >= traversalOrder.length) {
-                    clearInterval(animationInterval);
-                    animationInterval = null;
-                }
-            }, 500); // 500ms mỗi bước
+            startAnimation(traversalOrder.length, 500); // 500ms mỗi bước
             
             // Hiển thị kết quả
             resultDiv.style.display = 'block';
@@ -1102,17 +2198,7 @@ async function runDFS() {
         if (result.success) {
             // Bắt đầu animation
             traversalOrder = result.order;
-            animationIndex = 0;
-            
-            animationInterval = setInterval(() => {
-                animationIndex++;
-                drawGraph();
-                
-                if (animationIndex >= traversalOrder.length) {
-                    clearInterval(animationInterval);
-                    animationInterval = null;
-                }
-            }, 500); // 500ms mỗi bước
+            startAnimation(traversalOrder.length, 500); // 500ms mỗi bước
             
             // Hiển thị kết quả
             resultDiv.style.display = 'block';
@@ -1164,8 +2250,9 @@ async function checkBipartite() {
                 
                 showNotification('✅ Đây là đồ thị 2 phía!', 'success');
             } else {
-                // Xóa highlight
+                // Highlight chu trình lẻ (bằng chứng) có sẵn trong kết quả
                 bipartiteColors = {};
+                oddCycle = result.odd_cycle || [];
                 drawGraph();
                 
                 // Hiển thị kết quả
@@ -1244,7 +2331,7 @@ async function showRepresentations() {
         
         // 3. Danh sách cạnh
         let edgeHTML = '<div style="font-family: monospace; line-height: 1.8;">';
-        edgeHTML += `<div style="margin-bottom: 10px;"><strong>Tổng số cạnh:</strong> ${edgeList.length}</div>`;
+        edgeHTML += `<div style="margin-bottom: 10px;"><strong>Tổng số cạnh:</strong> ${result.total_edges}</div>`;
         edgeHTML += '<table style="border-collapse: collapse; width: 100%;">';
         edgeHTML += `<tr>
             <th style="border: 1px solid #ddd; padding: 8px; background: #667eea; color: white;">STT</th>
@@ -1275,6 +2362,11 @@ async function showRepresentations() {
     }
 }
 
+// Đồ thị không liên thông thì lấy rừng khung nhỏ nhất
+function mstQuery() {
+    return graphData.stats && !graphData.stats.is_connected ? '?forest=1' : '';
+}
+
 // Thuật toán Prim - Cây khung nhỏ nhất
 async function runPrim() {
     const resultDiv = document.getElementById('algorithmResult');
@@ -1283,7 +2375,7 @@ async function runPrim() {
     clearAllHighlights();
     
     try {
-        const response = await fetch('/api/prim_mst');
+        const response = await fetch('/api/prim_mst' + mstQuery());
         const result = await response.json();
         
         if (result.success) {
@@ -1320,7 +2412,7 @@ async function runKruskal() {
     clearAllHighlights();
     
     try {
-        const response = await fetch('/api/kruskal_mst');
+        const response = await fetch('/api/kruskal_mst' + mstQuery());
         const result = await response.json();
         
         if (result.success) {
@@ -1349,39 +2441,44 @@ async function runKruskal() {
     }
 }
 
-// Thuật toán Fleury - Đường đi Euler
-async function runFleury() {
+// Chế độ gọn (đồ thị lớn) chỉ trả về dãy đỉnh, tự dựng lại danh sách cạnh
+function eulerEdgesFromPath(path) {
+    const edges = [];
+    for (let i = 1; i < path.length; i++) {
+        edges.push({ source: path[i - 1], target: path[i] });
+    }
+    return edges;
+}
+
+function eulerSummary(result) {
+    const kind = result.is_circuit ? 'Chu trình' : 'Đường đi';
+    return `${kind} Euler: ${result.num_edges} cạnh, bắt đầu từ ${result.path[0]}`;
+}
+
+// Thuật toán Hierholzer - Đường đi Euler
+async function runEulerianPath() {
     const resultDiv = document.getElementById('algorithmResult');
     const resultText = resultDiv.querySelector('p');
     
     clearAllHighlights();
     
     try {
-        const response = await fetch('/api/eulerian_path');
-        const result = await response.json();
+        const result = await runAlgorithm('Đang tìm đường đi Euler',
+            () => fetch('/api/eulerian_path'));
         
         if (result.success) {
-            eulerianEdges = result.edges;
-            animationIndex = 0;
+            eulerianEdges = result.edges || eulerEdgesFromPath(result.path);
             
             // Animation từng cạnh
-            animationInterval = setInterval(() => {
-                animationIndex++;
-                drawGraph();
-                
-                if (animationIndex >= eulerianEdges.length) {
-                    clearInterval(animationInterval);
-                    animationInterval = null;
-                }
-            }, 600);
+            startAnimation(eulerianEdges.length, 600);
             
             resultDiv.style.display = 'block';
             resultDiv.style.background = '#f3d7f5';
             resultDiv.style.borderLeft = '4px solid #e64980';
             resultText.style.color = '#721c24';
-            resultText.innerHTML = `<strong>🔄 ${result.message}</strong>`;
+            resultText.innerHTML = `<strong>🔄 ${result.message || eulerSummary(result)}</strong>`;
             
-            showNotification('✅ Đã tìm đường đi Euler (Fleury)!', 'success');
+            showNotification('✅ Đã tìm đường đi Euler (Hierholzer)!', 'success');
         } else {
             resultDiv.style.display = 'block';
             resultDiv.style.background = '#f8d7da';
@@ -1392,7 +2489,7 @@ async function runFleury() {
             showNotification('❌ ' + result.message, 'error');
         }
     } catch (error) {
-        console.error('Lỗi khi thực hiện Fleury:', error);
+        console.error('Lỗi khi tìm đường đi Euler:', error);
         showNotification('❌ Có lỗi xảy ra', 'error');
     }
 }
@@ -1405,29 +2502,20 @@ async function runHierholzer() {
     clearAllHighlights();
     
     try {
-        const response = await fetch('/api/hierholzer');
-        const result = await response.json();
+        const result = await runAlgorithm('Đang tìm chu trình Euler',
+            () => fetch('/api/hierholzer'));
         
         if (result.success) {
-            eulerianEdges = result.edges;
-            animationIndex = 0;
+            eulerianEdges = result.edges || eulerEdgesFromPath(result.path);
             
             // Animation từng cạnh
-            animationInterval = setInterval(() => {
-                animationIndex++;
-                drawGraph();
-                
-                if (animationIndex >= eulerianEdges.length) {
-                    clearInterval(animationInterval);
-                    animationInterval = null;
-                }
-            }, 600);
+            startAnimation(eulerianEdges.length, 600);
             
             resultDiv.style.display = 'block';
             resultDiv.style.background = '#f3d7f5';
             resultDiv.style.borderLeft = '4px solid #e64980';
             resultText.style.color = '#721c24';
-            resultText.innerHTML = `<strong>🔄 ${result.message}</strong>`;
+            resultText.innerHTML = `<strong>🔄 ${result.message || eulerSummary(result)}</strong>`;
             
             showNotification('✅ Đã tìm chu trình Euler (Hierholzer)!', 'success');
         } else {
@@ -1449,6 +2537,8 @@ async function runHierholzer() {
 async function runFordFulkerson() {
     const source = document.getElementById('flowSource').value.trim();
     const sink = document.getElementById('flowSink').value.trim();
+    const selected = document.getElementById('flowAlgorithm').value;
+    const params = selected === 'compare' ? { source, sink, compare: true } : { source, sink, algorithm: selected };
     const resultDiv = document.getElementById('algorithmResult');
     const resultText = resultDiv.querySelector('p');
     
@@ -1460,13 +2550,12 @@ async function runFordFulkerson() {
     }
     
     try {
-        const response = await fetch('/api/ford_fulkerson', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ source, sink })
-        });
-        
-        const result = await response.json();
+        const result = await runAlgorithm('Đang tính luồng cực đại',
+            () => fetch('/api/ford_fulkerson', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify(params)
+            }));
         
         if (result.success) {
             flowEdges = result.flow_edges;
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+os.environ.setdefault('WORKSPACE_DB', os.path.join(tempfile.mkdtemp(), 'workspaces.db'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app
+
+
+@pytest.fixture
+def workspace_id():
+
+    return uuid.uuid4().hex
+
+
+@pytest.fixture
+def make_client():
+
+    def make(workspace_id=None):
+
+        client = app.app.test_client()
+        client.set_cookie(app.WORKSPACE_COOKIE, workspace_id or uuid.uuid4().hex)
+        return client
+
+    return make
+
+
+@pytest.fixture
+def client(make_client, workspace_id):
+
+    return make_client(workspace_id)
+
+
+@pytest.fixture
+def load_graph(client):
+
+    def load(nodes, edges, directed=False):
+
+        nodes = [node if isinstance(node, dict) else {'id': node} for node in nodes]
+        edges = [edge if isinstance(edge, dict) else dict(zip(('source', 'target', 'weight'), edge)) for edge in edges]
+        result = client.post('/api/import_graph', json={'nodes': nodes, 'edges': edges, 'is_directed': directed})
+        assert result.get_json()['success'] is True
+        return result.get_json()
+
+    return load
+
+
+@pytest.fixture
+def stored():
+
+    def load(workspace_id):
+
+        workspace = app._new_workspace()
+        app._sync_workspace(workspace_id, workspace)
+        return workspace
+
+    return load
@@ -0,0 +1,59 @@
+import random
+
+import networkx as nx
+
+import app
+
+
+def _expected(workspace, node_id):
+
+    positions = workspace['positions']
+    return sorted(workspace['graph'].neighbors(node_id), key=lambda n: app._position_key(positions, n))
+
+
+def test_index_stays_sorted_under_incremental_updates():
+
+    rng = random.Random(11)
+    for directed in (False, True):
+        workspace = app._new_workspace()
+        workspace['graph'] = nx.DiGraph() if directed else nx.Graph()
+        workspace['is_directed'] = directed
+        for i in range(60):
+            app._add_node(workspace, f'n{i}', rng.randint(0, 5) * 10, rng.randint(0, 5) * 10)
+        index = app._adjacency_index(workspace)
+
+        for step in range(4000):
+            nodes = list(workspace['graph'])
+            choice = rng.random()
+            if choice < 0.35:
+                app._set_edge(workspace, rng.choice(nodes), rng.choice(nodes), rng.randint(1, 9))
+            elif choice < 0.55 and workspace['graph'].number_of_edges():
+                u, v = rng.choice(list(workspace['graph'].edges()))
+                app._remove_edge(workspace, u, v)
+            elif choice < 0.9:
+                app._set_position(workspace, rng.choice(nodes), rng.randint(0, 5) * 10, rng.randint(0, 5) * 10)
+            elif choice < 0.95:
+                app._remove_node(workspace, rng.choice(nodes))
+            else:
+                app._add_node(workspace, f'm{step}', rng.randint(0, 5) * 10, rng.randint(0, 5) * 10)
+
+            if step % 100 == 0:
+                for node_id in workspace['graph']:
+                    assert index.neighbors(node_id) == _expected(workspace, node_id)
+
+        assert app._adjacency_index(workspace) is index
+        rebuilt = app.AdjacencyIndex(workspace['graph'], workspace['positions'])
+        assert all(rebuilt.neighbors(node_id) == index.neighbors(node_id) for node_id in workspace['graph'])
+
+
+def test_traversal_follows_positions(client, load_graph):
+
+    load_graph([{'id': 'S', 'x': 0, 'y': 0}, {'id': 'A', 'x': 10, 'y': 50},
+                {'id': 'B', 'x': 50, 'y': 10}, {'id': 'C', 'x': 0, 'y': 10}],
+               [('S', 'A'), ('S', 'B'), ('S', 'C')])
+    assert client.post('/api/bfs', json={'start_node': 'S'}).get_json()['order'] == ['S', 'C', 'B', 'A']
+
+    client.post('/api/update_position', json={'node_id': 'A', 'x': 10, 'y': 5})
+    assert client.post('/api/bfs', json={'start_node': 'S'}).get_json()['order'] == ['S', 'A', 'C', 'B']
+    client.post('/api/update_positions', json={'updates': [{'node_id': 'B', 'x': -5, 'y': 10}]})
+    assert client.post('/api/dfs', json={'start_node': 'S'}).get_json()['order'] == ['S', 'A', 'B', 'C']
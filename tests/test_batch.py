@@ -0,0 +1,96 @@
+import app
+
+
+def _graph(client):
+
+    graph = client.get('/api/get_graph').get_json()
+    return sorted(node['id'] for node in graph['nodes']), sorted((e['source'], e['target'], e['weight']) for e in graph['edges'])
+
+
+def test_atomic_batch_rolls_back_on_failure(client, workspace_id, load_graph):
+
+    load_graph(['A', 'B', 'C'], [('A', 'B', 2)])
+    before = _graph(client)
+    version = app.workspace_store.get(workspace_id)['version']
+
+    result = client.post('/api/batch', json={'operations': [
+        {'op': 'add_node', 'node_id': 'D'},
+        {'op': 'add_edge', 'node1': 'D', 'node2': 'A', 'weight': 5},
+        {'op': 'remove_node', 'node_id': 'B'},
+        {'op': 'update_position', 'node_id': 'C', 'x': 1, 'y': 2},
+        {'op': 'remove_edge', 'node1': 'A', 'node2': 'C'}
+    ]}).get_json()
+    assert result['success'] is False
+    assert result['applied'] == 0
+    assert '#5' in result['message']
+    assert _graph(client) == before
+    assert app.workspace_store.get(workspace_id)['version'] == version
+    stats = client.get('/api/get_graph').get_json()['stats']
+    assert stats['num_nodes'] == 3 and stats['num_edges'] == 1
+
+
+def test_batch_applies_all_operations_in_one_version(client, workspace_id, load_graph, stored):
+
+    load_graph(['A', 'B'], [])
+    version = app.workspace_store.get(workspace_id)['version']
+
+    result = client.post('/api/batch', json={'operations': [
+        {'op': 'add_node', 'node_id': 'C', 'x': 10, 'y': 20},
+        {'op': 'add_edge', 'node1': 'A', 'node2': 'C', 'weight': 3},
+        {'op': 'add_edge', 'node1': 'B', 'node2': 'C'},
+        {'op': 'remove_node', 'node_id': 'B'}
+    ]}).get_json()
+    assert result['success'] is True
+    assert result['applied'] == 4
+    assert result['delta']['version'] == version + 1
+    assert result['delta']['removed_nodes'] == ['B']
+    assert _graph(client) == (['A', 'C'], [('A', 'C', 3)])
+    assert app._serialize_graph(stored(workspace_id)) == app._serialize_graph(app.workspace_store.get(workspace_id))
+
+
+def test_non_atomic_batch_reports_each_operation(client, load_graph):
+
+    load_graph(['A'], [])
+    result = client.post('/api/batch', json={'atomic': False, 'operations': [
+        {'op': 'add_node', 'node_id': 'B'},
+        {'op': 'explode'},
+        'not an object',
+        {'op': 'add_edge', 'node1': 'A', 'node2': 'B'}
+    ]}).get_json()
+    assert result['success'] is True
+    assert result['applied'] == 2
+    assert [entry['success'] for entry in result['results']] == [True, False, False, True]
+    assert _graph(client) == (['A', 'B'], [('A', 'B', 1)])
+
+
+def test_batch_rejects_invalid_or_oversized_requests(client, monkeypatch):
+
+    assert client.post('/api/batch', json={'operations': []}).get_json()['success'] is False
+    assert client.post('/api/batch', json={'operations': {'op': 'add_node'}}).get_json()['success'] is False
+    monkeypatch.setattr(app, 'BATCH_MAX_OPERATIONS', 2)
+    result = client.post('/api/batch', json={'operations': [{'op': 'add_node', 'node_id': str(i)} for i in range(3)]})
+    assert result.get_json()['success'] is False
+    assert _graph(client) == ([], [])
+
+
+def test_batch_without_applied_operations_is_not_committed(client, workspace_id):
+
+    client.post('/api/add_node', json={'node_id': 'A'})
+    version = app.workspace_store.get(workspace_id)['version']
+
+    result = client.post('/api/batch', json={'atomic': False, 'operations': [
+        {'op': 'add_node', 'node_id': 'A'},
+        {'op': 'remove_node', 'node_id': 'missing'}
+    ]}).get_json()
+    assert result['success'] is False
+    assert result['applied'] == 0
+    assert [entry['success'] for entry in result['results']] == [False, False]
+    assert app.workspace_store.get(workspace_id)['version'] == version
+
+    result = client.post('/api/batch', json={'atomic': False, 'operations': [
+        {'op': 'add_node', 'node_id': 'A'},
+        {'op': 'add_node', 'node_id': 'B'}
+    ]}).get_json()
+    assert result['success'] is True
+    assert result['applied'] == 1
+    assert app.workspace_store.get(workspace_id)['version'] == version + 1
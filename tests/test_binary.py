@@ -0,0 +1,78 @@
+import networkx as nx
+import pytest
+
+import app
+
+
+def _workspace(directed, weights):
+
+    workspace = app._new_workspace()
+    graph = nx.DiGraph() if directed else nx.Graph()
+    positions = {}
+    for i, weight in enumerate(weights):
+        graph.add_edge(f'n{i}', f'n{i + 1}', weight=weight)
+    for i, node_id in enumerate(graph):
+        positions[node_id] = {'x': 400.123456789 + i / 3, 'y': -1e-9 * i + 300.1}
+    workspace.update(graph=graph, positions=positions, is_directed=directed)
+    return workspace
+
+
+def _round_trip(workspace, compact=False):
+
+    loaded = app._new_workspace()
+    app._load_graph_binary(loaded, app._serialize_graph_binary(workspace, compact=compact))
+    return loaded
+
+
+def _weights(workspace):
+
+    return [(u, v, weight, type(weight)) for u, v, weight in workspace['graph'].edges(data='weight')]
+
+
+def test_snapshot_is_lossless():
+
+    for directed in (False, True):
+        for weights in ([1, 1, 1], [1, 5, -300], [2 ** 40, 3], [1.0, 2.0], [1, 2.5, 3, 1.0], [0.1, 2 ** 40, 7]):
+            workspace = _workspace(directed, weights)
+            loaded = _round_trip(workspace)
+            assert loaded['is_directed'] == directed
+            assert loaded['positions'] == workspace['positions']
+            assert _weights(loaded) == _weights(workspace)
+
+
+def test_compact_export_uses_float32_coordinates():
+
+    workspace = _workspace(False, [1, 2.5])
+    loaded = _round_trip(workspace, compact=True)
+    assert loaded['positions'] != workspace['positions']
+    for node_id, pos in workspace['positions'].items():
+        assert abs(loaded['positions'][node_id]['x'] - pos['x']) < 1e-3
+    assert _weights(loaded) == _weights(workspace)
+    assert len(app._serialize_graph_binary(workspace, compact=True)) < len(app._serialize_graph_binary(workspace))
+
+
+def test_binary_export_and_import_endpoints(client, make_client, load_graph):
+
+    load_graph([{'id': f'n{i}', 'x': i * 1.5, 'y': -i / 3} for i in range(300)],
+               [(f'n{i}', f'n{(i * 7) % 300}', i % 5 + 1) for i in range(1, 300)], directed=True)
+    response = client.get('/api/export_graph?format=binary')
+    assert response.mimetype == 'application/octet-stream'
+    assert response.data[:4] == app.GRAPH_BINARY_MAGIC
+
+    other = make_client()
+    result = other.post('/api/import_graph', data=response.data, content_type='application/octet-stream')
+    assert result.get_json()['success'] is True
+    assert other.get('/api/export_graph').get_json() == client.get('/api/export_graph').get_json()
+
+    compact = client.get('/api/export_graph?format=binary&precision=float32').data
+    assert len(compact) < len(response.data)
+    assert other.post('/api/import_graph', data=b'junk', content_type='application/octet-stream').get_json()['success'] is False
+
+
+def test_binary_rejects_corrupt_payloads():
+
+    workspace = _workspace(False, [1, 2, 3])
+    payload = app._serialize_graph_binary(workspace)
+    for corrupt in (payload[:10], b'XXXX' + payload[4:], payload[:-1], payload + b'\0'):
+        with pytest.raises(ValueError):
+            app._load_graph_binary(app._new_workspace(), corrupt)
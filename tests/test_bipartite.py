@@ -0,0 +1,76 @@
+import random
+
+import networkx as nx
+
+import app
+
+
+def _shortest_odd_cycle_length(graph):
+
+    best = None
+    for source in graph:
+        depth = nx.single_source_shortest_path_length(graph, source)
+        for u, v in graph.edges():
+            if u in depth and depth[u] == depth.get(v):
+                length = 2 * depth[u] + 1
+                best = length if best is None else min(best, length)
+    return best
+
+
+def _assert_cycle(graph, cycle):
+
+    assert len(cycle) % 2 == 1 and len(set(cycle)) == len(cycle)
+    assert all(graph.has_edge(u, v) for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+
+
+def _assert_partition(graph, result):
+
+    set1, set2 = set(result['set1']), set(result['set2'])
+    assert set1 | set2 == set(graph) and not set1 & set2
+    assert all((u in set1) != (v in set1) for u, v in graph.edges())
+
+
+def test_partition_or_shortest_odd_cycle(client, load_graph):
+
+    rng = random.Random(25)
+    for _ in range(30):
+        graph = nx.gnm_random_graph(rng.randint(4, 14), rng.randint(3, 20), seed=rng.randint(0, 10 ** 6))
+        graph = nx.relabel_nodes(graph, {node: f'n{node}' for node in graph})
+        load_graph(list(graph), list(graph.edges()))
+
+        result = client.get('/api/check_bipartite').get_json()
+        assert result['success'] is True
+        assert result['is_bipartite'] is nx.is_bipartite(graph)
+        if result['is_bipartite']:
+            _assert_partition(graph, result)
+        else:
+            _assert_cycle(graph, result['odd_cycle'])
+            assert result['shortest'] is True
+            assert result['cycle_length'] == len(result['odd_cycle']) == _shortest_odd_cycle_length(graph)
+
+    load_graph(['A', 'B', 'C'], [('A', 'B'), ('B', 'C'), ('C', 'A')], directed=True)
+    result = client.get('/api/check_bipartite').get_json()
+    assert result['is_bipartite'] is False and sorted(result['odd_cycle']) == ['A', 'B', 'C']
+
+
+def test_parallel_coloring_matches_serial(client, load_graph, monkeypatch):
+
+    graph = nx.disjoint_union_all([nx.cycle_graph(2 * size) for size in range(2, 30)])
+    graph = nx.relabel_nodes(graph, {node: f'n{node}' for node in graph})
+    load_graph(list(graph), list(graph.edges()))
+    monkeypatch.setattr(app, 'BIPARTITE_PARALLEL_MIN_EDGES', 0)
+    monkeypatch.setattr(app, 'COMPONENT_WORKERS', 2)
+    pools = []
+    component_pool = app._component_pool
+    monkeypatch.setattr(app, '_component_pool', lambda: pools.append(1) or component_pool())
+
+    result = client.get('/api/check_bipartite').get_json()
+    assert result['is_bipartite'] is True and pools
+    _assert_partition(graph, result)
+
+    graph.add_edge('n0', 'n2')
+    load_graph(list(graph), list(graph.edges()))
+    result = client.get('/api/check_bipartite').get_json()
+    assert result['is_bipartite'] is False
+    _assert_cycle(graph, result['odd_cycle'])
+    assert result['cycle_length'] == _shortest_odd_cycle_length(graph) == 3
@@ -0,0 +1,99 @@
+import app
+
+
+def _stats():
+
+    return app.result_cache.stats()
+
+
+def test_repeated_requests_hit_the_cache(client, load_graph):
+
+    load_graph(['A', 'B', 'C'], [('A', 'B', 1), ('B', 'C', 2)])
+    first = client.get('/api/kruskal_mst')
+    assert first.get_json()['success'] is True
+    etag = first.headers['ETag']
+    before = _stats()
+
+    second = client.get('/api/kruskal_mst')
+    assert second.get_data() == first.get_data()
+    assert second.headers['ETag'] == etag
+    assert _stats()['hits'] == before['hits'] + 1
+
+    third = client.get('/api/kruskal_mst', headers={'If-None-Match': etag})
+    assert third.status_code == 304
+    assert third.headers['ETag'] == etag
+    assert _stats()['not_modified'] == before['not_modified'] + 1
+
+    client.post('/api/add_edge', json={'node1': 'A', 'node2': 'C', 'weight': 1})
+    fourth = client.get('/api/kruskal_mst', headers={'If-None-Match': etag})
+    assert fourth.status_code == 200
+    assert fourth.headers['ETag'] != etag
+    assert client.get('/api/kruskal_mst?forest=1').headers['ETag'] not in (etag, fourth.headers['ETag'])
+
+
+def test_failed_results_are_not_cached(client, load_graph, monkeypatch):
+
+    empty = client.get('/api/check_bipartite')
+    assert empty.get_json()['success'] is False
+    assert 'ETag' not in empty.headers
+
+    load_graph(['A', 'B'], [('A', 'B')])
+    coloring = app._bipartite_coloring
+    monkeypatch.setattr(app, '_bipartite_coloring', lambda graph: 1 / 0)
+    failed = client.get('/api/check_bipartite')
+    assert failed.get_json()['success'] is False
+    assert 'ETag' not in failed.headers
+
+    monkeypatch.setattr(app, '_bipartite_coloring', coloring)
+    result = client.get('/api/check_bipartite')
+    assert result.get_json()['success'] is True
+    assert client.get('/api/check_bipartite', headers={'If-None-Match': result.headers['ETag']}).status_code == 304
+
+
+def test_failed_stream_is_dropped(client, load_graph, monkeypatch):
+
+    load_graph(['A', 'B', 'C'], [('A', 'B'), ('B', 'C')])
+    dense_rows = app._dense_rows
+
+    def failing(matrix, start, stop):
+
+        yield from dense_rows(matrix, start, start + 1)
+        raise RuntimeError('boom')
+
+    monkeypatch.setattr(app, '_dense_rows', failing)
+    response = client.get('/api/get_representations')
+    assert 'ETag' not in response.headers
+    assert response.get_json()['success'] is False
+
+    monkeypatch.setattr(app, '_dense_rows', dense_rows)
+    response = client.get('/api/get_representations')
+    assert response.get_json()['adjacency_matrix'] == [[0, 1, 0], [1, 0, 1], [0, 1, 0]]
+    cached = client.get('/api/get_representations')
+    assert cached.headers['ETag']
+    assert cached.get_data() == response.get_data()
+
+
+def test_interrupted_stream_discards_entry():
+
+    workspace = app._new_workspace()
+    key = ('interrupted',)
+    app.result_cache.put(key, b'stale', 'application/json')
+    stream = app._capture_stream(iter([b'{', b'}']), key, 'application/json', workspace, 0)
+    next(stream)
+    stream.close()
+    assert app.result_cache.get(key) is None
+
+
+def test_cache_is_bounded():
+
+    cache = app.ResultCache(max_entries=2, max_bytes=10, max_entry_bytes=6)
+    cache.put('a', b'1234', 'text/plain')
+    cache.put('b', b'12', 'text/plain')
+    cache.put('c', b'12345', 'text/plain')
+    assert cache.get('a') is None and cache.get('b') is not None
+    cache.put('d', b'1234567', 'text/plain')
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['bytes'] == 7
+    assert stats['evictions'] == 1 and stats['oversized'] == 1
+    cache.discard('b')
+    assert cache.stats()['bytes'] == 5
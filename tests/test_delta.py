@@ -0,0 +1,63 @@
+import app
+
+
+def _delta(client, since):
+
+    return client.get(f'/api/get_graph_delta?since={since}').get_json()
+
+
+def test_delta_returns_only_changed_elements(client, load_graph):
+
+    load_graph([{'id': n, 'x': i, 'y': i} for i, n in enumerate('ABCD')], [('A', 'B', 1), ('B', 'C', 2)])
+    version = _delta(client, 0)['version']
+
+    client.post('/api/update_position', json={'node_id': 'A', 'x': 50, 'y': 60})
+    client.post('/api/add_edge', json={'node1': 'C', 'node2': 'D', 'weight': 4})
+    client.post('/api/remove_edge', json={'node1': 'A', 'node2': 'B'})
+    client.post('/api/remove_node', json={'node_id': 'D'})
+
+    delta = _delta(client, version)
+    assert delta['full'] is False
+    assert delta['version'] == version + 4
+    assert delta['nodes'] == [{'id': 'A', 'x': 50, 'y': 60}]
+    assert delta['removed_nodes'] == ['D']
+    assert delta['edges'] == []
+    assert sorted(tuple(sorted(edge.values())) for edge in delta['removed_edges']) == [('A', 'B'), ('C', 'D')]
+    assert delta['stats']['num_nodes'] == 3 and delta['stats']['num_edges'] == 1
+
+    delta = _delta(client, delta['version'])
+    assert delta['full'] is False
+    assert delta['nodes'] == delta['edges'] == delta['removed_nodes'] == []
+
+
+def test_delta_falls_back_to_full_graph(client, load_graph, monkeypatch):
+
+    load_graph(['A', 'B'], [('A', 'B')])
+    version = _delta(client, 0)['version']
+
+    assert _delta(client, version - 1)['full'] is True
+    assert _delta(client, version + 5)['full'] is True
+    assert client.get('/api/get_graph_delta').get_json()['full'] is True
+
+    client.post('/api/add_node', json={'node_id': 'C'})
+    client.post('/api/toggle_directed', json={'is_directed': True})
+    delta = _delta(client, version)
+    assert delta['full'] is True
+    assert delta['is_directed'] is True
+    assert sorted(node['id'] for node in delta['nodes']) == ['A', 'B', 'C']
+
+    monkeypatch.setattr(app, 'CHANGELOG_LIMIT', 2)
+    version = delta['version']
+    for i in range(4):
+        client.post('/api/update_position', json={'node_id': 'A', 'x': i, 'y': i})
+    assert _delta(client, version)['full'] is True
+    assert _delta(client, version + 3)['full'] is False
+
+
+def test_mutations_bump_version_only_on_success(client):
+
+    version = client.get('/api/get_graph').get_json()['version']
+    client.post('/api/add_node', json={'node_id': 'A'})
+    client.post('/api/add_node', json={'node_id': 'A'})
+    client.post('/api/remove_edge', json={'node1': 'A', 'node2': 'B'})
+    assert client.get('/api/get_graph').get_json()['version'] == version + 1
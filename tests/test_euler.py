@@ -0,0 +1,66 @@
+from collections import Counter
+
+import networkx as nx
+
+import app
+
+
+def _edge_multiset(edges, directed):
+
+    return Counter(edge if directed else frozenset(edge) for edge in edges)
+
+
+def _load(load_graph, graph):
+
+    load_graph(sorted(graph), list(graph.edges()), directed=graph.is_directed())
+
+
+def test_paths_use_every_edge_once(client, load_graph):
+
+    for directed in (False, True):
+        graph = nx.DiGraph([('A', 'B'), ('B', 'C'), ('C', 'A'), ('A', 'D')]) if directed else \
+            nx.Graph([('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'D'), ('D', 'E'), ('E', 'C'), ('A', 'F')])
+        _load(load_graph, graph)
+
+        result = client.get('/api/eulerian_path').get_json()
+        assert result['success'] is True and result['is_circuit'] is False
+        assert result['algorithm'] == 'hierholzer'
+        path = result['path']
+        assert _edge_multiset(zip(path, path[1:]), directed) == _edge_multiset(graph.edges(), directed)
+        assert [(edge['source'], edge['target']) for edge in result['edges']] == list(zip(path, path[1:]))
+        assert result['message'].startswith('Đường đi Euler (Hierholzer): ')
+
+        compact = client.get('/api/eulerian_path?compact=1').get_json()
+        assert set(compact) == {'success', 'is_circuit', 'algorithm', 'num_edges', 'path'}
+        assert compact['path'] == path and compact['num_edges'] == graph.number_of_edges()
+
+        assert client.get('/api/hierholzer').get_json()['success'] is False
+
+
+def test_circuits_and_failures(client, load_graph):
+
+    graph = nx.cycle_graph(['A', 'B', 'C', 'D'])
+    graph.add_edges_from([('A', 'C'), ('C', 'E'), ('E', 'A')])
+    _load(load_graph, graph)
+    for endpoint in ('/api/eulerian_path', '/api/hierholzer'):
+        result = client.get(endpoint).get_json()
+        assert result['is_circuit'] is True and result['algorithm'] == 'hierholzer'
+        path = result['path']
+        assert path[0] == path[-1]
+        assert _edge_multiset(zip(path, path[1:]), False) == _edge_multiset(graph.edges(), False)
+
+    load_graph(['A', 'B', 'C', 'D'], [('A', 'B'), ('A', 'C'), ('A', 'D')])
+    assert client.get('/api/eulerian_path').get_json()['message'] == 'Đồ thị không có đường đi Euler'
+    load_graph(['A', 'B', 'C', 'D'], [('A', 'B'), ('C', 'D')])
+    assert client.get('/api/eulerian_path').get_json()['success'] is False
+
+
+def test_job_result_matches_endpoint(client, load_graph):
+
+    graph = nx.DiGraph([('A', 'B'), ('B', 'C'), ('C', 'A'), ('C', 'D'), ('D', 'C')])
+    _load(load_graph, graph)
+    workspace = app._new_workspace()
+    workspace['graph'] = graph
+    workspace['is_directed'] = True
+    result = app._compute_hierholzer(workspace, True, lambda fraction, message=None: None)
+    assert result == client.get('/api/hierholzer?compact=1').get_json()
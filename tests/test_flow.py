@@ -0,0 +1,75 @@
+import random
+
+import networkx as nx
+
+import app
+
+
+def _flow(client, **data):
+
+    return client.post('/api/ford_fulkerson', json=data).get_json()
+
+
+def test_max_flow_reports_cut_and_reuses_flow(client, load_graph):
+
+    load_graph(['S', 'A', 'B', 'T', 'U'],
+               [('S', 'A', 3), ('S', 'B', 2), ('A', 'B', 1), ('A', 'T', 2), ('B', 'T', 3), ('B', 'U', 4)],
+               directed=True)
+    first = _flow(client, source='S', sink='T')
+    assert first['success'] is True
+    assert first['algorithm'] == 'incremental'
+    assert first['max_flow'] == 5 and first['min_cut']['capacity'] == 5
+    assert first['warm_start'] is False
+
+    second = _flow(client, source='S', sink='U')
+    assert second['max_flow'] == 3 and second['warm_start'] is True
+    client.post('/api/add_edge', json={'node1': 'B', 'node2': 'U', 'weight': 1})
+    assert _flow(client, source='S', sink='U')['max_flow'] == 1
+
+    compared = _flow(client, source='S', sink='T', compare=True)
+    assert sorted(entry['algorithm'] for entry in compared['timings']) == sorted(['incremental', *app.FLOW_ALGORITHMS])
+    assert all(entry['max_flow'] == 5 for entry in compared['timings'])
+    assert compared['warm_start'] is False
+    assert _flow(client, source='S', sink='T', algorithm='simplex')['success'] is False
+
+
+def test_warm_start_matches_networkx_under_edits():
+
+    rng = random.Random(5)
+    workspace = app._new_workspace()
+    workspace['graph'] = nx.DiGraph()
+    workspace['is_directed'] = True
+    for i in range(40):
+        app._add_node(workspace, f'n{i}', 0, 0)
+    for _ in range(160):
+        u, v = rng.sample(range(40), 2)
+        app._set_edge(workspace, f'n{u}', f'n{v}', rng.choice([1, 2, 3, 2.5]))
+    network = app._flow_network(workspace)
+
+    for step in range(200):
+        graph = workspace['graph']
+        choice = rng.random()
+        if choice < 0.3:
+            u, v = rng.choice(list(graph.edges()))
+            app._set_edge(workspace, u, v, rng.choice([0, 1, 4, 1.5]))
+        elif choice < 0.4:
+            u, v = rng.choice(list(graph.edges()))
+            app._remove_edge(workspace, u, v)
+        elif choice < 0.45 and graph.number_of_nodes() > 10:
+            app._remove_node(workspace, rng.choice(list(graph)))
+        elif choice < 0.6:
+            u, v = rng.sample(list(graph), 2)
+            app._set_edge(workspace, u, v, rng.randint(1, 9))
+
+        source, sink = rng.sample(list(graph), 2)
+        algorithm = app.FLOW_INCREMENTAL if step % 4 else rng.choice(list(app.FLOW_ALGORITHMS))
+        result = network.solve(source, sink, algorithm)
+        assert result['warm_start'] is (algorithm == app.FLOW_INCREMENTAL)
+        expected = nx.maximum_flow_value(graph, source, sink, capacity='weight')
+        assert abs(result['max_flow'] - expected) < 1e-9
+        assert abs(sum(edge['capacity'] for edge in result['min_cut']['edges']) - expected) < 1e-9
+
+        for node_id, neighbors in network.residual.adj.items():
+            assert all(attr['flow'] <= attr['capacity'] for attr in neighbors.values())
+            if node_id not in (source, sink):
+                assert abs(sum(attr['flow'] for attr in neighbors.values())) < 1e-9
@@ -0,0 +1,83 @@
+import json
+
+import app
+
+
+def _import(client, body, **args):
+
+    content_type = 'text/csv' if args.get('format') == 'csv' else 'application/x-ndjson'
+    response = client.post('/api/import_edges', query_string=args, data=body, content_type=content_type)
+    assert response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def _graph(client):
+
+    graph = client.get('/api/get_graph').get_json()
+    return graph['is_directed'], sorted((e['source'], e['target'], e['weight']) for e in graph['edges'])
+
+
+def test_ndjson_import_replaces_graph_and_reports_errors(client, load_graph, monkeypatch):
+
+    load_graph(['old'], [])
+    monkeypatch.setattr(app, 'IMPORT_BATCH_SIZE', 2)
+    monkeypatch.setattr(app, 'IMPORT_MAX_LINE_BYTES', 64)
+    body = '\n'.join([
+        '\ufeff{"source": "A", "target": "B", "weight": 2}',
+        '["B", "C"]',
+        '# comment',
+        '',
+        '[1, 2, 2.5]',
+        '{"source": "A"}',
+        'not json',
+        '["A", "C", "heavy"]',
+        '["C", "' + 'x' * 200 + '"]',
+        '{"source": "C", "target": "A", "weight": 4}'
+    ]).encode('utf-8') + b'\n["A", "\xff"]'
+
+    events = _import(client, body)
+    done = events[-1]
+    assert [event['type'] for event in events[:-1]] == ['progress', 'progress']
+    assert done['type'] == 'done' and done['success'] is True
+    assert done['edges'] == 4 and done['errors'] == 5 and done['nodes'] == 5
+    assert [sample['line'] for sample in done['error_samples']] == [6, 7, 8, 9, 11]
+    assert _graph(client) == (False, [('1', '2', 2.5), ('A', 'B', 2), ('A', 'C', 4), ('B', 'C', 1)])
+
+
+def test_csv_import_handles_header_quotes_and_direction(client):
+
+    body = 'source,target,weight\nA,B,3\n"C, Inc",A,\nB,A,7\nA,B,x\n'
+    done = _import(client, body, format='csv', directed='1')[-1]
+    assert done['success'] is True
+    assert done['edges'] == 3 and done['errors'] == 1
+    assert _graph(client) == (True, [('A', 'B', 3), ('B', 'A', 7), ('C, Inc', 'A', 1)])
+
+
+def test_import_without_valid_edges_keeps_graph(client, load_graph):
+
+    load_graph(['A', 'B'], [('A', 'B', 5)])
+    done = _import(client, 'bad\n# only comments\n', format='csv')[-1]
+    assert done['success'] is False
+    assert _graph(client) == (False, [('A', 'B', 5)])
+    response = client.post('/api/import_edges?mode=merge', data='')
+    assert response.get_json()['success'] is False
+
+
+def test_append_import_counts_existing_graph(monkeypatch, client, workspace_id, load_graph, stored):
+
+    monkeypatch.setattr(app, 'WORKSPACE_MAX_ELEMENTS', 20)
+    load_graph([f'a{i}' for i in range(6)], [(f'a{i}', f'a{i + 1}') for i in range(5)])
+
+    def append(lines):
+
+        response = client.post('/api/import_edges?format=csv&mode=append', data='\n'.join(lines),
+                               content_type='text/csv')
+        return json.loads(response.get_data(as_text=True).splitlines()[-1])
+
+    result = append([f'b{i},b{i + 1}' for i in range(5)])
+    assert result['success'] is False
+    assert stored(workspace_id)['graph'].number_of_nodes() == 6
+
+    result = append([f'a{i + 1},a{i}' for i in range(5)] + ['a0,b0', 'b0,b1'])
+    assert result['success'] is True
+    assert stored(workspace_id)['graph'].number_of_nodes() == 8
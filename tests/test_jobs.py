@@ -0,0 +1,127 @@
+import time
+import uuid
+
+import networkx as nx
+import pytest
+
+import app
+
+
+class _CancelAfter:
+
+    def __init__(self, calls):
+
+        self.calls = calls
+        self.fractions = []
+
+    def __call__(self, fraction, message=None, force=False):
+
+        self.fractions.append(fraction)
+        if len(self.fractions) >= self.calls:
+            raise app.JobCancelled()
+
+
+def test_hierholzer_checks_for_cancellation():
+
+    for graph in (nx.cycle_graph(200000), nx.cycle_graph(200000, create_using=nx.DiGraph)):
+        progress = _CancelAfter(2)
+        with pytest.raises(app.JobCancelled):
+            app._hierholzer_path(graph, 0, progress)
+        assert all(0 <= fraction < 1 for fraction in progress.fractions)
+
+        path = app._hierholzer_path(graph, 0, lambda fraction, message=None: None)
+        assert len(path) == graph.number_of_edges() + 1
+
+
+def _flow_grid(size):
+
+    workspace = app._new_workspace()
+    graph = nx.DiGraph()
+    for i in range(size):
+        for j in range(size):
+            if i + 1 < size:
+                graph.add_edge((i, j), (i + 1, j), weight=1 + (i * j) % 5)
+            if j + 1 < size:
+                graph.add_edge((i, j), (i, j + 1), weight=1 + (i + j) % 3)
+        graph.add_edge('s', (i, 0), weight=9)
+        graph.add_edge((i, size - 1), 't', weight=9)
+    workspace['graph'] = graph
+    workspace['is_directed'] = True
+    return workspace
+
+
+def test_max_flow_job_checks_for_cancellation():
+
+    workspace = _flow_grid(40)
+    params = {'source': 's', 'sink': 't', 'algorithm': 'preflow_push', 'compare': True}
+    with pytest.raises(app.JobCancelled):
+        app._compute_ford_fulkerson(workspace, params, _CancelAfter(3))
+
+    result = app._compute_ford_fulkerson(_flow_grid(40), params, lambda fraction, message=None: None)
+    assert result['algorithm'] == app.FLOW_INCREMENTAL and 'timings' not in result
+    assert result['max_flow'] == nx.maximum_flow_value(workspace['graph'], 's', 't', capacity='weight')
+
+
+def _queue_job(kind):
+
+    job_id = uuid.uuid4().hex
+    app._db().execute(
+        'INSERT INTO jobs (id, workspace_id, kind, status, progress, version, created_at) '
+        "VALUES (?, ?, ?, 'queued', 0, 0, ?)",
+        (job_id, uuid.uuid4().hex, kind, time.time())
+    )
+    return job_id
+
+
+def _job_row(job_id):
+
+    return app._db().execute('SELECT status, error FROM jobs WHERE id = ?', (job_id,)).fetchone()
+
+
+def test_expired_job_stops_itself(monkeypatch):
+
+    calls = []
+
+    def spin(workspace, params, progress):
+
+        while True:
+            calls.append(1)
+            progress(0, force=True)
+
+    monkeypatch.setitem(app.JOB_KINDS, 'spin', spin)
+    snapshot = app._serialize_graph_binary(app._new_workspace())
+
+    job_id = _queue_job('spin')
+    started = time.perf_counter()
+    app._run_job(job_id, 'spin', {}, snapshot, 0, time.time() + 0.3)
+    assert time.perf_counter() - started < 5
+    assert _job_row(job_id) == ('failed', app.JOB_TIMEOUT_ERROR)
+
+    calls.clear()
+    job_id = _queue_job('spin')
+    app._run_job(job_id, 'spin', {}, snapshot, 0, time.time() - 1)
+    assert _job_row(job_id) == ('failed', app.JOB_TIMEOUT_ERROR)
+    assert not calls
+
+
+def test_oversized_requests_become_jobs(client, load_graph, monkeypatch):
+
+    load_graph(['A', 'B', 'C'], [('A', 'B', 2), ('B', 'C', 1), ('C', 'A', 3)], directed=True)
+    inline = client.post('/api/ford_fulkerson', json={'source': 'A', 'sink': 'C'})
+    assert inline.status_code == 200 and inline.get_json()['max_flow'] == 1
+
+    monkeypatch.setattr(app, 'JOB_INLINE_MAX_ELEMENTS', 5)
+    euler = client.get('/api/eulerian_path')
+    assert euler.status_code == 202 and 'ETag' not in euler.headers
+
+    routed = client.post('/api/ford_fulkerson', json={'source': 'A', 'sink': 'C', 'algorithm': 'dinitz'})
+    assert routed.status_code == 202
+    assert routed.headers['Location'] == f'/api/jobs/{routed.get_json()["job_id"]}'
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        job = client.get(routed.headers['Location']).get_json()
+        if job['status'] not in app.JOB_ACTIVE:
+            break
+        time.sleep(0.1)
+    assert job['status'] == 'done'
+    assert job['result']['max_flow'] == 1 and job['result']['algorithm'] == app.FLOW_INCREMENTAL
@@ -0,0 +1,129 @@
+import json
+import time
+
+import networkx as nx
+import numpy as np
+
+import app
+
+
+def _graph(n):
+    
+    graph = nx.relabel_nodes(nx.gnm_random_graph(n, 2 * n, seed=1), str)
+    positions = {node_id: {'x': 400, 'y': 300} for node_id in graph}
+    return graph, positions
+
+
+def test_warm_start_ignores_coincident_positions():
+    
+    graph, positions = _graph(5000)
+    started = time.perf_counter()
+    layout = app.ForceLayout(graph, positions, time_budget=30)
+    layout.run()
+    
+    assert layout.initial is None
+    assert not layout.timed_out
+    assert time.perf_counter() - started < 15
+    coords = layout.coordinates(800, 600)
+    assert len(np.unique(coords.round(3), axis=0)) > 0.99 * len(coords)
+
+
+def test_warm_start_separates_duplicates():
+    
+    graph, positions = _graph(200)
+    rng = np.random.default_rng(0)
+    for node_id in list(graph)[:150]:
+        positions[node_id] = {'x': float(rng.uniform(0, 800)), 'y': float(rng.uniform(0, 600))}
+    
+    layout = app.ForceLayout(graph, positions)
+    assert layout.initial is not None
+    assert len(np.unique(layout.initial, axis=0)) == len(layout.initial)
+    layout.run()
+    assert not layout.timed_out
+
+
+def test_large_graph_is_coarsened_and_respects_budget():
+    
+    graph = nx.relabel_nodes(nx.gnm_random_graph(3000, 6000, seed=2), str)
+    layout = app.ForceLayout(graph)
+    sizes = [level[0] for level in layout.levels]
+    assert sizes[0] == 3000 and len(sizes) > 1
+    assert all(a > b for a, b in zip(sizes, sizes[1:]))
+    
+    layout = app.ForceLayout(graph, iterations=app.LAYOUT_MAX_ITERATIONS, time_budget=0.2)
+    started = time.perf_counter()
+    layout.run()
+    assert layout.timed_out
+    assert time.perf_counter() - started < 5
+    coords = layout.coordinates(800, 600)
+    assert coords.shape == (3000, 2) and np.isfinite(coords).all()
+
+
+def _extent(client):
+    
+    nodes = client.get('/api/get_graph').get_json()['nodes']
+    xs = [node['x'] for node in nodes]
+    ys = [node['y'] for node in nodes]
+    return min(xs), max(xs), min(ys), max(ys)
+
+
+def test_layouts_fill_the_requested_canvas(client, load_graph):
+    
+    graph, _ = _graph(60)
+    load_graph(list(graph), list(graph.edges()))
+    for endpoint in ('/api/spring_layout', '/api/circular_layout'):
+        assert client.post(endpoint, json={'width': 1000, 'height': 400}).get_json()['success'] is True
+        low_x, high_x, low_y, high_y = _extent(client)
+        assert 0 <= low_x and high_x <= 1000 and 0 <= low_y and high_y <= 400
+        assert high_x - low_x > 800 and high_y - low_y > 300
+
+
+def _events(body):
+    
+    for block in body.split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in lines:
+            yield lines['event'], json.loads(lines['data'])
+
+
+def test_stream_runs_in_job_pool(client, load_graph):
+    
+    graph, _ = _graph(300)
+    load_graph(list(graph), list(graph.edges()))
+    
+    response = client.get('/api/spring_layout/stream?fps=30&iterations=100')
+    events = list(_events(response.get_data(as_text=True)))
+    assert response.mimetype == 'text/event-stream'
+    assert events[0][0] == 'init' and len(events[0][1]['nodes']) == 300
+    assert events[-1][0] == 'done'
+    
+    xy = np.array(events[0][1]['xy'], dtype=np.int64)
+    for name, frame in events[1:-1]:
+        assert name == 'frame'
+        if 'i' in frame:
+            xy.reshape(-1, 2)[frame['i']] += np.array(frame['d'], dtype=np.int64).reshape(-1, 2)
+        else:
+            xy += np.array(frame['d'], dtype=np.int64)
+    assert len(np.unique(xy.reshape(-1, 2), axis=0)) > 250
+    
+    jobs = client.get('/api/jobs').get_json()['jobs']
+    assert [(job['kind'], job['status']) for job in jobs] == [('spring_layout', 'done')]
+
+
+def test_closing_the_stream_cancels_the_layout(client, load_graph):
+    
+    graph, _ = _graph(3000)
+    load_graph(list(graph), list(graph.edges()))
+    
+    response = client.get('/api/spring_layout/stream?fps=30&iterations=1000', buffered=False)
+    chunks = iter(response.response)
+    first = next(chunks)
+    while b'event: init' not in first:
+        first = next(chunks)
+    response.close()
+    
+    job = client.get('/api/jobs').get_json()['jobs'][0]
+    assert job['status'] == 'cancelled'
+    frames = app._db().execute('SELECT frame_seq FROM jobs WHERE id = ?', (job['job_id'],)).fetchone()[0]
+    time.sleep(1)
+    assert app._db().execute('SELECT frame_seq FROM jobs WHERE id = ?', (job['job_id'],)).fetchone()[0] == frames
@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def graphs_folder(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(app, 'GRAPHS_FOLDER', str(tmp_path))
+    return tmp_path
+
+
+def _names(client, **args):
+
+    return [graph['name'] for graph in client.get('/api/saved_graphs', query_string=args).get_json()['graphs']]
+
+
+def _save(client, name):
+
+    return client.post('/api/save_graph', json={'filename': name}).get_json()
+
+
+def test_save_list_load_and_delete(client, load_graph, graphs_folder):
+
+    load_graph([{'id': 'A', 'x': 1.25, 'y': 2}, {'id': 'B', 'x': 3, 'y': 4}], [('A', 'B', 2.5)], directed=True)
+    exported = client.get('/api/export_graph').get_json()
+    saved = _save(client, 'first')
+    assert saved['success'] is True
+    assert saved['graph']['num_nodes'] == 2 and saved['graph']['num_edges'] == 1
+    assert saved['graph']['is_directed'] is True
+    client.post('/api/add_node', json={'node_id': 'C'})
+    _save(client, '50%_off')
+    assert _names(client) == ['50%_off', 'first']
+    assert _names(client, q='%') == ['50%_off']
+
+    client.post('/api/clear_all')
+    assert client.post('/api/load_saved_graph', json={'filename': 'first'}).get_json()['success'] is True
+    assert client.get('/api/export_graph').get_json() == exported
+
+    assert _save(client, 'first')['success'] is True
+    assert len(list(graphs_folder.iterdir())) == 2
+    assert client.post('/api/delete_saved_graph', json={'filename': 'first'}).get_json()['success'] is True
+    assert _names(client) == ['50%_off']
+    assert len(list(graphs_folder.iterdir())) == 1
+    assert client.post('/api/load_saved_graph', json={'filename': 'first'}).get_json()['success'] is False
+
+
+def test_saved_graphs_are_private_to_their_workspace(client, make_client, load_graph):
+
+    load_graph(['A'], [])
+    _save(client, 'mine')
+    other = make_client()
+    other.post('/api/add_node', json={'node_id': 'X'})
+
+    assert _names(other) == []
+    assert other.post('/api/load_saved_graph', json={'filename': 'mine'}).get_json()['success'] is False
+    assert other.post('/api/delete_saved_graph', json={'filename': 'mine'}).get_json()['success'] is False
+    assert _save(other, 'mine')['success'] is True
+
+    assert _names(client) == ['mine'] and _names(other) == ['mine']
+    client.post('/api/load_saved_graph', json={'filename': 'mine'})
+    assert [node['id'] for node in client.get('/api/get_graph').get_json()['nodes']] == ['A']
+    other.post('/api/load_saved_graph', json={'filename': 'mine'})
+    assert [node['id'] for node in other.get('/api/get_graph').get_json()['nodes']] == ['X']
+
+
+def test_unowned_library_is_migrated(tmp_path):
+
+    conn = sqlite3.connect(tmp_path / 'old.db', isolation_level=None)
+    conn.execute(
+        'CREATE TABLE saved_graphs (name TEXT PRIMARY KEY, filename TEXT NOT NULL, '
+        'num_nodes INTEGER NOT NULL, num_edges INTEGER NOT NULL, is_directed INTEGER NOT NULL, '
+        'size INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL)'
+    )
+    conn.execute('CREATE INDEX saved_graphs_updated_at ON saved_graphs (updated_at)')
+    conn.execute("INSERT INTO saved_graphs VALUES ('legacy', 'f.gbin.gz', 1, 0, 0, 10, 1.0, 2.0)")
+
+    app._migrate_saved_graphs(conn)
+    app._migrate_saved_graphs(conn)
+    assert [column[1] for column in conn.execute('PRAGMA table_info(saved_graphs)')][:2] == ['owner', 'name']
+    assert conn.execute('SELECT owner, name, filename FROM saved_graphs').fetchall() == [('', 'legacy', 'f.gbin.gz')]
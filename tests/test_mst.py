@@ -0,0 +1,123 @@
+import random
+
+import networkx as nx
+
+import app
+
+
+def _forest_weight(graph):
+
+    return nx.minimum_spanning_tree(graph).size(weight='weight')
+
+
+def _assert_valid_order(engine, graph):
+
+    kruskal = engine.edges('kruskal')
+    assert [edge[2] for edge in kruskal] == sorted(edge[2] for edge in kruskal)
+    prim = engine.edges('prim')
+    assert {frozenset(edge[:2]) for edge in prim} == {frozenset(edge[:2]) for edge in kruskal}
+    visited = set()
+    for u, v, weight in prim:
+        if u not in visited:
+            visited.add(u)
+        assert v not in visited
+        visited.add(v)
+        assert graph[u][v]['weight'] == weight
+
+
+def test_forest_stays_minimal_under_edits():
+
+    rng = random.Random(17)
+    workspace = app._new_workspace()
+    for i in range(50):
+        app._add_node(workspace, f'n{i}', 0, 0)
+    engine = app._mst_engine(workspace)
+    graph = workspace['graph']
+
+    for step in range(3000):
+        nodes = list(graph)
+        choice = rng.random()
+        if choice < 0.45:
+            u, v = rng.sample(nodes, 2)
+            app._set_edge(workspace, u, v, rng.randint(1, 20))
+        elif choice < 0.65 and graph.number_of_edges():
+            u, v = rng.choice(list(graph.edges()))
+            app._set_edge(workspace, u, v, rng.randint(1, 20))
+        elif choice < 0.9 and graph.number_of_edges():
+            u, v = rng.choice(list(graph.edges()))
+            app._remove_edge(workspace, u, v)
+        elif choice < 0.95 and len(nodes) > 10:
+            app._remove_node(workspace, rng.choice(nodes))
+        else:
+            app._add_node(workspace, f'm{step}', 0, 0)
+
+        if step % 50 == 0:
+            edges = engine.edges()
+            assert len(edges) == graph.number_of_nodes() - nx.number_connected_components(graph)
+            assert all(graph[u][v]['weight'] == weight for u, v, weight in edges)
+            assert sum(edge[2] for edge in edges) == _forest_weight(graph)
+            _assert_valid_order(engine, graph)
+
+    assert app._mst_engine(workspace) is engine
+
+
+def test_endpoints_return_the_maintained_tree(client, load_graph):
+
+    load_graph(['A', 'B', 'C', 'D'], [('A', 'B', 4), ('B', 'C', 1), ('C', 'D', 2), ('D', 'A', 3), ('A', 'C', 5)])
+    kruskal = client.get('/api/kruskal_mst').get_json()
+    assert [(edge['source'], edge['target'], edge['weight']) for edge in kruskal['edges']] == \
+        [('B', 'C', 1), ('C', 'D', 2), ('A', 'D', 3)]
+    assert kruskal['total_weight'] == 6
+    assert client.get('/api/prim_mst').get_json()['total_weight'] == 6
+
+    client.post('/api/add_edge', json={'node1': 'A', 'node2': 'B', 'weight': 1})
+    assert client.get('/api/prim_mst').get_json()['total_weight'] == 4
+    client.post('/api/remove_edge', json={'node1': 'B', 'node2': 'C'})
+    assert client.get('/api/kruskal_mst').get_json()['total_weight'] == 6
+
+    load_graph(['A', 'B'], [('A', 'B', 1)], directed=True)
+    assert client.get('/api/kruskal_mst').get_json()['success'] is False
+
+
+def _components_graph(count, seed):
+
+    rng = random.Random(seed)
+    graph = nx.Graph()
+    for component in range(count):
+        nodes = [f'c{component}n{i}' for i in range(rng.randint(1, 8))]
+        graph.add_nodes_from(nodes)
+        for u, v in zip(nodes, nodes[1:]):
+            graph.add_edge(u, v, weight=rng.randint(1, 9))
+        for _ in range(len(nodes)):
+            u, v = rng.choice(nodes), rng.choice(nodes)
+            if u != v:
+                graph.add_edge(u, v, weight=rng.randint(1, 9))
+    return graph
+
+
+def test_forest_mode_returns_each_component(client, load_graph):
+
+    graph = _components_graph(12, 18)
+    load_graph(list(graph), [(u, v, weight) for u, v, weight in graph.edges(data='weight')])
+    assert client.get('/api/kruskal_mst').get_json()['message'] == 'Đồ thị không liên thông'
+
+    for endpoint in ('/api/kruskal_mst?forest=1', '/api/prim_mst?forest=1'):
+        result = client.get(endpoint).get_json()
+        assert result['success'] is True
+        assert result['num_components'] == 12
+        assert result['total_weight'] == _forest_weight(graph)
+        expected = sorted((len(nodes), _forest_weight(graph.subgraph(nodes))) for nodes in nx.connected_components(graph))
+        assert sorted((component['num_nodes'], component['total_weight']) for component in result['components']) == expected
+        for component in result['components']:
+            assert len(component['edges']) == component['num_nodes'] - 1
+
+
+def test_parallel_forest_matches_serial(monkeypatch):
+
+    graph = _components_graph(40, 5)
+    serial = app._spanning_forest_edges(graph)
+    monkeypatch.setattr(app, 'MST_PARALLEL_MIN_EDGES', 0)
+    monkeypatch.setattr(app, 'COMPONENT_WORKERS', 2)
+    parallel = app._spanning_forest_edges(graph)
+    assert len(parallel) == len(serial)
+    assert sum(edge[2] for edge in parallel) == sum(edge[2] for edge in serial) == _forest_weight(graph)
@@ -0,0 +1,36 @@
+import app
+
+
+def test_bulk_update_applies_last_write_per_node(client, workspace_id, load_graph, stored):
+
+    load_graph([{'id': 'A', 'x': 0, 'y': 0}, {'id': 'B', 'x': 0, 'y': 0}], [])
+    before = client.get('/api/metrics').get_json()['position_channel']
+    version = app.workspace_store.get(workspace_id)['version']
+
+    result = client.post('/api/update_positions', json={'coalesced': 5, 'updates': [
+        {'node_id': 'A', 'x': 1, 'y': 1},
+        {'node_id': 'B', 'x': 2, 'y': 2},
+        {'node_id': 'A', 'x': 3, 'y': 4},
+        {'node_id': 'missing', 'x': 9, 'y': 9}
+    ]}).get_json()
+    assert result == {'success': True, 'applied': 2, 'dropped': 6, 'ignored': 1}
+    assert stored(workspace_id)['positions'] == {'A': {'x': 3, 'y': 4}, 'B': {'x': 2, 'y': 2}}
+    assert stored(workspace_id)['version'] == version + 1
+
+    after = client.get('/api/metrics').get_json()['position_channel']
+    assert after['flushes'] == before['flushes'] + 1
+    assert after['updates_received'] == before['updates_received'] + 9
+    assert after['updates_applied'] == before['updates_applied'] + 2
+    assert after['updates_dropped'] == before['updates_dropped'] + 6
+    assert after['flush_rate'] > 0
+
+
+def test_bulk_update_rejects_malformed_payloads(client, workspace_id, load_graph, stored):
+
+    load_graph([{'id': 'A', 'x': 0, 'y': 0}], [])
+    version = app.workspace_store.get(workspace_id)['version']
+    assert client.post('/api/update_positions', json={'updates': 'A'}).get_json()['success'] is False
+    result = client.post('/api/update_positions', json={'updates': [{'node_id': 'A', 'x': 5, 'y': 5}, {'x': 1}]})
+    assert result.get_json()['success'] is False
+    assert stored(workspace_id)['positions'] == {'A': {'x': 0, 'y': 0}}
+    assert stored(workspace_id)['version'] == version
@@ -0,0 +1,71 @@
+import networkx as nx
+import numpy as np
+
+import app
+
+
+def _representations(client, **args):
+
+    return client.get('/api/get_representations', query_string=args).get_json()
+
+
+def _load_random(load_graph, directed, float_weights=False):
+
+    graph = nx.gnm_random_graph(60, 200, seed=4, directed=directed)
+    graph = nx.relabel_nodes(graph, lambda node: f'v{node:02d}')
+    edges = [(u, v, (i % 7) + (0.5 if float_weights and i % 3 == 0 else 1)) for i, (u, v) in enumerate(graph.edges())]
+    load_graph(sorted(graph), edges, directed=directed)
+    graph.add_weighted_edges_from(edges)
+    return graph
+
+
+def test_dense_and_csr_matrices_match_networkx(client, load_graph):
+
+    for directed in (False, True):
+        graph = _load_random(load_graph, directed)
+        nodes = sorted(graph)
+        expected = nx.to_numpy_array(graph, nodelist=nodes, weight='weight')
+
+        dense = _representations(client)
+        assert dense['success'] is True
+        assert dense['nodes'] == nodes
+        assert dense['is_directed'] == directed
+        assert dense['total_edges'] == graph.number_of_edges()
+        assert np.array_equal(np.array(dense['adjacency_matrix']), expected)
+        assert all(isinstance(value, int) for row in dense['adjacency_matrix'] for value in row)
+
+        csr = _representations(client, format='csr')['adjacency_matrix']
+        assert csr['shape'] == [60, 60]
+        matrix = np.zeros((60, 60))
+        for row in range(60):
+            for k in range(csr['indptr'][row], csr['indptr'][row + 1]):
+                matrix[row, csr['indices'][k]] = csr['data'][k]
+        assert np.array_equal(matrix, expected)
+
+
+def test_float_weights_stay_float(client, load_graph):
+
+    graph = _load_random(load_graph, False, float_weights=True)
+    rows = _representations(client)['adjacency_matrix']
+    assert np.array_equal(np.array(rows), nx.to_numpy_array(graph, nodelist=sorted(graph), weight='weight'))
+    assert any(isinstance(value, float) and not value.is_integer() for row in rows for value in row)
+
+
+def test_pages_and_row_windows(client, load_graph, monkeypatch):
+
+    graph = _load_random(load_graph, False)
+    nodes = sorted(graph)
+    page = _representations(client, page=2, page_size=25, row_offset=10, row_limit=5)
+    assert list(page['adjacency_list']) == nodes[25:50]
+    assert len(page['edge_list']) == 25
+    assert page['row_offset'] == 10
+    assert len(page['adjacency_matrix']) == 5
+    full = _representations(client)['adjacency_matrix']
+    assert page['adjacency_matrix'] == full[10:15]
+
+    monkeypatch.setattr(app, 'REPRESENTATION_CHUNK_CELLS', 64)
+    response = client.get('/api/get_representations', query_string={'page_size': 1})
+    assert response.is_streamed
+    assert response.get_json()['adjacency_matrix'] == full
+
+    assert _representations(client, format='coo')['success'] is False
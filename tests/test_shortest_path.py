@@ -0,0 +1,133 @@
+import math
+import random
+
+import networkx as nx
+import pytest
+
+import app
+
+
+def _graph(weights):
+
+    graph = nx.DiGraph()
+    for i, weight in enumerate(weights):
+        graph.add_edge(i, i + 1, weight=weight)
+    graph.add_edge(0, len(weights), weight=100)
+    return graph
+
+
+def test_floyd_warshall_matches_dijkstra_types():
+
+    for weights, expected in (([2, 3, 4], int), ([2, 3.5, 4], float), ([2.0, 3.0], float)):
+        graph = _graph(weights)
+        target = len(weights)
+        _, dijkstra, algorithm, _ = app.ShortestPathEngine(graph, 0).query(0, target)
+        assert algorithm == 'dijkstra'
+
+        engine = app.ShortestPathEngine(graph, 0)
+        assert engine.precompute_all_pairs()
+        path, floyd, algorithm, _ = engine.query(0, target)
+        assert algorithm == 'floyd_warshall'
+        assert path == list(range(target + 1))
+        assert floyd == dijkstra == sum(weights)
+        assert type(floyd) is type(dijkstra) is expected
+
+
+def test_all_pairs_job_distances_keep_integer_type():
+
+    workspace = app._new_workspace()
+    workspace['graph'] = _graph([1, 2])
+    result = app._job_all_pairs(workspace, {}, lambda fraction, message=None: None)
+    assert result['distances'][0] == [0, 1, 3]
+    assert all(type(value) is int for value in result['distances'][0])
+    assert result['distances'][2][0] is None
+
+
+def _query(client, source, target, **options):
+
+    return client.post('/api/shortest_path', json={'source': source, 'target': target, **options}).get_json()
+
+
+def test_shortest_path_tree_is_reused_until_the_graph_changes(client, load_graph):
+
+    load_graph(['A', 'B', 'C', 'D'], [('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 5), ('C', 'D', 1)])
+    first = _query(client, 'A', 'D')
+    assert first['path'] == ['A', 'B', 'C', 'D'] and first['distance'] == 4
+    assert first['cached'] is False
+
+    second = _query(client, 'A', 'C')
+    assert second['cached'] is True
+    assert second['distance'] == 3
+
+    client.post('/api/add_edge', json={'node1': 'A', 'node2': 'D', 'weight': 2})
+    third = _query(client, 'A', 'D')
+    assert third['cached'] is False
+    assert third['path'] == ['A', 'D'] and third['distance'] == 2
+
+
+def test_shortest_path_cache_is_bounded(monkeypatch):
+
+    monkeypatch.setattr(app, 'SHORTEST_PATH_CACHE_SOURCES', 3)
+    engine = app.ShortestPathEngine(nx.path_graph(10), 0)
+    for source in range(6):
+        engine.query(source, 9)
+    assert list(engine.trees) == [3, 4, 5]
+    assert engine.query(4, 0)[3] is True
+    assert engine.query(0, 4)[3] is False
+
+
+def _random_workspace(directed, seed):
+
+    rng = random.Random(seed)
+    graph = nx.gnm_random_graph(300, 900, seed=seed, directed=directed)
+    positions = {node: {'x': rng.uniform(0, 1000), 'y': rng.uniform(0, 1000)} for node in graph}
+    for u, v in graph.edges():
+        length = math.hypot(positions[u]['x'] - positions[v]['x'], positions[u]['y'] - positions[v]['y'])
+        graph[u][v]['weight'] = round(length * rng.uniform(1, 2), 3)
+    return graph, positions
+
+
+def test_bidirectional_and_astar_match_dijkstra():
+
+    for directed in (False, True):
+        graph, positions = _random_workspace(directed, 3)
+        engine = app.ShortestPathEngine(graph, 0)
+        for source, target in [(0, 299), (5, 17), (42, 250), (100, 101)]:
+            try:
+                expected = nx.dijkstra_path_length(graph, source, target)
+            except nx.NetworkXNoPath:
+                for search in (lambda: engine.bidirectional(source, target),
+                               lambda: engine.astar(source, target, positions)):
+                    with pytest.raises(nx.NetworkXNoPath):
+                        search()
+                continue
+
+            path, distance, settled = engine.bidirectional(source, target)
+            assert distance == pytest.approx(expected)
+            assert nx.path_weight(graph, path, 'weight') == pytest.approx(expected)
+
+            path, distance, astar_settled, scale = engine.astar(source, target, positions)
+            assert scale >= 1
+            assert distance == pytest.approx(expected)
+            assert nx.path_weight(graph, path, 'weight') == pytest.approx(expected)
+            assert astar_settled <= len(nx.single_source_dijkstra_path_length(graph, source))
+
+
+def test_astar_falls_back_to_dijkstra_for_negative_weights():
+
+    graph = nx.DiGraph([(0, 1, {'weight': 2}), (1, 2, {'weight': -1}), (0, 2, {'weight': 3})])
+    positions = {0: {'x': 0, 'y': 0}, 1: {'x': 100, 'y': 0}, 2: {'x': 200, 'y': 0}}
+    path, distance, _, scale = app.ShortestPathEngine(graph, 0).astar(0, 2, positions)
+    assert scale == 0
+    assert (path, distance) == ([0, 1, 2], 1)
+
+
+def test_shortest_path_endpoint_selects_algorithm(client, load_graph):
+
+    load_graph(['A', 'B', 'C'], [('A', 'B', 1), ('B', 'C', 1), ('A', 'C', 3)])
+    for algorithm in ('dijkstra', 'bidirectional', 'astar'):
+        result = _query(client, 'A', 'C', algorithm=algorithm)
+        assert result['success'] is True
+        assert result['method'] == algorithm
+        assert result['path'] == ['A', 'B', 'C'] and result['distance'] == 2
+    assert _query(client, 'A', 'C', algorithm='bellman')['success'] is False
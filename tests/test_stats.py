@@ -0,0 +1,74 @@
+import random
+from collections import Counter
+
+import networkx as nx
+
+import app
+
+
+def _expected(graph):
+
+    degrees = dict(graph.degree())
+    components = nx.number_weakly_connected_components(graph) if graph.is_directed() else nx.number_connected_components(graph)
+    return {
+        'num_nodes': graph.number_of_nodes(),
+        'num_edges': graph.number_of_edges(),
+        'num_components': components,
+        'is_connected': graph.number_of_nodes() > 0 and components == 1,
+        'odd_degree_vertices': sum(degree % 2 for degree in degrees.values()),
+        'degree_distribution': {str(degree): count for degree, count in sorted(Counter(degrees.values()).items())}
+    }
+
+
+def _euler(graph):
+
+    if graph.number_of_nodes() == 0:
+        return False, False
+    return nx.is_eulerian(graph), nx.has_eulerian_path(graph)
+
+
+def test_incremental_stats_match_networkx():
+
+    rng = random.Random(7)
+    for directed in (False, True):
+        workspace = app._new_workspace()
+        workspace['graph'] = nx.DiGraph() if directed else nx.Graph()
+        workspace['is_directed'] = directed
+        engine = app._stats_engine(workspace)
+        graph = workspace['graph']
+
+        for step in range(3000):
+            nodes = list(graph)
+            choice = rng.random()
+            if choice < 0.2 or len(nodes) < 2:
+                app._add_node(workspace, f'n{step}', 0, 0)
+            elif choice < 0.6:
+                app._set_edge(workspace, rng.choice(nodes), rng.choice(nodes), rng.randint(1, 5))
+            elif choice < 0.85 and graph.number_of_edges():
+                u, v = rng.choice(list(graph.edges()))
+                app._remove_edge(workspace, u, v)
+            else:
+                app._remove_node(workspace, rng.choice(nodes))
+
+            if step % 50 == 0:
+                stats = engine.stats()
+                expected = _expected(graph)
+                assert {key: stats[key] for key in expected} == expected
+                if graph.number_of_nodes():
+                    assert (engine.is_eulerian(), engine.has_eulerian_path()) == _euler(graph)
+
+        assert app._stats_engine(workspace) is engine
+
+
+def test_stats_follow_reset_and_reload(client, load_graph):
+
+    load_graph(['A', 'B', 'C'], [('A', 'B'), ('B', 'C')])
+    stats = client.get('/api/get_graph').get_json()['stats']
+    assert stats['num_components'] == 1 and stats['odd_degree_vertices'] == 2
+
+    client.post('/api/toggle_directed', json={'is_directed': True})
+    client.post('/api/remove_edge', json={'node1': 'A', 'node2': 'B'})
+    stats = client.get('/api/get_graph').get_json()['stats']
+    assert stats['num_edges'] == 1
+    assert stats['num_components'] == 2
+    assert stats['degree_distribution'] == {'0': 1, '1': 2}
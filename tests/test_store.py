@@ -0,0 +1,74 @@
+import app
+
+
+def test_clients_get_separate_workspaces(make_client):
+
+    first, second = make_client(), make_client()
+    first.post('/api/add_node', json={'node_id': 'A'})
+    second.post('/api/add_node', json={'node_id': 'B'})
+    second.post('/api/toggle_directed', json={'is_directed': True})
+
+    graph = first.get('/api/get_graph').get_json()
+    assert [node['id'] for node in graph['nodes']] == ['A']
+    assert graph['is_directed'] is False
+    graph = second.get('/api/get_graph').get_json()
+    assert [node['id'] for node in graph['nodes']] == ['B']
+    assert graph['is_directed'] is True
+
+
+def test_invalid_cookie_gets_a_new_workspace():
+
+    client = app.app.test_client()
+    client.set_cookie(app.WORKSPACE_COOKIE, '../not-an-id')
+    response = client.get('/api/get_graph')
+    workspace_id = response.headers['Set-Cookie'].split(';')[0].split('=', 1)[1]
+    assert app._is_valid_workspace_id(workspace_id)
+
+
+def test_store_evicts_least_recently_used():
+
+    store = app.WorkspaceStore(ttl=3600, max_count=2, max_elements=10 ** 6)
+    a = store.get('a')
+    store.get('b')
+    assert store.get('a') is a
+    store.get('c')
+    assert store.stats()['workspaces'] == 2
+    assert store.stats()['evictions'] == 1
+    assert store.get('a') is a
+    assert store.stats()['misses'] == 3
+    assert store.stats()['hits'] == 2
+
+
+def test_store_expires_idle_workspaces(monkeypatch):
+
+    now = [1000.0]
+    monkeypatch.setattr(app.time, 'monotonic', lambda: now[0])
+    store = app.WorkspaceStore(ttl=60, max_count=10, max_elements=10 ** 6)
+    a = store.get('a')
+    store.get('b')
+    now[0] += 61
+    assert store.get('a') is not a
+    assert store.stats()['workspaces'] == 1
+    assert store.stats()['expirations'] == 2
+
+
+def test_store_evicts_over_element_cap():
+
+    store = app.WorkspaceStore(ttl=3600, max_count=10, max_elements=15)
+    big = store.get('big')
+    for i in range(20):
+        app._add_node(big, f'n{i}', 0, 0)
+    store.touch('big')
+    assert store.stats()['workspaces'] == 1
+    store.get('small')
+    stats = store.stats()
+    assert stats['workspaces'] == 1
+    assert stats['total_elements'] <= 15
+    assert stats['evictions'] == 1
+
+
+def test_metrics_report_store_counters(client):
+
+    client.get('/api/get_graph')
+    stats = client.get('/api/metrics').get_json()['workspaces']
+    assert {'hits', 'misses', 'hit_rate', 'evictions', 'expirations', 'workspaces'} <= set(stats)
@@ -0,0 +1,101 @@
+import json
+import uuid
+
+import networkx as nx
+
+import app
+
+
+def _failing(count):
+
+    for i in range(count):
+        yield i
+    raise RuntimeError('boom')
+
+
+def test_stream_failure_closes_document():
+
+    for fields in (
+        [('success', True), ('order', app.JsonArrayStream(_failing(2500)))],
+        [('success', True), ('path', app.JsonArrayStream(range(3))), ('message', app.JsonTextStream(map(str, _failing(5))))],
+        [('success', True), ('order', app.JsonArrayStream(_failing(0)))],
+    ):
+        response = app._json_stream_response(fields)
+        result = json.loads(response.get_data(as_text=True))
+        assert result['success'] is False
+        assert result['error'] == 'Lỗi: boom'
+        assert 'message' in result
+        assert response.stream_state['failed']
+
+
+def test_stream_success_is_last_field():
+
+    response = app._json_stream_response([('success', True), ('path', app.JsonArrayStream(range(2500)))])
+    body = response.get_data(as_text=True)
+    assert body.endswith('"success":true}')
+    assert json.loads(body) == {'path': list(range(2500)), 'success': True}
+
+
+def test_failed_stream_is_not_cached():
+
+    workspace = app._new_workspace()
+    key = ('test', uuid.uuid4().hex)
+    response = app._json_stream_response([('order', app.JsonArrayStream(_failing(3)))])
+    list(app._capture_stream(response.response, key, 'application/json', workspace, 0, response.stream_state))
+    assert app.result_cache.get(key) is None
+
+    response = app._json_stream_response([('order', app.JsonArrayStream(range(3)))])
+    list(app._capture_stream(response.response, key, 'application/json', workspace, 0, response.stream_state))
+    assert app.result_cache.get(key) is not None
+
+
+def test_traversal_runs_once(monkeypatch, client, load_graph):
+
+    load_graph([str(i) for i in range(5)], [(str(i), str(i + 1)) for i in range(4)])
+
+    calls = []
+    traverse = app._traverse
+    monkeypatch.setattr(app, '_traverse', lambda *args: calls.append(args) or traverse(*args))
+    for path, expected in (('/api/bfs', ['2', '1', '3', '0', '4']), ('/api/dfs', ['2', '1', '0', '3', '4'])):
+        calls.clear()
+        result = client.post(path, json={'start_node': '2'}).get_json()
+        assert result['success'] is True
+        assert result['order'] == expected
+        assert result['message'].endswith(' → '.join(expected))
+        assert len(calls) == 1
+
+
+def test_deep_traversal_streams_without_recursion(client, load_graph):
+
+    count = 50000
+    load_graph([{'id': f'n{i}', 'x': i, 'y': 0} for i in range(count)], [(f'n{i}', f'n{i + 1}') for i in range(count - 1)])
+    response = client.post('/api/dfs', json={'start_node': 'n0'})
+    assert response.is_streamed
+    result = json.loads(response.get_data(as_text=True))
+    assert result['success'] is True
+    assert result['order'] == [f'n{i}' for i in range(count)]
+
+
+def test_traversal_matches_networkx_order():
+
+    graph = nx.Graph()
+    source = nx.gnm_random_graph(400, 1200, seed=5)
+    graph.add_nodes_from(sorted(source))
+    graph.add_edges_from(sorted(tuple(sorted(edge)) for edge in source.edges()))
+    graph.add_node(999)
+    neighbors = lambda node: sorted(graph[node])
+    assert all(list(graph[node]) == neighbors(node) for node in graph)
+
+    for depth_first, expected in ((False, [0] + [v for _, v in nx.bfs_edges(graph, 0)]),
+                                  (True, list(nx.dfs_preorder_nodes(graph, 0)))):
+        order = [node for node, _ in app._traverse(neighbors, 0, depth_first)]
+        assert order == expected
+        assert 999 not in order
+
+
+def test_traversal_rejects_unknown_start(client, load_graph):
+
+    load_graph(['A'], [])
+    for path in ('/api/bfs', '/api/dfs'):
+        assert client.post(path, json={'start_node': 'B'}).get_json()['success'] is False
+        assert client.post(path, json={}).get_json()['success'] is False
@@ -0,0 +1,63 @@
+import random
+
+import app
+
+
+def _inside(workspace, x0, y0, x1, y1):
+
+    return {node_id for node_id, pos in workspace['positions'].items()
+            if x0 <= pos['x'] <= x1 and y0 <= pos['y'] <= y1}
+
+
+def test_index_follows_moves_and_removals():
+
+    rng = random.Random(23)
+    workspace = app._new_workspace()
+    for i in range(500):
+        app._add_node(workspace, f'n{i}', rng.uniform(-2000, 2000), rng.uniform(-2000, 2000))
+    index = app._spatial_index(workspace)
+
+    for step in range(2000):
+        nodes = list(workspace['graph'])
+        choice = rng.random()
+        if choice < 0.8:
+            app._set_position(workspace, rng.choice(nodes), rng.uniform(-2000, 2000), rng.uniform(-2000, 2000))
+        elif choice < 0.9:
+            app._remove_node(workspace, rng.choice(nodes))
+        else:
+            app._add_node(workspace, f'm{step}', rng.uniform(-2000, 2000), rng.uniform(-2000, 2000))
+
+        if step % 100 == 0:
+            x0, y0 = rng.uniform(-2500, 1500), rng.uniform(-2500, 1500)
+            rect = (x0, y0, x0 + rng.uniform(10, 1500), y0 + rng.uniform(10, 1500))
+            exact = _inside(workspace, *rect)
+            assert set(index.nodes_in(*rect)) == exact
+            assert index.count(*rect) >= len(exact)
+
+    world = (-1e6, -1e6, 1e6, 1e6)
+    for level in (0, 5, app.SPATIAL_LEVELS - 1):
+        clusters = list(index.clusters(level, *world))
+        assert sum(cluster['count'] for cluster in clusters) == workspace['graph'].number_of_nodes()
+    assert app._spatial_index(workspace) is index
+
+
+def test_viewport_returns_nodes_or_clusters(client, load_graph, monkeypatch):
+
+    nodes = [{'id': f'n{i}', 'x': (i % 10) * 100, 'y': (i // 10) * 100} for i in range(100)]
+    load_graph(nodes, [('n0', 'n1', 2), ('n1', 'n99', 3), ('n98', 'n99', 1)])
+    result = client.get('/api/viewport', query_string={'x0': -50, 'y0': -50, 'x1': 150, 'y1': 50}).get_json()
+    assert result['mode'] == 'nodes'
+    assert {node['id'] for node in result['nodes']} == {'n0', 'n1', 'n99'}
+    assert {(edge['source'], edge['target']) for edge in result['edges']} == {('n0', 'n1'), ('n1', 'n99')}
+
+    client.post('/api/update_position', json={'node_id': 'n55', 'x': 0, 'y': 0})
+    result = client.get('/api/viewport', query_string={'x0': -50, 'y0': -50, 'x1': 50, 'y1': 50}).get_json()
+    assert {node['id'] for node in result['nodes']} == {'n0', 'n1', 'n55'}
+
+    monkeypatch.setattr(app, 'VIEWPORT_MAX_NODES', 10)
+    result = client.get('/api/viewport', query_string={'x0': -50, 'y0': -50, 'x1': 1000, 'y1': 1000, 'scale': 0.1}).get_json()
+    assert result['mode'] == 'clusters' and result['nodes'] == []
+    assert sum(cluster['count'] for cluster in result['clusters']) == 100
+    assert result['cell_size'] * 0.1 >= app.VIEWPORT_CLUSTER_PX
+
+    assert client.get('/api/viewport', query_string={'x0': 10, 'y0': 0, 'x1': 0, 'y1': 5}).get_json()['success'] is False
@@ -0,0 +1,75 @@
+import json
+
+import app
+
+
+def _forget(workspace_id):
+
+    conn = app._db()
+    conn.execute('DELETE FROM workspaces WHERE id = ?', (workspace_id,))
+    conn.execute('DELETE FROM workspace_changes WHERE workspace_id = ?', (workspace_id,))
+    app.workspace_store.discard(workspace_id)
+
+
+def test_recreated_workspace_does_not_reuse_etag(client, workspace_id):
+
+    client.post('/api/add_node', json={'node_id': 'A'})
+    client.get('/api/get_representations').get_data()
+    first = client.get('/api/get_representations')
+    assert first.status_code == 200
+
+    _forget(workspace_id)
+    client.post('/api/add_node', json={'node_id': 'B'})
+    second = client.get('/api/get_representations', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert 'ETag' not in second.headers
+    assert 'B' in second.get_data(as_text=True)
+
+    second = client.get('/api/get_representations')
+    assert second.headers['ETag'] != first.headers['ETag']
+    third = client.get('/api/get_representations', headers={'If-None-Match': second.headers['ETag']})
+    assert third.status_code == 304
+
+
+def _snapshot_version(workspace_id):
+
+    return app._db().execute('SELECT snapshot_version FROM workspaces WHERE id = ?', (workspace_id,)).fetchone()[0]
+
+
+def test_other_worker_replays_changes_without_reloading(client, workspace_id, load_graph, stored):
+
+    load_graph([{'id': f'n{i}', 'x': i * 10.5, 'y': i * 3.25} for i in range(40)],
+               [(f'n{i}', f'n{i + 1}', i % 4 + 0.5 * (i % 2)) for i in range(39)])
+
+    other = stored(workspace_id)
+    engine = app._stats_engine(other)
+    index = app._spatial_index(other)
+    snapshot_version = _snapshot_version(workspace_id)
+
+    client.post('/api/update_position', json={'node_id': 'n3', 'x': 123.456789, 'y': -7.5})
+    client.post('/api/remove_node', json={'node_id': 'n10'})
+    client.post('/api/remove_edge', json={'node1': 'n20', 'node2': 'n21'})
+    client.post('/api/add_edge', json={'node1': 'n0', 'node2': 'n39', 'weight': 7})
+    client.post('/api/add_node', json={'node_id': 'n10', 'x': 1, 'y': 2})
+    assert _snapshot_version(workspace_id) == snapshot_version
+
+    app._sync_workspace(workspace_id, other)
+    current = app.workspace_store.get(workspace_id)
+    assert other['version'] == current['version']
+    assert app._serialize_graph(other) == app._serialize_graph(current)
+    assert app._stats_engine(other) is engine
+    assert app._spatial_index(other) is index
+    assert engine.stats() == app.GraphStatsEngine(other['graph']).stats()
+
+
+def test_snapshot_written_after_replay_threshold(client, workspace_id, stored):
+
+    for i in range(10):
+        client.post('/api/add_node', json={'node_id': f'n{i}'})
+    before = _snapshot_version(workspace_id)
+    for i in range(10):
+        client.post('/api/update_position', json={'node_id': 'n0', 'x': i, 'y': i})
+    assert _snapshot_version(workspace_id) > before
+
+    other = stored(workspace_id)
+    assert app._serialize_graph(other) == app._serialize_graph(app.workspace_store.get(workspace_id))